@@ -37,13 +37,18 @@ from . import solvers
 
 # Expose solver functions - these imports should be after solvers is imported
 from .solvers.test.test_script import main as test_script_main
-from .solvers.svd.main import main_singular_value_decomposition
-from .solvers.selfstress.modes import localize_self_stress_modes
+from .solvers.svd.main import main_singular_value_decomposition, update_singular_value_decomposition
+from .solvers.selfstress.modes import localize_self_stress_modes, self_stress_modes_to_dense
 from .solvers.dm.linear_dm import main_linear_displacement_method
-from .solvers.dm.nonlinear_dm import main_nonlinear_displacement_method
+from .solvers.dm.nonlinear_dm import main_nonlinear_displacement_method, iterate_nonlinear_displacement_method, NonlinearDMStep
+from .solvers.dm.linear_dm_session import LinearDMSession
+from .solvers.dm.linear_dm_batch import main_linear_displacement_method_batch
+from .solvers.dm.prestress_influence import compute_prestress_influence_matrix, PrestressInfluenceMatrix
 from .solvers.dr.main import main_dynamic_relaxation
+from .solvers.dr.dr_engine import DynamicRelaxationEngine, main_dynamic_relaxation_inplace
 from .solvers.svd.py_results_svd import PyResultsSVD
 from .solvers.dr.py_config_dr import PyConfigDR
+from .solvers.dm.py_config_dm import PyConfigDM
 
 __all__ = [
     'femodel',
@@ -54,9 +59,20 @@ __all__ = [
     'PyTruss',
     'PyResultsSVD',
     'PyConfigDR',
+    'PyConfigDM',
     'main_singular_value_decomposition',
+    'update_singular_value_decomposition',
     'localize_self_stress_modes',
+    'self_stress_modes_to_dense',
     'main_linear_displacement_method',
     'main_nonlinear_displacement_method',
-    'main_dynamic_relaxation'
+    'iterate_nonlinear_displacement_method',
+    'NonlinearDMStep',
+    'LinearDMSession',
+    'main_linear_displacement_method_batch',
+    'compute_prestress_influence_matrix',
+    'PrestressInfluenceMatrix',
+    'main_dynamic_relaxation',
+    'main_dynamic_relaxation_inplace',
+    'DynamicRelaxationEngine'
 ]
\ No newline at end of file
@@ -0,0 +1,42 @@
+# Muscle
+
+# Copyright <2015-2025> <Université catholique de Louvain (UCLouvain)>
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# List of the contributors to the development of Muscle: see NOTICE file.
+# Description and complete License: see NOTICE file.
+
+"""
+musclepy.benchmarks - Scalable synthetic structures and benchmarks of the solvers
+
+Run from the command line:
+    python -m musclepy.benchmarks --sizes 2 4 8 --output results.json
+"""
+
+from .generators import warren_truss, arch_truss, space_grid, cable_net, tensegrity_grid, vertical_loads
+from .runner import run_benchmarks, benchmark_structure, write_results, STRUCTURES, SOLVERS
+
+__all__ = [
+    'warren_truss',
+    'arch_truss',
+    'space_grid',
+    'cable_net',
+    'tensegrity_grid',
+    'vertical_loads',
+    'run_benchmarks',
+    'benchmark_structure',
+    'write_results',
+    'STRUCTURES',
+    'SOLVERS'
+]
@@ -0,0 +1,54 @@
+# Muscle
+
+# Copyright <2015-2025> <Université catholique de Louvain (UCLouvain)>
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# List of the contributors to the development of Muscle: see NOTICE file.
+# Description and complete License: see NOTICE file.
+
+"""
+Command line interface of the benchmarks:
+    python -m musclepy.benchmarks --structures space_grid cable_net --sizes 4 8 16 --sparse --output results.json
+"""
+
+import argparse
+import json
+import sys
+from musclepy.benchmarks.runner import run_benchmarks, write_results, STRUCTURES, SOLVERS
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m musclepy.benchmarks", description="Benchmark the MusclePy solvers on parametric structures.")
+    parser.add_argument("--structures", nargs="+", choices=list(STRUCTURES), default=None, help="structures to generate (default: all)")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[2, 4, 8], help="size parameters of the generators")
+    parser.add_argument("--solvers", nargs="+", choices=list(SOLVERS), default=list(SOLVERS), help="solvers to benchmark (default: all)")
+    parser.add_argument("--sparse", action="store_true", help="assemble the matrices in scipy.sparse format")
+    parser.add_argument("--repeat", type=int, default=3, help="number of repetitions, the best time is recorded")
+    parser.add_argument("--no-memory", action="store_true", help="do not trace the peak memory")
+    parser.add_argument("--n-steps", type=int, default=10, help="number of load steps of the nonlinear displacement method")
+    parser.add_argument("--max-time-step", type=int, default=10000, help="maximum number of time steps of the dynamic relaxation")
+    parser.add_argument("--max-self-stress-modes", type=int, default=12, help="skip the localization of the self-stress modes above this number of modes")
+    parser.add_argument("--output", default=None, help="JSON file in which the results are written (default: standard output)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.structures, args.sizes, args.solvers, args.sparse, args.repeat, 
+                             not args.no_memory, args.n_steps, args.max_time_step, args.max_self_stress_modes)
+    if args.output is None:
+        json.dump(results, sys.stdout, indent=2)
+    else:
+        write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
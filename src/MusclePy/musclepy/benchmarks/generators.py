@@ -0,0 +1,324 @@
+# Muscle
+
+# Copyright <2015-2025> <Université catholique de Louvain (UCLouvain)>
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# List of the contributors to the development of Muscle: see NOTICE file.
+# Description and complete License: see NOTICE file.
+
+"""
+Parametric structures of configurable size, to benchmark the solvers.
+
+Each generator returns a PyTruss whose number of nodes and elements grows with the size parameters:
+- warren_truss: planar Warren truss (statically determinate), like the "linear Truss" examples
+- arch_truss: planar truss arch made of an intrados and an extrados, like the "linear Truss" examples
+- space_grid: double layer square-on-square space grid, supported on its top perimeter
+- cable_net: flat orthogonal cable net, prestressed and supported on its perimeter
+- tensegrity_grid: grid of prestressed simplex modules, connected by their top nodes
+
+Units: coordinates in [m], area in [mm²], Young's moduli in [MPa], tension in [N].
+"""
+
+import numpy as np
+from musclepy.femodel.pynodes import PyNodes
+from musclepy.femodel.pyelements import PyElements
+from musclepy.femodel.pytruss import PyTruss
+from musclepy.utils.matrix_calculations import compute_sparse_equilibrium_matrix
+
+
+def warren_truss(panels_count: int, span: float = 10.0, height: float = 1.0, area: float = 500.0, young: float = 210000.0) -> PyTruss:
+    """Planar Warren truss in the XZ plane, pinned at its left end and supported on a roller at its right end.
+
+    Args:
+        panels_count: Number of panels of the bottom chord (nodes: 2*panels_count+1, elements: 4*panels_count-1)
+        span: [m] - Length of the bottom chord
+        height: [m] - Height of the truss
+        area: [mm²] - Cross-section area of all bars
+        young: [MPa] - Young's modulus of all bars, in tension and compression
+
+    Returns:
+        PyTruss: Warren truss, with the out-of-plane DOFs fixed
+    """
+    assert panels_count >= 1, "panels_count must be at least 1"
+    n = panels_count
+    dx = span / n
+    bottom = np.column_stack((np.arange(n + 1) * dx, np.zeros(n + 1), np.zeros(n + 1)))
+    top = np.column_stack(((np.arange(n) + 0.5) * dx, np.zeros(n), np.full(n, height)))
+    coordinates = np.vstack((bottom, top))
+
+    b = np.arange(n + 1)  # bottom nodes indices
+    t = n + 1 + np.arange(n)  # top nodes indices
+    end_nodes = np.vstack((
+        np.column_stack((b[:-1], b[1:])),  # bottom chord
+        np.column_stack((t[:-1], t[1:])),  # top chord
+        np.column_stack((b[:-1], t)),  # diagonals going up
+        np.column_stack((t, b[1:])),  # diagonals going down
+    ))
+
+    dof = np.ones_like(coordinates, dtype=bool)
+    dof[:, 1] = False  # planar truss
+    dof[0] = False  # pinned support
+    dof[n, 2] = False  # roller support
+    return _bars(coordinates, end_nodes, dof, area, young)
+
+
+def arch_truss(segments_count: int, radius: float = 10.0, depth: float = 1.0, area: float = 500.0, young: float = 210000.0) -> PyTruss:
+    """Planar semicircular truss arch in the XZ plane, pinned at both ends.
+
+    Args:
+        segments_count: Number of segments of the intrados and extrados (nodes: 2*(segments_count+1), elements: 4*segments_count+1)
+        radius: [m] - Radius of the intrados
+        depth: [m] - Distance between the intrados and the extrados
+        area: [mm²] - Cross-section area of all bars
+        young: [MPa] - Young's modulus of all bars, in tension and compression
+
+    Returns:
+        PyTruss: truss arch, with the out-of-plane DOFs fixed
+    """
+    assert segments_count >= 1, "segments_count must be at least 1"
+    n = segments_count
+    angles = np.linspace(np.pi, 0.0, n + 1)
+    intrados = radius * np.column_stack((np.cos(angles), np.zeros(n + 1), np.sin(angles)))
+    extrados = (radius + depth) * np.column_stack((np.cos(angles), np.zeros(n + 1), np.sin(angles)))
+    coordinates = np.vstack((intrados, extrados))
+
+    i = np.arange(n + 1)  # intrados nodes indices
+    e = n + 1 + np.arange(n + 1)  # extrados nodes indices
+    end_nodes = np.vstack((
+        np.column_stack((i[:-1], i[1:])),  # intrados
+        np.column_stack((e[:-1], e[1:])),  # extrados
+        np.column_stack((i, e)),  # posts
+        np.column_stack((i[:-1], e[1:])),  # diagonals
+    ))
+
+    dof = np.ones_like(coordinates, dtype=bool)
+    dof[:, 1] = False  # planar truss
+    dof[[i[0], i[-1], e[0], e[-1]]] = False  # pinned supports
+    return _bars(coordinates, end_nodes, dof, area, young)
+
+
+def space_grid(nx: int, ny: int, spacing: float = 1.0, depth: float = 0.7, area: float = 500.0, young: float = 210000.0) -> PyTruss:
+    """Double layer square-on-square offset space grid, pinned on the perimeter of its top layer.
+
+    Args:
+        nx: Number of cells in the X direction
+        ny: Number of cells in the Y direction
+        spacing: [m] - Size of the square cells
+        depth: [m] - Distance between the top and bottom layers
+        area: [mm²] - Cross-section area of all bars
+        young: [MPa] - Young's modulus of all bars, in tension and compression
+
+    Returns:
+        PyTruss: space grid with (nx+1)*(ny+1) top nodes and nx*ny bottom nodes
+    """
+    assert nx >= 1 and ny >= 1, "nx and ny must be at least 1"
+    top_ids = np.arange((nx + 1) * (ny + 1)).reshape((nx + 1, ny + 1))
+    bottom_ids = top_ids.size + np.arange(nx * ny).reshape((nx, ny))
+
+    ix, iy = np.meshgrid(np.arange(nx + 1), np.arange(ny + 1), indexing="ij")
+    top = np.column_stack((ix.ravel() * spacing, iy.ravel() * spacing, np.full(ix.size, depth)))
+    jx, jy = np.meshgrid(np.arange(nx), np.arange(ny), indexing="ij")
+    bottom = np.column_stack(((jx.ravel() + 0.5) * spacing, (jy.ravel() + 0.5) * spacing, np.zeros(jx.size)))
+    coordinates = np.vstack((top, bottom))
+
+    end_nodes = np.vstack((
+        _grid_lines(top_ids),  # top chords
+        _grid_lines(bottom_ids),  # bottom chords
+        np.column_stack((bottom_ids.ravel(), top_ids[:-1, :-1].ravel())),  # diagonals to the 4 corners of the cell
+        np.column_stack((bottom_ids.ravel(), top_ids[1:, :-1].ravel())),
+        np.column_stack((bottom_ids.ravel(), top_ids[:-1, 1:].ravel())),
+        np.column_stack((bottom_ids.ravel(), top_ids[1:, 1:].ravel())),
+    ))
+
+    dof = np.ones_like(coordinates, dtype=bool)
+    dof[_perimeter(top_ids)] = False
+    return _bars(coordinates, end_nodes, dof, area, young)
+
+
+def cable_net(nx: int, ny: int, spacing: float = 1.0, prestress: float = 10000.0, area: float = 50.0, young: float = 160000.0) -> PyTruss:
+    """Flat orthogonal cable net in the XY plane, pinned on its perimeter and prestressed. 
+    The out-of-plane stiffness of the net only comes from the prestress (geometric stiffness).
+
+    Args:
+        nx: Number of cable intervals in the X direction
+        ny: Number of cable intervals in the Y direction
+        spacing: [m] - Size of the square meshes
+        prestress: [N] - Tension in all cables. The free lengths are shortened accordingly.
+        area: [mm²] - Cross-section area of all cables
+        young: [MPa] - Young's modulus of all cables in tension (0 in compression)
+
+    Returns:
+        PyTruss: cable net with (nx+1)*(ny+1) nodes, in a self-equilibrated prestressed state
+    """
+    assert nx >= 2 and ny >= 2, "nx and ny must be at least 2 to have free nodes"
+    ids = np.arange((nx + 1) * (ny + 1)).reshape((nx + 1, ny + 1))
+    ix, iy = np.meshgrid(np.arange(nx + 1), np.arange(ny + 1), indexing="ij")
+    coordinates = np.column_stack((ix.ravel() * spacing, iy.ravel() * spacing, np.zeros(ix.size)))
+
+    dof = np.ones_like(coordinates, dtype=bool)
+    perimeter = _perimeter(ids)
+    dof[perimeter] = False
+
+    # remove the cables between 2 supports
+    end_nodes = _grid_lines(ids)
+    on_perimeter = np.zeros(ids.size, dtype=bool)
+    on_perimeter[perimeter] = True
+    end_nodes = end_nodes[~(on_perimeter[end_nodes[:, 0]] & on_perimeter[end_nodes[:, 1]])]
+
+    b = len(end_nodes)
+    return _prestressed(coordinates, end_nodes, dof, np.ones(b, dtype=int), np.full(b, area),
+                        np.tile([0.0, young], (b, 1)), np.full(b, prestress))
+
+
+def tensegrity_grid(nx: int, ny: int, radius: float = 1.0, height: float = 1.5, spacing: float = 3.0, prestress: float = 10000.0,
+                    strut_area: float = 364.4, cable_area: float = 50.3, strut_young: float = 70390.0, cable_young: float = 71750.0) -> PyTruss:
+    """Grid of nx*ny simplex modules (3 struts, 9 cables), pinned at their bottom nodes. 
+    The top nodes of adjacent modules are connected by cables, without prestress.
+
+    Each module is a regular simplex (triangular prism twisted by 150°), prestressed in its unique self-stress mode.
+
+    Args:
+        nx: Number of modules in the X direction
+        ny: Number of modules in the Y direction
+        radius: [m] - Radius of the circumscribed circle of the top and bottom triangles
+        height: [m] - Height of the modules
+        spacing: [m] - Distance between the axes of adjacent modules
+        prestress: [N] - Compression in the struts
+        strut_area, cable_area: [mm²] - Cross-section area of the struts and cables
+        strut_young, cable_young: [MPa] - Young's modulus of the struts in compression and of the cables in tension
+
+    Returns:
+        PyTruss: tensegrity grid with 6*nx*ny nodes and 12*nx*ny + 3*(2*nx*ny-nx-ny) elements
+    """
+    assert nx >= 1 and ny >= 1, "nx and ny must be at least 1"
+    assert spacing > 2 * radius, "spacing must be larger than the diameter of the modules"
+    module_coordinates, module_end_nodes, module_type, module_tension = _simplex_module(radius, height, prestress)
+    modules_count = nx * ny
+
+    # repeat the module on the grid
+    jx, jy = np.meshgrid(np.arange(nx), np.arange(ny), indexing="ij")
+    offsets = np.column_stack((jx.ravel() * spacing, jy.ravel() * spacing, np.zeros(modules_count)))
+    coordinates = (module_coordinates[np.newaxis, :, :] + offsets[:, np.newaxis, :]).reshape((-1, 3))
+    first_node = 6 * np.arange(modules_count).reshape((nx, ny))
+    modules_end_nodes = (module_end_nodes[np.newaxis, :, :] + first_node.reshape((-1, 1, 1))).reshape((-1, 2))
+
+    # connect the top nodes (3, 4, 5) of adjacent modules
+    top = np.arange(3, 6)
+    links_end_nodes = _module_links(first_node, top)
+    end_nodes = np.vstack((modules_end_nodes, links_end_nodes))
+
+    links_count = len(links_end_nodes)
+    is_strut = np.concatenate((np.tile(module_type == -1, modules_count), np.zeros(links_count, dtype=bool)))
+    type = np.where(is_strut, -1, 1)
+    area = np.where(is_strut, strut_area, cable_area)
+    youngs = np.where(is_strut[:, np.newaxis], [strut_young, 0.0], [0.0, cable_young])
+    tension = np.concatenate((np.tile(module_tension, modules_count), np.zeros(links_count)))
+
+    dof = np.ones_like(coordinates, dtype=bool)
+    dof[(first_node.reshape((-1, 1)) + np.arange(3)).ravel()] = False  # bottom nodes are pinned
+    return _prestressed(coordinates, end_nodes, dof, type, area, youngs, tension)
+
+
+def vertical_loads(structure: PyTruss, magnitude: float = -1000.0) -> np.ndarray:
+    """Vertical loads applied on all the free Z DOFs of the structure.
+
+    Args:
+        structure: Structure to load
+        magnitude: [N] - Vertical load on each free node (negative: downwards)
+
+    Returns:
+        [N] - shape (nodes_count, 3) - External loads
+    """
+    loads = np.zeros((structure.nodes.count, 3))
+    loads[:, 2] = np.where(structure.nodes.dof[:, 2], magnitude, 0.0)
+    return loads
+
+
+#private functions
+def _bars(coordinates, end_nodes, dof, area, young) -> PyTruss:
+    """Truss made of bars with the same section and material, in tension and compression, without prestress."""
+    b = len(end_nodes)
+    nodes = PyNodes(initial_coordinates=coordinates, dof=dof)
+    elements = PyElements(nodes, type=np.full(b, -1), end_nodes=end_nodes, area=np.full(b, float(area)),
+                          youngs=np.full((b, 2), float(young)))
+    return PyTruss(nodes, elements)
+
+
+def _prestressed(coordinates, end_nodes, dof, type, area, youngs, tension) -> PyTruss:
+    """Structure in a prestressed state: the free lengths are computed such that the elements carry the given tension
+    in the initial coordinates, i.e. tension = EA/L0 * (L - L0)."""
+    nodes = PyNodes(initial_coordinates=coordinates, dof=dof)
+    length = np.linalg.norm(coordinates[end_nodes[:, 1]] - coordinates[end_nodes[:, 0]], axis=1)
+    ea = np.where(tension < 0, youngs[:, 0], youngs[:, 1]) * area  # [N]
+    ea = np.where(tension == 0, youngs.max(axis=1) * area, ea)
+    free_length = length * ea / (ea + tension)
+    elements = PyElements(nodes, type=type, end_nodes=end_nodes, area=area, youngs=youngs,
+                          free_length=free_length, tension=tension)
+    return PyTruss(nodes, elements)
+
+
+def _grid_lines(ids: np.ndarray) -> np.ndarray:
+    """End nodes of the lines joining the adjacent nodes of a (rows, columns) grid of node indices."""
+    return np.vstack((
+        np.column_stack((ids[:-1, :].ravel(), ids[1:, :].ravel())),
+        np.column_stack((ids[:, :-1].ravel(), ids[:, 1:].ravel())),
+    ))
+
+
+def _perimeter(ids: np.ndarray) -> np.ndarray:
+    """Indices of the nodes on the perimeter of a (rows, columns) grid of node indices."""
+    on_perimeter = np.zeros(ids.shape, dtype=bool)
+    on_perimeter[[0, -1], :] = True
+    on_perimeter[:, [0, -1]] = True
+    return ids[on_perimeter]
+
+
+def _module_links(first_node: np.ndarray, top: np.ndarray) -> np.ndarray:
+    """End nodes of the cables connecting the top nodes of adjacent modules, in the X and Y directions."""
+    x_start = (first_node[:-1, :].reshape((-1, 1)) + top).ravel()
+    x_end = (first_node[1:, :].reshape((-1, 1)) + top).ravel()
+    y_start = (first_node[:, :-1].reshape((-1, 1)) + top).ravel()
+    y_end = (first_node[:, 1:].reshape((-1, 1)) + top).ravel()
+    return np.column_stack((np.concatenate((x_start, y_start)), np.concatenate((x_end, y_end))))
+
+
+def _simplex_module(radius: float, height: float, prestress: float) -> tuple:
+    """Regular simplex: 3 bottom nodes, 3 top nodes rotated by 150°, 3 struts and 9 cables.
+    
+    Returns:
+        tuple containing the coordinates (6, 3), the end nodes (12, 2), the type (12,) and the self-stress (12,) of the module.
+        The self-stress is scaled such that the struts are compressed by the prestress.
+    """
+    angles = np.deg2rad(90 + 120 * np.arange(3))
+    twist = np.deg2rad(150)
+    bottom = np.column_stack((radius * np.cos(angles), radius * np.sin(angles), np.zeros(3)))
+    top = np.column_stack((radius * np.cos(angles + twist), radius * np.sin(angles + twist), np.full(3, height)))
+    coordinates = np.vstack((bottom, top))
+
+    i = np.arange(3)
+    end_nodes = np.vstack((
+        np.column_stack((i, 3 + i)),  # struts
+        np.column_stack((i, (i + 1) % 3)),  # bottom cables
+        np.column_stack((3 + i, 3 + (i + 1) % 3)),  # top cables
+        np.column_stack((i, 3 + (i - 1) % 3)),  # vertical cables
+    ))
+    type = np.array([-1] * 3 + [1] * 9)
+
+    # the self-stress mode is the right singular vector of the (free) equilibrium matrix associated to the zero singular value
+    vectors = coordinates[end_nodes[:, 1]] - coordinates[end_nodes[:, 0]]
+    cosines = vectors / np.linalg.norm(vectors, axis=1)[:, np.newaxis]
+    A = compute_sparse_equilibrium_matrix(end_nodes, cosines, 6).toarray()
+    mode = np.linalg.svd(A)[2][-1]
+    tension = mode * (-prestress / mode[0])
+    return coordinates, end_nodes, type, tension
@@ -0,0 +1,234 @@
+# Muscle
+
+# Copyright <2015-2025> <Université catholique de Louvain (UCLouvain)>
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# List of the contributors to the development of Muscle: see NOTICE file.
+# Description and complete License: see NOTICE file.
+
+"""
+Benchmark of the solvers on the parametric structures of musclepy.benchmarks.generators.
+
+For each structure and size, each solver is timed (best of several repetitions) and its peak memory is traced with tracemalloc.
+The linear displacement method is additionally split in its phases (copy, assembly, factorization, solve, post-process).
+The results are returned as a dictionary and can be written in JSON format, so that regressions can be tracked over releases:
+    {
+        "metadata": {"musclepy": ..., "numpy": ..., "scipy": ..., "python": ..., "platform": ..., "timestamp": ...},
+        "results": [{"structure": ..., "size": ..., "nodes_count": ..., "elements_count": ..., "dof_count": ..., 
+                     "solver": ..., "phase": ..., "sparse": ..., "time": ..., "peak_memory": ..., "info": {...}}, ...]
+    }
+"""
+
+import json
+import platform
+import time
+import tracemalloc
+from datetime import datetime, timezone
+import numpy as np
+import scipy
+from musclepy.femodel.pytruss import PyTruss
+from musclepy.femodel.prestress_scenario import PrestressScenario
+from musclepy.solvers.dm.linear_dm import (main_linear_displacement_method, assemble_tangent_stiffness_matrix, 
+                                           StiffnessFactorization, _post_process)
+from musclepy.solvers.dm.nonlinear_dm import main_nonlinear_displacement_method
+from musclepy.solvers.dr.main import main_dynamic_relaxation
+from musclepy.solvers.dr.py_config_dr import PyConfigDR
+from musclepy.solvers.svd.main import main_singular_value_decomposition
+from musclepy.solvers.selfstress.modes import localize_self_stress_modes
+from musclepy.benchmarks import generators
+
+
+STRUCTURES = {
+    "warren_truss": lambda size: generators.warren_truss(size),
+    "arch_truss": lambda size: generators.arch_truss(size),
+    "space_grid": lambda size: generators.space_grid(size, size),
+    "cable_net": lambda size: generators.cable_net(size, size),
+    "tensegrity_grid": lambda size: generators.tensegrity_grid(size, size),
+}
+
+SOLVERS = ("linear_dm", "nonlinear_dm", "dynamic_relaxation", "dynamic_relaxation_in_place", "svd", "selfstress")
+
+
+def run_benchmarks(structures=None, sizes=(2, 4, 8), solvers=SOLVERS, sparse: bool = False, repeat: int = 3, 
+                   memory: bool = True, n_steps: int = 10, max_time_step: int = 10000, max_self_stress_modes: int = 12) -> dict:
+    """Benchmark the solvers on parametric structures of increasing size.
+
+    Args:
+        structures: Names of the structures to generate (keys of STRUCTURES). All structures by default.
+        sizes: Size parameters passed to the generators (number of panels, segments, or cells in each direction)
+        solvers: Names of the solvers to benchmark (see SOLVERS)
+        sparse: If True, the displacement methods and the dynamic relaxation assemble the matrices in scipy.sparse format, 
+                and the SVD only computes the null spaces of the sparse equilibrium matrix (method="sparse")
+        repeat: Number of repetitions of each measure. The best time is recorded.
+        memory: If True, the peak memory of each measure is traced during one additional repetition
+        n_steps: Number of load steps of the nonlinear displacement method
+        max_time_step: Maximum number of time steps of the dynamic relaxation
+        max_self_stress_modes: The localization of the self-stress modes is skipped for structures with more self-stress modes
+
+    Returns:
+        dict: {"metadata": {...}, "results": [...]}, see the module documentation
+    """
+    structures = list(STRUCTURES) if structures is None else list(structures)
+    for name in structures:
+        if name not in STRUCTURES:
+            raise ValueError(f"Unknown structure '{name}', expected one of {list(STRUCTURES)}")
+
+    results = []
+    for name in structures:
+        for size in sizes:
+            structure = STRUCTURES[name](size)
+            records = benchmark_structure(structure, solvers, sparse, repeat, memory, n_steps, max_time_step, max_self_stress_modes)
+            for record in records:
+                record.update(structure=name, size=size)
+            results.extend(records)
+    return {"metadata": _metadata(), "results": results}
+
+
+def benchmark_structure(structure: PyTruss, solvers=SOLVERS, sparse: bool = False, repeat: int = 3, memory: bool = True,
+                        n_steps: int = 10, max_time_step: int = 10000, max_self_stress_modes: int = 12, loads: np.ndarray = None) -> list:
+    """Benchmark the solvers on one structure.
+
+    Args:
+        structure: Structure to analyse
+        solvers: Names of the solvers to benchmark (see SOLVERS)
+        sparse: If True, the displacement methods and the dynamic relaxation assemble the matrices in scipy.sparse format, 
+                and the SVD only computes the null spaces of the sparse equilibrium matrix (method="sparse")
+        repeat: Number of repetitions of each measure. The best time is recorded.
+        memory: If True, the peak memory of each measure is traced during one additional repetition
+        n_steps: Number of load steps of the nonlinear displacement method
+        max_time_step: Maximum number of time steps of the dynamic relaxation
+        max_self_stress_modes: The localization of the self-stress modes is skipped (and recorded as skipped) for structures with more self-stress modes
+        loads: [N] - shape (nodes_count, 3) - External loads. Vertical loads on the free nodes by default.
+
+    Returns:
+        list of dict: one record per solver phase
+    """
+    for solver in solvers:
+        if solver not in SOLVERS:
+            raise ValueError(f"Unknown solver '{solver}', expected one of {list(SOLVERS)}")
+    assert repeat >= 1, "repeat must be at least 1"
+    if loads is None:
+        loads = generators.vertical_loads(structure)
+    free_length_variation = np.zeros(structure.elements.count)
+    size = {
+        "nodes_count": structure.nodes.count,
+        "elements_count": structure.elements.count,
+        "dof_count": int(structure.nodes.dof.sum()),
+        "sparse": sparse,
+    }
+
+    records = []
+    def record(solver, phase, measure, info=None):
+        records.append(dict(size, solver=solver, phase=phase, time=measure[0], peak_memory=measure[1], info=info or {}))
+
+    if "linear_dm" in solvers:
+        for phase, measure in _linear_dm_phases(structure, loads, free_length_variation, sparse, repeat, memory):
+            record("linear_dm", phase, measure)
+
+    if "nonlinear_dm" in solvers:
+        measure = _measure(lambda: main_nonlinear_displacement_method(structure, loads, n_steps, sparse), repeat, memory)
+        record("nonlinear_dm", "total", measure, {"n_steps": n_steps})
+
+    for solver, in_place in (("dynamic_relaxation", False), ("dynamic_relaxation_in_place", True)):
+        if solver in solvers:
+            configs = []
+            def dynamic_relaxation():
+                config = PyConfigDR(max_time_step=max_time_step, sparse=sparse, in_place=in_place)
+                configs.append(config)
+                return main_dynamic_relaxation(structure, loads, free_length_variation, config)
+            measure = _measure(dynamic_relaxation, repeat, memory)
+            record(solver, "total", measure, {"n_time_step": configs[-1].n_time_step, "n_ke_reset": configs[-1].n_ke_reset})
+
+    if "svd" in solvers or "selfstress" in solvers:
+        method = "sparse" if sparse else "full"
+        measure = _measure(lambda: main_singular_value_decomposition(structure, method=method), repeat, memory)
+        svd = measure[2]
+        if "svd" in solvers:
+            record("svd", "total", measure, {"r": int(svd.r), "s": int(svd.s), "m": int(svd.m)})
+        if "selfstress" in solvers and 0 < svd.s <= max_self_stress_modes:
+            measure = _measure(lambda: localize_self_stress_modes(structure, svd.Vs_T), repeat, memory)
+            record("selfstress", "total", measure, {"s": int(svd.s)})
+        elif "selfstress" in solvers and svd.s > max_self_stress_modes:
+            record("selfstress", "total", (None, None), {"s": int(svd.s), "skipped": True})
+
+    return records
+
+
+def write_results(results: dict, path: str):
+    """Write the benchmark results in a JSON file.
+
+    Args:
+        results: Results returned by run_benchmarks
+        path: Path of the JSON file
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+
+
+#private functions
+def _linear_dm_phases(structure, loads, free_length_variation, sparse, repeat, memory):
+    """Measure the phases of the linear displacement method (see main_linear_displacement_method)."""
+    copy = _measure(lambda: structure.copy_and_add(free_length_variation=free_length_variation), repeat, memory)
+    initial = copy[2]
+    assembly = _measure(lambda: assemble_tangent_stiffness_matrix(initial, sparse), repeat, memory)
+    K, km, kg = assembly[2]
+    factorization = _measure(lambda: StiffnessFactorization(K, initial.nodes.dof), repeat, memory)
+    total_loads = loads.reshape(-1) + PrestressScenario(structure.elements, free_length_variation).equivalent_loads.reshape(-1)
+    solve = _measure(lambda: factorization[2].solve(total_loads), repeat, memory)
+    displacements = solve[2][0]
+    post_process = _measure(lambda: _post_process(displacements, km, kg, initial.elements.end_nodes, initial.elements.direction_cosines), 
+                            repeat, memory)
+    total = _measure(lambda: main_linear_displacement_method(structure, loads, free_length_variation, sparse), repeat, memory)
+    return [("copy", copy), ("assembly", assembly), ("factorization", factorization), ("solve", solve), 
+            ("post_process", post_process), ("total", total)]
+
+
+def _measure(function, repeat: int, memory: bool) -> tuple:
+    """Run the function repeat times (and once more with tracemalloc if memory).
+
+    Returns:
+        tuple containing the best time [s], the peak memory [bytes] (None if not traced), and the result of the last call.
+    """
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        already_tracing = tracemalloc.is_tracing()
+        if not already_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        result = function()
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+        if not already_tracing:
+            tracemalloc.stop()
+    return best, peak, result
+
+
+def _metadata() -> dict:
+    """Versions and machine on which the benchmarks are run."""
+    from musclepy import __version__
+    return {
+        "musclepy": __version__,
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
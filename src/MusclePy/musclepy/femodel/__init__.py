@@ -25,5 +25,6 @@ from .pynodes import PyNodes
 from .pyelements import PyElements
 from .pytruss import PyTruss
 from .prestress_scenario import PrestressScenario
+from .compact_state import CompactTrussState
 
-__all__ = ['PyNodes', 'PyElements', 'PyTruss', 'PrestressScenario']
+__all__ = ['PyNodes', 'PyElements', 'PyTruss', 'PrestressScenario', 'CompactTrussState']
@@ -0,0 +1,186 @@
+# Muscle
+
+# Copyright <2015-2025> <Université catholique de Louvain (UCLouvain)>
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# List of the contributors to the development of Muscle: see NOTICE file.
+# Description and complete License: see NOTICE file.
+
+import numpy as np
+from .pynodes import PyNodes
+from .pyelements import PyElements
+from .pytruss import PyTruss
+
+
+def _frozen(arr: np.ndarray) -> np.ndarray:
+    """Read-only view of an array, taken over without copy by PyNodes and PyElements."""
+    view = arr.view()
+    view.flags.writeable = False
+    return view
+
+
+class CompactTrussState:
+    """Compact state of a PyTruss: all the nodes and elements arrays stored in one contiguous buffer.
+
+    Each array of the structure is stored in a block of the buffer (aligned on 8 bytes), hence:
+    - copying a full state is one copy of the buffer,
+    - pickling a state (e.g. to send it to another process) serializes the buffer only,
+    - the buffer can be provided by the caller (e.g. a multiprocessing.shared_memory buffer) to share a state between processes,
+    - the floats and the node indices can be stored in float32 and int32 to reduce the memory of very large models.
+
+    Example:
+        state = CompactTrussState.from_structure(structure)
+        snapshot = state.copy()  # one copy of the buffer
+        structure = snapshot.to_structure()  # PyTruss whose arrays are views on the buffer (float64 storage)
+
+    Attributes:
+        nodes_count: Number of nodes
+        elements_count: Number of elements
+        float_dtype: dtype of the floating point arrays (float64 or float32)
+        index_dtype: dtype of the node indices in end_nodes (int64 or int32)
+        buffer: [-] - shape (nbytes,) - Contiguous uint8 buffer containing all the arrays
+        arrays: dict of the views on the buffer, keyed on the name of the attribute of PyNodes or PyElements
+    """
+
+    float_dtypes = (np.float64, np.float32)
+    index_dtypes = (np.int64, np.int32)
+    nodes_arrays = ("initial_coordinates", "dof", "loads", "displacements", "reactions", "resisting_forces")
+
+    def __init__(self, nodes_count: int, elements_count: int, float_dtype=np.float64, index_dtype=np.int32, buffer: np.ndarray = None):
+        """Allocate the buffer of a compact state (filled with zeros), or wrap an existing buffer.
+
+        Args:
+            nodes_count: Number of nodes
+            elements_count: Number of elements
+            float_dtype: np.float64 (default) or np.float32
+            index_dtype: np.int32 (default) or np.int64
+            buffer: Optional buffer of nbytes bytes to wrap (without copy), e.g. the buffer of another CompactTrussState
+        """
+        float_dtype, index_dtype = np.dtype(float_dtype), np.dtype(index_dtype)
+        if float_dtype not in self.float_dtypes:
+            raise ValueError(f"float_dtype must be float64 or float32, got {float_dtype}")
+        if index_dtype not in self.index_dtypes:
+            raise ValueError(f"index_dtype must be int64 or int32, got {index_dtype}")
+        self.nodes_count = int(nodes_count)
+        self.elements_count = int(elements_count)
+        self.float_dtype = float_dtype
+        self.index_dtype = index_dtype
+
+        n, b = self.nodes_count, self.elements_count
+        layout = [
+            # nodes
+            ("initial_coordinates", float_dtype, (n, 3)),
+            ("dof", np.dtype(bool), (n, 3)),
+            ("loads", float_dtype, (n, 3)),
+            ("displacements", float_dtype, (n, 3)),
+            ("reactions", float_dtype, (n, 3)),
+            ("resisting_forces", float_dtype, (n, 3)),
+            # elements
+            ("type", np.dtype(np.int8), (b,)),
+            ("end_nodes", index_dtype, (b, 2)),
+            ("area", float_dtype, (b,)),
+            ("youngs", float_dtype, (b, 2)),
+            ("free_length", float_dtype, (b,)),
+            ("tension", float_dtype, (b,)),
+        ]
+        offsets = []
+        nbytes = 0
+        for _, dtype, shape in layout:
+            offsets.append(nbytes)
+            nbytes += -(-int(np.prod(shape)) * dtype.itemsize // 8) * 8  # aligned on 8 bytes
+
+        if buffer is None:
+            buffer = np.zeros(nbytes, dtype=np.uint8)
+        else:
+            buffer = np.frombuffer(buffer, dtype=np.uint8) if not isinstance(buffer, np.ndarray) else buffer.reshape(-1).view(np.uint8)
+            if buffer.size < nbytes:
+                raise ValueError(f"buffer must contain at least {nbytes} bytes, got {buffer.size}")
+        self.buffer = buffer
+
+        self.arrays = {}
+        for (name, dtype, shape), offset in zip(layout, offsets):
+            size = int(np.prod(shape)) * dtype.itemsize
+            self.arrays[name] = buffer[offset:offset + size].view(dtype).reshape(shape)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the buffer in bytes"""
+        return self.buffer.nbytes
+
+    @classmethod
+    def from_structure(cls, structure: PyTruss, float_dtype=np.float64, index_dtype=np.int32) -> 'CompactTrussState':
+        """Pack the state of a structure into a compact state.
+
+        Args:
+            structure: PyTruss instance (only the PyNodes and PyElements attributes are stored, not the attributes of the subclasses)
+            float_dtype: np.float64 (default) or np.float32
+            index_dtype: np.int32 (default) or np.int64
+
+        Returns:
+            CompactTrussState with a copy of the state of the structure
+        """
+        assert isinstance(structure, PyTruss), "structure must be an instance of PyTruss"
+        nodes, elements = structure.nodes, structure.elements
+        if np.dtype(index_dtype) == np.int32 and nodes.count > np.iinfo(np.int32).max:
+            raise ValueError("too many nodes to store the node indices in int32")
+        state = cls(nodes.count, elements.count, float_dtype, index_dtype)
+        for name, arr in state.arrays.items():
+            arr[...] = getattr(nodes if name in cls.nodes_arrays else elements, name)
+        return state
+
+    def to_structure(self) -> PyTruss:
+        """Create a PyTruss from the compact state.
+
+        With float64 storage, the arrays of the PyTruss are views on the buffer (no copy): read-only views for the arrays 
+        shared by the copies of the structure (initial_coordinates, dof, type, end_nodes, area, youngs) and writeable views 
+        for the mutable state. Hence in-place modifications of the state of the structure are stored in the compact state, 
+        and writing in the arrays of the compact state modifies the structure (the cached geometry of the elements is 
+        recomputed), except for dof and end_nodes which must not be modified once the structure is created. 
+        With float32 storage, the arrays are converted to float64 for the computations (copy).
+
+        Returns:
+            PyTruss instance
+        """
+        arrays = self.arrays
+        floats = (lambda arr: arr) if self.float_dtype == np.float64 else (lambda arr: arr.astype(np.float64))
+        nodes = PyNodes(
+            initial_coordinates=_frozen(floats(arrays["initial_coordinates"])),
+            dof=_frozen(arrays["dof"]),
+            loads=floats(arrays["loads"]),
+            displacements=floats(arrays["displacements"]),
+            reactions=floats(arrays["reactions"]),
+            resisting_forces=floats(arrays["resisting_forces"])
+        )
+        elements = PyElements(
+            nodes=nodes,
+            type=_frozen(arrays["type"]),
+            end_nodes=_frozen(arrays["end_nodes"]),
+            area=_frozen(floats(arrays["area"])),
+            youngs=_frozen(floats(arrays["youngs"])),
+            free_length=floats(arrays["free_length"]),
+            tension=floats(arrays["tension"])
+        )
+        return PyTruss(nodes, elements)
+
+    def copy(self) -> 'CompactTrussState':
+        """Create a copy of the compact state (one copy of the buffer).
+
+        Returns:
+            New CompactTrussState
+        """
+        return self.__class__(self.nodes_count, self.elements_count, self.float_dtype, self.index_dtype, self.buffer.copy())
+
+    def __reduce__(self):
+        """Pickle the compact state as its buffer and its dimensions."""
+        return (self.__class__, (self.nodes_count, self.elements_count, self.float_dtype, self.index_dtype, self.buffer))
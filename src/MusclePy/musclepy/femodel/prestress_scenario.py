@@ -18,7 +18,8 @@
 # Description and complete License: see NOTICE file.
 
 import numpy as np
-from musclepy.femodel.pyelements import PyElements
+from musclepy.femodel.pyelements import PyElements, _compute_flexibility
+from musclepy.utils.matrix_calculations import compute_nodal_resisting_forces
 
 
 class PrestressScenario:
@@ -65,20 +66,65 @@ class PrestressScenario:
         """Compute equivalent tension and loads from free length variations."""
         d_l0 = self.free_length_variation
         Ke = 1/self.elements.flexibility # [N/m] - stiffness of the elements = EA/(new_Lfree)
-        cosines = self.elements.direction_cosines
-        end_nodes = self.elements.end_nodes
         
         # 1) Compute the tension
         # t = EA/Lfree * (-d_l0). A lengthening d_l0 (+) creates a compression force (-), supposing all nodes are fixed.
         self.equivalent_tension = Ke * -d_l0
         
-        # 2) Compute the equivalent prestress loads
-        for i in range(self.elements.count):
-            cx, cy, cz = cosines[i]
-            n0, n1 = end_nodes[i]  # Get start and end nodes
-            
-            # Apply forces to start node (negative)
-            self.equivalent_loads[n0] += -self.equivalent_tension[i] * np.array([-cx, -cy, -cz])
+        # 2) Compute the equivalent prestress loads: the opposite of the resisting forces of the equivalent tension
+        self.equivalent_loads = _compute_equivalent_loads(self.elements, self.equivalent_tension)
+
+    @staticmethod
+    def compute_batch(elements: PyElements, free_length_variations: np.ndarray) -> tuple:
+        """Compute the equivalent tension and loads of k prestress scenarios at once.
+
+        Args:
+            elements: PyElements instance containing element properties and current state
+            free_length_variations: [m] - shape (k, elements.count) - free length variations of each scenario
             
-            # Apply forces to end node (positive)
-            self.equivalent_loads[n1] += -self.equivalent_tension[i] * np.array([cx, cy, cz])
+        Returns:
+            tuple containing:
+                - equivalent_tension: [N] - shape (k, elements.count) - Axial force in each element, for each scenario
+                - equivalent_loads: [N] - shape (k, nodes.count, 3) - Equivalent external loads, for each scenario
+        """
+        assert isinstance(elements, PyElements), "elements must be an instance of PyElements"
+        d_l0 = np.asarray(free_length_variations, dtype=float).reshape((-1, elements.count))
+
+        # flexibility Lfree/EA of the elements in each scenario - shape (k, elements.count), as in PyElements.flexibility
+        free_length = elements.free_length + d_l0
+        young = elements._get_current_young(elements.current_length - free_length, elements.youngs)
+        flexibility = _compute_flexibility(free_length, young * elements.area)
+        Ke = 1/flexibility # [N/m] - stiffness of the elements = EA/(new_Lfree)
+
+        equivalent_tension = Ke * -d_l0
+        return equivalent_tension, _compute_equivalent_loads(elements, equivalent_tension)
+
+    @staticmethod
+    def compute_unit_influence(elements: PyElements, actuated_elements: np.ndarray) -> tuple:
+        """Compute the equivalent tension and loads of a unit free length variation of each actuated element.
+
+        The stiffness of the elements is the one of the current state, such that the scenarios can be superposed:
+        this is the derivative of the equivalent tension and loads with respect to the free length variations.
+
+        Args:
+            elements: PyElements instance containing element properties and current state
+            actuated_elements: [-] - shape (k,) - indices of the actuated elements
+
+        Returns:
+            tuple containing:
+                - equivalent_tension: [N/m] - shape (k, elements.count) - Axial force in each element, for each actuated element
+                - equivalent_loads: [N/m] - shape (k, nodes.count, 3) - Equivalent external loads, for each actuated element
+        """
+        assert isinstance(elements, PyElements), "elements must be an instance of PyElements"
+        actuated_elements = np.asarray(actuated_elements, dtype=int).reshape((-1,))
+        k = actuated_elements.size
+
+        Ke = 1/elements.flexibility # [N/m] - current stiffness of the elements = EA/Lfree
+        equivalent_tension = np.zeros((k, elements.count))
+        equivalent_tension[np.arange(k), actuated_elements] = -Ke[actuated_elements]  # a unit lengthening creates a compression force
+        return equivalent_tension, _compute_equivalent_loads(elements, equivalent_tension)
+
+
+def _compute_equivalent_loads(elements: PyElements, equivalent_tension: np.ndarray) -> np.ndarray:
+    """[N] - shape (nodes.count, 3) or (k, nodes.count, 3) - Loads equivalent to the tension (of shape (elements.count,) or (k, elements.count))."""
+    return compute_nodal_resisting_forces(elements.end_nodes, elements.direction_cosines, -equivalent_tension, elements.nodes.count)
@@ -17,8 +17,35 @@
 # List of the contributors to the development of Muscle: see NOTICE file.
 # Description and complete License: see NOTICE file.
 
+import hashlib
 import numpy as np
-from .pynodes import PyNodes
+import scipy.sparse as sp
+from .pynodes import PyNodes, _read_only
+
+
+def _compute_flexibility(free_length: np.ndarray, ea: np.ndarray, out: np.ndarray = None, mask: np.ndarray = None) -> np.ndarray:
+    """[m/N] - Flexibility L_free/(EA) of the elements, or a large value (1e6) where EA = 0 (e.g. for slack cables).
+
+    Args:
+        free_length: [m] - shape (elements_count,) or (k, elements_count) - Free length of elements
+        ea: [N] - same shape - Axial stiffness E*A of elements
+        out: optional preallocated array of the same shape, for the result
+        mask: optional preallocated boolean array of the same shape, for the elements with EA > 0
+    """
+    if out is None:
+        out = np.empty(np.shape(ea), dtype=float)
+    out.fill(1e6)  # Default large value (in m/N) for zero EA: the flexibility L/EA is infinite
+    mask = np.greater(ea, 0, out=mask)
+    np.divide(free_length, ea, out=out, where=mask)
+    return out
+
+
+def _digest(*arrays: np.ndarray) -> bytes:
+    """Digest of the values of the arrays, to detect their in-place modifications without keeping a copy of them."""
+    h = hashlib.blake2b(digest_size=16)
+    for arr in arrays:
+        h.update(np.ascontiguousarray(arr))
+    return h.digest()
 
 
 class PyElements:
@@ -31,9 +58,11 @@ class PyElements:
             - count: Number of elements
             - type: [-] Element types (-1: strut, 1: cable)
             - end_nodes: [-] Element-node connectivity indices
-            - connectivity: [-] Element-node connectivity matrix
+            - incidence_matrix: [-] Element-node connectivity matrix (scipy.sparse CSR)
+            - connectivity: [-] Element-node connectivity matrix (dense)
             - area: [mm²] Cross-section area of elements
             - youngs: [MPa] 2 Young's moduli per element defining the bilinear material. 
+            The arrays and the incidence matrix are shared by reference (read-only) with all the copies of the instance.
         
         2. Mutable State:
             - nodes: PyNodes instance containing current node coordinates
@@ -45,6 +74,10 @@ class PyElements:
             - flexibility: [m/N] = L/(EA), large value (1e6) if EA ≈ 0
             - current_length: [m] Based on current node coordinates
             - direction_cosines: [-] Unit vectors (x,y,z)            
+            These read-only arrays are computed together, once per state of the nodes and free lengths, and recomputed 
+            when the nodes instance or its coordinate and displacement arrays, or the free length array, are replaced 
+            or modified in place (see geometry_computations_count and geometry_cache_hits). In-place modifications 
+            are detected with a digest of the initial coordinates, displacements and free lengths, checked on each access.
 
             
         Args:
@@ -71,6 +104,14 @@ class PyElements:
         # Initialize mutable state attributes
         self._free_length = np.array([], dtype=float)
         self._tension = np.array([], dtype=float)
+
+        # Cache of the state-dependent properties, valid for the nodes, coordinates, displacements and free lengths stored in _geometry_state, 
+        # and for their values stored in _geometry_digest
+        self._geometry = None
+        self._geometry_state = None
+        self._geometry_digest = None
+        self.geometry_computations_count = 0  # number of times the state-dependent properties were computed
+        self.geometry_cache_hits = 0  # number of accesses served from the cache
         
         # Initialize the instance
         self._initialize(type, end_nodes, area, youngs, free_length, tension)
@@ -140,18 +181,19 @@ class PyElements:
         else:
             raise ValueError("impossible to initialize PyElements without end_nodes, no end_nodes provided")
         
-        # Initialize immutable arrays
-        self._type = self._check_and_reshape_array(type, "type")
-        self._area = self._check_and_reshape_array(area, "area")
-        self._youngs = self._check_and_reshape_array(youngs, "youngs", shape_suffix=2)
+        # Initialize immutable arrays, frozen once and shared with the copies
+        self._end_nodes = _read_only(self._end_nodes)
+        self._type = _read_only(self._check_and_reshape_array(type, "type"))
+        self._area = _read_only(self._check_and_reshape_array(area, "area"))
+        self._youngs = _read_only(self._check_and_reshape_array(youngs, "youngs", shape_suffix=2))
             
         # Calculate free length based on node coordinates if not provided
         self._free_length = self._check_and_reshape_array(free_length, "free_length")
         
         self._tension = self._check_and_reshape_array(tension, "tension")
             
-        # Compute connectivity matrix
-        self._compute_connectivity()
+        # The connectivity matrix is computed at the first access, or shared by the instance this one is copied from
+        self._connectivity = None
     
     def _calculate_current_length(self):
         """Calculate current length of elements based on node coordinates."""
@@ -172,20 +214,20 @@ class PyElements:
         return np.sqrt(np.sum(vectors ** 2, axis=1))
     
     def _compute_connectivity(self):
-        """Compute connectivity matrix between nodes and elements.
+        """Compute connectivity matrix between nodes and elements, stored in scipy.sparse CSR format (2 non-zero entries per element).
         """
         if self._count == 0 or self._nodes.count == 0:
-            self._connectivity = np.array([], dtype=int).reshape((0, 0))
+            self._connectivity = sp.csr_matrix((0, 0), dtype=int)
             return
             
-        connectivity = np.zeros((self._count, self._nodes.count), dtype=int)
         # According to:
         # - Vassart, Motro, 1999, Multiparametered Formfinding Method: Application to Tensegrity Systems
         # - Sheck, 1974, The force density method for formfinding and computation of networks
-        for element_index, (node0, node1) in enumerate(self._end_nodes):
-            connectivity[element_index, node0] = 1 # start node of element
-            connectivity[element_index, node1] = -1 # end node of element
-        self._connectivity = -connectivity  # According to J.Feron: minus sign to make n1-n0 consistent with direction cosines (x1-x0)/L
+        # According to J.Feron: -1 for the start node and 1 for the end node to make n1-n0 consistent with direction cosines (x1-x0)/L
+        rows = np.repeat(np.arange(self._count), 2)
+        data = np.tile(np.array([-1, 1], dtype=int), self._count)
+        self._connectivity = sp.csr_matrix((data, (rows, self._end_nodes.reshape(-1))),
+                                           shape=(self._count, self._nodes.count), dtype=int)
     
 
 
@@ -211,15 +253,24 @@ class PyElements:
         return self._end_nodes
     
     @property
-    def connectivity(self) -> np.ndarray:
-        """[-] - shape (elements_count, nodes.count) - Connectivity matrix between elements and nodes.
+    def incidence_matrix(self) -> sp.csr_matrix:
+        """[-] - shape (elements_count, nodes.count) - Connectivity matrix between elements and nodes, in scipy.sparse CSR format.
         Entry (i,j) is:
         - -1 if node j is the starting node of element i
         - 1 if node j is the ending node of element i
         - 0 otherwise
         """
+        if self._connectivity is None:
+            self._compute_connectivity()
         return self._connectivity
 
+    @property
+    def connectivity(self) -> np.ndarray:
+        """[-] - shape (elements_count, nodes.count) - Dense copy of the incidence_matrix, kept for compatibility.
+        Prefer incidence_matrix for large structures.
+        """
+        return self.incidence_matrix.toarray()
+
     @property
     def area(self) -> np.ndarray:
         """[mm²] - shape (elements_count,) - Cross-section area of elements"""
@@ -245,44 +296,73 @@ class PyElements:
     @property
     def direction_cosines(self) -> np.ndarray:
         """[-] - shape (elements_count, 3) - Current direction cosines"""
-        coords = self._nodes.coordinates
-        n0 = self._end_nodes[:, 0]
-        n1 = self._end_nodes[:, 1]
-        dx = coords[n1, 0] - coords[n0, 0]
-        dy = coords[n1, 1] - coords[n0, 1]
-        dz = coords[n1, 2] - coords[n0, 2]
-        current_length = np.sqrt(dx*dx + dy*dy + dz*dz)
-        return np.column_stack((dx/current_length, dy/current_length, dz/current_length))
+        return self._get_geometry()["direction_cosines"]
 
     @property
     def current_length(self) -> np.ndarray:
         """[m] - shape (elements_count,) - Current length of elements"""
-        return self._calculate_current_length()
+        return self._get_geometry()["current_length"]
     
     @property
     def elastic_elongation(self) -> np.ndarray:
         """[m] - shape (elements_count,) - Elastic elongation of elements (current_length - free_length)"""
-        return self.current_length - self.free_length
+        return self._get_geometry()["elastic_elongation"]
     
     @property
     def young(self) -> np.ndarray:
         """[MPa] - shape (elements_count,) - Current Young's modulus depending on tension state"""
-        return self._get_current_young(self.elastic_elongation, self._youngs)
+        return self._get_geometry()["young"]
     
     @property
     def flexibility(self) -> np.ndarray:
         """[m/N] - shape (elements_count,) - Current flexibility (L/EA).
         Returns a large value (1e6) when EA = 0 (e.g., for slack cables)."""
+        return self._get_geometry()["flexibility"]
+
+    def _get_geometry(self) -> dict:
+        """Get the state-dependent properties of the elements, computed once per state of the nodal displacements and free lengths.
+
+        The cache is valid if the same arrays are used (identity) and if their values did not change since the computation (digest), 
+        such that in-place modifications (e.g. through the buffer of a CompactTrussState) are taken into account.
         
-        infinite_flexibility = 1e6 # Default large value (in m/N) for zero EA
-        if self._count == 0:
-            return np.array([], dtype=float)
-            
-        ea = self.young * self.area  # [MPa * mm²] = [N]
-        mask = ea > 0  # If EA is zero, flexibility L/EA is infinite
-        result = np.full(self._count, infinite_flexibility, dtype=float)  
-        result[mask] = self.free_length[mask] / ea[mask]
-        return result
+        Returns:
+            dict of read-only arrays: current_length, direction_cosines, elastic_elongation, young and flexibility
+        """
+        nodes = self._nodes
+        free_length = self._free_length
+        state = (nodes, nodes.initial_coordinates, nodes.displacements, free_length)
+        digest = _digest(*state[1:])
+        cached = self._geometry_state
+        if cached is not None and all(a is b for a, b in zip(cached, state)) and digest == self._geometry_digest:
+            self.geometry_cache_hits += 1
+            return self._geometry
+
+        # 1) geometry, from the current coordinates
+        coords = nodes.coordinates
+        vectors = coords[self._end_nodes[:, 1]] - coords[self._end_nodes[:, 0]]
+        current_length = np.sqrt(np.sum(vectors ** 2, axis=1))
+        direction_cosines = vectors / current_length[:, np.newaxis]
+
+        # 2) material, from the elastic elongation
+        elastic_elongation = current_length - free_length
+        young = self._get_current_young(elastic_elongation, self._youngs)
+        flexibility = _compute_flexibility(free_length, young * self._area)  # [MPa * mm²] = [N]
+
+        geometry = {"current_length": current_length, "direction_cosines": direction_cosines, 
+                    "elastic_elongation": elastic_elongation, "young": young, "flexibility": flexibility}
+        for arr in geometry.values():
+            arr.flags.writeable = False
+        self._geometry = geometry
+        self._geometry_state = state
+        self._geometry_digest = digest
+        self.geometry_computations_count += 1
+        return geometry
+
+    def invalidate_geometry(self):
+        """Discard the cached state-dependent properties, such that they are recomputed on the next access."""
+        self._geometry = None
+        self._geometry_state = None
+        self._geometry_digest = None
 
     # Note : tension is considered as an input to construct an element,
     # It is not computed from EA(elastic_elongation)/free_length because,
@@ -294,13 +374,14 @@ class PyElements:
         """Get elements young modulus based on current elongation (compression/tension), or maximum Young's modulus when elongation is zero.
         
         Args:
-            elongation: [m] Array of shape (elements_count,) containing positive values for tension, negative values for compression, or zero for unknown
+            elongation: [m] Array of shape (elements_count,) containing positive values for tension, negative values for compression, or zero for unknown.
+                        A stack of shape (k, elements_count) is also accepted.
             youngs: [MPa] Array of shape (elements_count, 2) containing the young modulus values for the bilinear material in compression and tension
             
         Returns:
-            [MPa] Array of shape (elements_count,) containing current Young's modulus
+            [MPa] Array of the same shape as elongation containing current Young's modulus
         """
-        assert elongation.shape[0] == self.count, f"Elongation shape {elongation.shape} does not match elements count {self.count}"
+        assert elongation.shape[-1] == self.count, f"Elongation shape {elongation.shape} does not match elements count {self.count}"
         young_compression = youngs[:, 0]
         young_tension = youngs[:, 1]
 
@@ -312,7 +393,7 @@ class PyElements:
         # When elongation is zero, use maximum Young's modulus, assuming the element will be stressed in its prefered direction.
         where0 = np.isclose(elongation, 0)
         if np.any(where0):
-            current_young[where0] = np.maximum(young_compression[where0], young_tension[where0])
+            current_young = np.where(where0, np.maximum(young_compression, young_tension), current_young)
         
         return current_young
     
@@ -336,6 +417,16 @@ class PyElements:
             tension=tension
         )
     
+    def _share_connectivity(self, copy: 'PyElements') -> 'PyElements':
+        """Share the incidence matrix with a copy of this instance, when the copy has the same topology.
+
+        Returns:
+            The copy
+        """
+        if copy._end_nodes is self._end_nodes and copy._nodes.count == self._nodes.count:
+            copy._connectivity = self.incidence_matrix
+        return copy
+
     # Public Methods
     def copy(self, nodes: 'PyNodes') -> 'PyElements':
         """Create a copy with current state.
@@ -346,15 +437,15 @@ class PyElements:
         Returns:
             New instance with current state
         """
-        return self._create_copy(
+        return self._share_connectivity(self._create_copy(
             nodes=nodes,
-            type=self._type.copy(),
-            end_nodes=self._end_nodes.copy(),
-            area=self._area.copy(),
-            youngs=self._youngs.copy(),
+            type=self._type,
+            end_nodes=self._end_nodes,
+            area=self._area,
+            youngs=self._youngs,
             free_length=self._free_length.copy(),
             tension=self._tension.copy()
-        )
+        ))
     
     def copy_and_update(self, nodes: 'PyNodes', free_length: np.ndarray = None, tension: np.ndarray = None) -> 'PyElements':
         """Create a copy with updated state values, or use existing state if None.
@@ -371,15 +462,15 @@ class PyElements:
         free_length = self._check_and_reshape_array(free_length, "free_length")
         tension = self._check_and_reshape_array(tension, "tension")
         
-        return self._create_copy(
+        return self._share_connectivity(self._create_copy(
             nodes=nodes,
-            type=self._type.copy(),
-            end_nodes=self._end_nodes.copy(),
-            area=self._area.copy(),
-            youngs=self._youngs.copy(),
+            type=self._type,
+            end_nodes=self._end_nodes,
+            area=self._area,
+            youngs=self._youngs,
             free_length=free_length,
             tension=tension
-        )
+        ))
     
     def copy_and_add(self, nodes: PyNodes, free_length_variation: np.ndarray = None,
                      tension_increment: np.ndarray = None) -> 'PyElements':
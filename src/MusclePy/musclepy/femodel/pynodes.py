@@ -20,6 +20,23 @@
 from argparse import ArgumentError
 import numpy as np
 
+
+def _read_only(arr: np.ndarray) -> np.ndarray:
+    """Return an immutable array, that can be shared by reference between copies.
+
+    A read-only input array is taken over without copy, even if it is a view on a larger buffer: by freezing it, the caller 
+    hands the data over to the instance (e.g. an array frozen by another PyNodes or PyElements, or a read-only view on the 
+    buffer of a CompactTrussState) and must not modify it afterwards through another view. 
+    A writeable input array remains owned by the caller: it is copied once and frozen, such that later changes to the input 
+    array do not affect the instances sharing it.
+    """
+    if not arr.flags.writeable:
+        return arr
+    frozen = arr.copy()
+    frozen.flags.writeable = False
+    return frozen
+
+
 class PyNodes:
     def __init__(self, initial_coordinates=None, dof=None, loads=None, displacements=None, reactions=None, resisting_forces=None):
         """Python equivalent of C# PyNodes class, combining nodes state and results.
@@ -28,6 +45,7 @@ class PyNodes:
         1. Immutable attributes (initialized once from C#):
             - initial_coordinates: Initial nodal coordinates
             - dof: Degrees of freedom (support conditions)
+            These arrays are read-only (copied once from the inputs), shared by reference with all the copies of the instance.
 
         2. Immutable attributes (computed internally):
             - count: Number of nodes
@@ -128,12 +146,13 @@ class PyNodes:
                     raise ValueError(f"initial_coordinates as 2D array must have shape (n,3), got shape {initial_coords.shape}")
                 self._count = len(initial_coords)
                 self._initial_coordinates = initial_coords
+            self._initial_coordinates = _read_only(self._initial_coordinates)
         else:  
             raise ArgumentError(f"impossible to initialize PyNodes without initial_coordinates, no initial_coordinates provided")
 
         # Handle degrees of freedom
         if dof is not None:
-            self._dof = self._check_and_reshape_array(dof, "dof")
+            self._dof = _read_only(self._check_and_reshape_array(dof, "dof"))
             self._fixations_count = np.sum(~self._dof.flatten())
 
         # Initialize state arrays
@@ -225,8 +244,8 @@ class PyNodes:
             A new instance with the current state
         """
         return self._create_copy(
-            initial_coordinates=self._initial_coordinates.copy(),
-            dof=self._dof.copy(),
+            initial_coordinates=self._initial_coordinates,
+            dof=self._dof,
             loads=self._loads.copy(),
             displacements=self._displacements.copy(),
             reactions=self._reactions.copy(),
@@ -254,8 +273,8 @@ class PyNodes:
         resisting_forces = self._check_and_reshape_array(resisting_forces, "resisting_forces")
         
         return self._create_copy(
-            initial_coordinates=self._initial_coordinates.copy(),
-            dof=self._dof.copy(),
+            initial_coordinates=self._initial_coordinates,
+            dof=self._dof,
             loads=loads,
             displacements=displacements,
             reactions=reactions,
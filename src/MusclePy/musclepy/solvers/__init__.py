@@ -29,23 +29,39 @@ from . import selfstress
 from . import test
 
 # Expose key solver functions
-from .svd.main import main_singular_value_decomposition
+from .svd.main import main_singular_value_decomposition, update_singular_value_decomposition
 from .svd.py_results_svd import PyResultsSVD
-from .selfstress.modes import localize_self_stress_modes
+from .selfstress.modes import localize_self_stress_modes, self_stress_modes_to_dense
 from .dm.linear_dm import main_linear_displacement_method
-from .dm.nonlinear_dm import main_nonlinear_displacement_method
+from .dm.nonlinear_dm import main_nonlinear_displacement_method, iterate_nonlinear_displacement_method, NonlinearDMStep
+from .dm.py_config_dm import PyConfigDM
+from .dm.linear_dm_session import LinearDMSession
+from .dm.linear_dm_batch import main_linear_displacement_method_batch
+from .dm.prestress_influence import compute_prestress_influence_matrix, PrestressInfluenceMatrix
 from .dr.main import main_dynamic_relaxation
+from .dr.dr_engine import DynamicRelaxationEngine, main_dynamic_relaxation_inplace
 from .test.test_script import main as test_script_main
 
 # Define __all__ 
 __all__ = [
     'dm', 'dr', 'svd', 'selfstress', 'test',
     'main_singular_value_decomposition',
+    'update_singular_value_decomposition',
     'PyResultsSVD',
     'localize_self_stress_modes',
+    'self_stress_modes_to_dense',
     'main_linear_displacement_method',
     'main_nonlinear_displacement_method',
+    'iterate_nonlinear_displacement_method',
+    'NonlinearDMStep',
+    'PyConfigDM',
+    'LinearDMSession',
+    'main_linear_displacement_method_batch',
+    'compute_prestress_influence_matrix',
+    'PrestressInfluenceMatrix',
     'main_dynamic_relaxation',
+    'main_dynamic_relaxation_inplace',
+    'DynamicRelaxationEngine',
     'test_script_main'
 ]
 
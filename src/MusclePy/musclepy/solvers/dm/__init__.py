@@ -24,6 +24,13 @@ This package contains linear and nonlinear displacement method solvers for struc
 """
 
 from .linear_dm import main_linear_displacement_method
-from .nonlinear_dm import main_nonlinear_displacement_method
-
-__all__ = ['main_linear_displacement_method', 'main_nonlinear_displacement_method']
+from .nonlinear_dm import main_nonlinear_displacement_method, iterate_nonlinear_displacement_method, NonlinearDMStep
+from .py_config_dm import PyConfigDM
+from .linear_dm_session import LinearDMSession
+from .linear_dm_batch import main_linear_displacement_method_batch, LinearDMBatchResults
+from .prestress_influence import compute_prestress_influence_matrix, PrestressInfluenceMatrix
+
+__all__ = ['main_linear_displacement_method', 'main_nonlinear_displacement_method', 'PyConfigDM', 'LinearDMSession',
+           'iterate_nonlinear_displacement_method', 'NonlinearDMStep',
+           'main_linear_displacement_method_batch', 'LinearDMBatchResults',
+           'compute_prestress_influence_matrix', 'PrestressInfluenceMatrix']
@@ -20,11 +20,16 @@
 from musclepy.femodel.pyelements import PyElements
 from musclepy.femodel.pytruss import PyTruss
 from musclepy.femodel.prestress_scenario import PrestressScenario
+import warnings
 import numpy as np
+import scipy.linalg as sla
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
 
 
 def main_linear_displacement_method(structure: PyTruss, loads_increment: np.ndarray, 
-                                    free_length_variation: np.ndarray) -> PyTruss:
+                                    free_length_variation: np.ndarray, sparse: bool = False, solver: str = "lagrange",
+                                    singular: str = "perturb", seed=None) -> PyTruss:
     """Solve the linear displacement method for a structure with incremental loads and prestress (=free length changes).
     
     This function:
@@ -35,12 +40,20 @@ def main_linear_displacement_method(structure: PyTruss, loads_increment: np.ndar
         structure: Current structure state
         loads_increment: [N] - shape (3*nodes.count,) - External load increments to apply
         free_length_variation: [m] - shape (elements.count,) - Free length variations to apply
+        sparse: If True, assemble and solve the stiffness matrix in scipy.sparse format (for large models).
+        solver: "lagrange" (default) or "partition", how the support conditions are enforced (see StiffnessFactorization).
+        singular: How a singular stiffness matrix (mechanism) is handled:
+                - "perturb" (default): the structure is perturbed with tiny random displacements, and the system is solved again
+                - "regularize" or "pseudo_inverse": deterministic solve of the near-singular system (see StiffnessFactorization),
+                  np.linalg.LinAlgError is raised if it fails (the structure is never perturbed)
+        seed: None, int or np.random.Generator - seed of the random perturbation (see perturb)
         
     Returns:
         Updated PyTruss with incremented state
     """
     #check input
     assert isinstance(structure, PyTruss), "structure must be an instance of PyTruss"
+    _check_singular_mode(singular)
     loads_increment = structure.nodes._check_and_reshape_array(loads_increment, "loads_increment")
     free_length_variation = structure.elements._check_and_reshape_array(free_length_variation, "free_length_variation")
  
@@ -61,15 +74,22 @@ def main_linear_displacement_method(structure: PyTruss, loads_increment: np.ndar
         # Solve linear system
         displacements, reactions, resisting_forces, tension = core_linear_displacement_method(
             initial, 
-            total_loads_increment
+            total_loads_increment,
+            sparse,
+            solver,
+            _factorization_singular_mode(singular)
         )
         
     except np.linalg.LinAlgError:
+        if singular != "perturb":
+            raise
         # In case of singular matrix, perturb the structure with tiny displacements
-        perturbed = perturb(initial)
+        perturbed = perturb(initial, seed=seed)
         displacements, reactions, resisting_forces, tension = core_linear_displacement_method(
             perturbed, 
-            total_loads_increment
+            total_loads_increment,
+            sparse,
+            solver
         )
     
     # Add the axial prestress force to the resulting axial forces
@@ -87,17 +107,25 @@ def main_linear_displacement_method(structure: PyTruss, loads_increment: np.ndar
     return final_structure
 
 
-def core_linear_displacement_method(current: PyTruss, loads_increment: np.ndarray):
+def core_linear_displacement_method(current: PyTruss, loads_increment: np.ndarray, sparse: bool = False, solver: str = "lagrange",
+                                    singular: str = "raise"):
     """Solve the linear displacement method for the current structure with additional loads.
 
     Args:
         current: Structure containing the current state
         loads_increment: [N] - shape (3*nodes.count,) - Additional loads to apply
+        sparse: If True, the tangent stiffness matrix is assembled in scipy.sparse format and solved with a sparse LU factorization.
+                If False (default), dense matrices are used, which is faster for small models.
+        solver: How the support conditions are enforced (see StiffnessFactorization):
+                - "lagrange" (default): the stiffness matrix is bordered by the constraints (Lagrange multipliers = reactions)
+                - "partition": the fixed DOFs are eliminated and only the free DOFs are solved for
+        singular: "raise" (default), "regularize" or "pseudo_inverse", how a singular stiffness matrix is handled (see StiffnessFactorization)
     
     Returns:
         tuple containing:
         - displacements_increment: [m] - shape (3*nodes.count,) - Nodal displacement increments
         - reactions_increment: [N] - shape (fixations.count,) - Support reaction increments
+        - resisting_forces_increment: [N] - shape (3*nodes.count,) - Resisting forces increments
         - tension_increment: [N] - shape (elements.count,) - Element tension increments
     """
     # 0) check input
@@ -106,11 +134,41 @@ def core_linear_displacement_method(current: PyTruss, loads_increment: np.ndarra
     nodes_count = current.nodes.count
     assert loads_increment.size == 3*nodes_count, f"Loads increment must have size {3*nodes_count} but got {loads_increment.size}"
 
+    # 1) Compute tangent stiffness matrix in the current structure state.
+    K, local_material_stiffness_matrices, local_geometric_stiffness_matrices = assemble_tangent_stiffness_matrix(current, sparse)
 
-    # 1) Compute tangent stiffness matrix
-    from musclepy.utils.matrix_calculations import local_to_global_matrix, compute_local_material_stiffness_matrices, compute_local_geometric_stiffness_matrices
+    # 2) Solve system  K @ d = loads considering also the support conditions
+    #    see equation 2.7 page 32 of J.Feron's master thesis.
+    factorization = StiffnessFactorization(K, current.nodes.dof, solver, singular)
+    displacements_increment, reactions_increment = factorization.solve(loads_increment.reshape((-1,)))
+
+    # 3) Compute tensions by post-processing the displacements
+    (tension_increment, resisting_forces_increment) = _post_process(displacements_increment, 
+                                                                    local_material_stiffness_matrices, 
+                                                                    local_geometric_stiffness_matrices, 
+                                                                    current.elements.end_nodes, 
+                                                                    current.elements.direction_cosines)
+
+    return (displacements_increment.reshape((-1,)), reactions_increment.reshape((-1,)), resisting_forces_increment.reshape((-1,)), tension_increment.reshape((-1,)))
+
+
+def assemble_tangent_stiffness_matrix(current: PyTruss, sparse: bool = False) -> tuple:
+    """Assemble the tangent stiffness matrix (material + geometric) of the structure in its current state.
+
+    Args:
+        current: Structure containing the current state
+        sparse: If True, the global matrix is returned in scipy.sparse CSR format
+
+    Returns:
+        tuple containing:
+        - K: [N/m] - shape (3*nodes.count, 3*nodes.count) - Tangent stiffness matrix (dense or sparse)
+        - local_material_stiffness_matrices: [N/m] - shape (elements.count, 6, 6)
+        - local_geometric_stiffness_matrices: [N/m] - shape (elements.count, 6, 6)
+    """
+    from musclepy.utils.matrix_calculations import local_to_global_matrix, compute_coo_indices, compute_local_material_stiffness_matrices, compute_local_geometric_stiffness_matrices
+    nodes_count = current.nodes.count
         
-    # 1.1) local element stiffnesses : [N/m] - List(elements.count) of shape (6,6) matrices
+    # 1) local element stiffnesses : [N/m] - shape (elements.count, 6, 6)
     local_material_stiffness_matrices = compute_local_material_stiffness_matrices(
         current.elements.direction_cosines,
         current.elements.flexibility
@@ -120,62 +178,349 @@ def core_linear_displacement_method(current: PyTruss, loads_increment: np.ndarra
         current.elements.current_length
     )
 
-    # 1.2) Convert local matrices to global matrices of shape (3*nodes.count, 3*nodes.count)
+    # 2) Convert local matrices to global matrices of shape (3*nodes.count, 3*nodes.count)
+    coo_indices = compute_coo_indices(current.elements.end_nodes)
     global_material_stiffness_matrix = local_to_global_matrix(
         local_material_stiffness_matrices,
         current.elements.end_nodes,
-        nodes_count
+        nodes_count,
+        sparse,
+        coo_indices
     )
     global_geometric_stiffness_matrix = local_to_global_matrix(
         local_geometric_stiffness_matrices,
         current.elements.end_nodes,
-        nodes_count
+        nodes_count,
+        sparse,
+        coo_indices
     )
-    # 1.3) tangent stiffness matrix in the current structure state. 
+    # 3) tangent stiffness matrix in the current structure state. 
     K = global_material_stiffness_matrix + global_geometric_stiffness_matrix  
+    return K, local_material_stiffness_matrices, local_geometric_stiffness_matrices
 
-    # 1.4) Compute constrained stiffness matrix, accounting for support conditions
-    K_constrained = _constrain_stiffness_matrix(current.nodes.dof, K)
-    
 
-    # 2) Solve system  K @ d = loads considering also the support conditions (K @ reactions = 0)
-    #    see equation 2.7 page 32 of J.Feron's master thesis.
+class StiffnessFactorization:
+    """Factorization of the tangent stiffness matrix of a structure, accounting for the support conditions.
 
-    # 2.1) Build right-hand side vector with loads and imposing zero displacements at support
-    rhs = np.zeros((K_constrained.shape[0], 1))
-    rhs[:3*nodes_count] = loads_increment.reshape((-1,1))
+    The factorization is computed once, and can then be used to solve the system K @ d = loads 
+    for any number of right-hand sides by back-substitution.
 
-    # 2.2) Solve system K @ d = loads & K @ reactions = 0
-    displacements_reactions = np.linalg.solve(K_constrained, rhs)  
+    Two solvers are available:
+    - "lagrange": the stiffness matrix is bordered by the constraints, whose Lagrange multipliers are the (opposite of the) reactions.
+                  see equation 2.7 page 32 of J.Feron's master thesis.
+    - "partition": the fixed DOFs are eliminated. The reduced system K_ff @ d_f = loads_f is solved on the free DOFs only,
+                   and the reactions are recovered from the fixed rows: reactions = K_cf @ d_f - loads_c.
 
-    # 2.3) Extract displacements and reactions
-    displacements_increment = displacements_reactions[:3*nodes_count]
-    reactions_increment = -displacements_reactions[3*nodes_count:]  
+    Dense matrices are factorized with a LU decomposition (scipy.linalg.lu_factor), 
+    sparse matrices with a sparse LU decomposition (scipy.sparse.linalg.splu).
 
+    Singular (mechanisms) or near-singular stiffness matrices are handled according to the singular argument:
+    - "raise": np.linalg.LinAlgError is raised if the matrix is exactly singular (the caller may perturb the structure).
+    - "regularize" and "pseudo_inverse": the reciprocal condition number of the stiffness matrix K_ff of the free DOFs 
+      is estimated from its LU factorization (LAPACK gecon for dense matrices, ratio of the pivots for sparse matrices). 
+      If it is lower than rcond, the mechanisms are identified as the eigenvectors of K_ff whose eigenvalues are lower 
+      than rcond times the largest one. Only these few eigenvectors are computed, by a sparse eigensolver in shift-invert mode.
+      The system is then solved on the orthogonal complement of the mechanisms, and along the mechanisms:
+      - "regularize" adds a small stiffness (regularization times the largest eigenvalue) along the mechanisms,
+        such that the loads exciting the mechanisms create large but finite displacements along them.
+      - "pseudo_inverse" gives the least-squares solution of minimal norm: no displacement along the mechanisms,
+        the loads exciting the mechanisms are not equilibrated.
+      Both modes use the partition solver, since the mechanisms are defined on the free DOFs.
 
-    # 3) Compute tensions by post-processing the displacements
-    (tension_increment, resisting_forces_increment) = _post_process(displacements_increment, 
-                                                                    local_material_stiffness_matrices, 
-                                                                    local_geometric_stiffness_matrices, 
-                                                                    current.elements.end_nodes, 
-                                                                    current.elements.direction_cosines)
+    Attributes:
+        solver: "lagrange" or "partition"
+        sparse: True if the stiffness matrix is a scipy.sparse matrix
+        free_dof_indices: [-] - shape (3*nodes.count - fixations.count,) - indices of the free DOFs
+        fixed_dof_indices: [-] - shape (fixations.count,) - indices of the fixed DOFs
+        singular: "raise", "regularize" or "pseudo_inverse"
+        rcond: [-] - estimate of the reciprocal condition number of K_ff (None with singular="raise")
+        mechanisms_count: [-] - number of mechanisms removed from the LU factorization (0 if the matrix is well conditioned)
+    """
+
+    solvers = ("lagrange", "partition")
+    singular_modes = ("raise", "regularize", "pseudo_inverse")
+
+    def __init__(self, stiffness_matrix, dof: np.ndarray, solver: str = "lagrange", singular: str = "raise", 
+                 rcond: float = 1e-12, regularization: float = 1e-6):
+        """Factorize the stiffness matrix.
+
+        Args:
+            stiffness_matrix: [N/m] - shape (3*nodes_count, 3*nodes_count) - Global tangent stiffness matrix (np.ndarray or scipy.sparse matrix)
+            dof: [-] - shape (nodes_count, 3) - Degrees of freedom of nodes (True if free, False if fixed)
+            solver: "lagrange" (default) or "partition"
+            singular: "raise" (default), "regularize" or "pseudo_inverse", how singular matrices are handled
+            rcond: [-] - threshold of the reciprocal condition number below which K_ff is considered singular
+            regularization: [-] - stiffness added along the mechanisms, relative to the largest eigenvalue of K_ff ("regularize")
+
+        Raises:
+            np.linalg.LinAlgError: if the (constrained) stiffness matrix is singular and singular="raise"
+        """
+        if solver not in self.solvers:
+            raise ValueError(f"solver must be one of {self.solvers}, got {solver}")
+        if singular not in self.singular_modes:
+            raise ValueError(f"singular must be one of {self.singular_modes}, got {singular}")
+        
+        dof_flat = np.asarray(dof, dtype=bool).reshape(-1)
+        n_dof = dof_flat.size
+        assert stiffness_matrix.shape == (n_dof, n_dof), f"Stiffness matrix must have shape ({n_dof}, {n_dof})"
+        assert np.any(~dof_flat), "Structure must have at least one fixed DOF"
+
+        self.solver = solver if singular == "raise" else "partition"
+        self.sparse = sp.issparse(stiffness_matrix)
+        self.free_dof_indices = np.flatnonzero(dof_flat)
+        self.fixed_dof_indices = np.flatnonzero(~dof_flat)
+        self.singular = singular
+        self.rcond = None
+        self.mechanisms_count = 0
+        self._n_dof = n_dof
+
+        if self.solver == "lagrange":
+            self._fixed_rows_of_K = None
+            self._lu_solve = _factorize(_constrain_stiffness_matrix(dof_flat.reshape((-1, 3)), stiffness_matrix))
+        else:
+            free, fixed = self.free_dof_indices, self.fixed_dof_indices
+            if self.sparse:
+                K = sp.csr_matrix(stiffness_matrix)
+                K_free = K[free][:, free]
+                self._fixed_rows_of_K = K[fixed][:, free]
+            else:
+                K_free = stiffness_matrix[np.ix_(free, free)]
+                self._fixed_rows_of_K = stiffness_matrix[np.ix_(fixed, free)]
+            if free.size == 0:
+                self._lu_solve = None
+            elif singular == "raise":
+                self._lu_solve = _factorize(K_free)
+            else:
+                self._lu_solve, self.rcond = _factorize_and_estimate_condition(K_free)
+                if self.rcond < rcond:
+                    self._lu_solve, self.mechanisms_count = _mechanisms_solve(K_free, singular, rcond, regularization)
+
+    def solve(self, loads: np.ndarray) -> tuple:
+        """Solve K @ d = loads by back-substitution, with zero displacements at the supports.
+
+        Args:
+            loads: [N] - shape (3*nodes_count,) or (3*nodes_count, k) - one or k load cases (as columns)
+
+        Returns:
+            tuple containing:
+            - displacements: [m] - shape (3*nodes_count,) or (3*nodes_count, k)
+            - reactions: [N] - shape (fixations_count,) or (fixations_count, k)
+        """
+        loads = np.asarray(loads, dtype=float)
+        assert loads.shape[0] == self._n_dof, f"loads must have {self._n_dof} rows, got shape {loads.shape}"
+        free, fixed = self.free_dof_indices, self.fixed_dof_indices
+
+        if self.solver == "lagrange":
+            rhs = np.zeros((self._n_dof + fixed.size,) + loads.shape[1:])
+            rhs[:self._n_dof] = loads
+            displacements_reactions = self._lu_solve(rhs)
+            displacements = displacements_reactions[:self._n_dof]
+            reactions = -displacements_reactions[self._n_dof:]
+        else:
+            displacements = np.zeros(loads.shape)
+            if free.size > 0:
+                displacements[free] = self._lu_solve(loads[free])
+            reactions = self._fixed_rows_of_K @ displacements[free] - loads[fixed]
+
+        if not (np.all(np.isfinite(displacements)) and np.all(np.isfinite(reactions))):
+            raise np.linalg.LinAlgError("Singular matrix")
+        return displacements, reactions
+
+
+def _factorize(matrix):
+    """LU factorization of a square dense or sparse matrix.
+
+    Args:
+        matrix: square np.ndarray or scipy.sparse matrix
+
+    Returns:
+        function solving matrix @ x = rhs for rhs of shape (N,) or (N, k)
+
+    Raises:
+        np.linalg.LinAlgError: if the matrix is exactly singular, consistently with np.linalg.solve
+    """
+    if sp.issparse(matrix):
+        try:
+            lu = spla.splu(sp.csc_matrix(matrix))
+        except RuntimeError as e:  # "Factor is exactly singular"
+            raise np.linalg.LinAlgError(str(e)) from e
+        return lu.solve
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", sla.LinAlgWarning)  # singularity is reported below as an error
+        lu, piv = sla.lu_factor(matrix)
+    if np.any(np.diag(lu) == 0):
+        raise np.linalg.LinAlgError("Singular matrix")
+    return lambda rhs: sla.lu_solve((lu, piv), rhs)
 
-    return (displacements_increment.reshape((-1,)), reactions_increment.reshape((-1,)), resisting_forces_increment.reshape((-1,)), tension_increment.reshape((-1,)))
 
-def perturb(unstable_struct: PyTruss, magnitude: float = 1e-5):
+def _factorize_and_estimate_condition(matrix) -> tuple:
+    """LU factorization of a square dense or sparse matrix, and estimate of its reciprocal condition number.
+
+    Args:
+        matrix: square np.ndarray or scipy.sparse matrix
+
+    Returns:
+        tuple containing:
+        - function solving matrix @ x = rhs for rhs of shape (N,) or (N, k) (None if the matrix is exactly singular)
+        - float: [-] - estimate of the reciprocal condition number in the 1-norm (dense), or ratio of the smallest to the largest pivot (sparse)
+    """
+    if sp.issparse(matrix):
+        try:
+            lu = spla.splu(sp.csc_matrix(matrix))
+        except RuntimeError:  # "Factor is exactly singular"
+            return None, 0.0
+        pivots = np.abs(lu.U.diagonal())
+        return lu.solve, float(pivots.min() / pivots.max()) if pivots.max() > 0 else 0.0
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", sla.LinAlgWarning)  # singularity is reported by the condition number
+        lu, piv = sla.lu_factor(matrix)
+    if np.any(np.diag(lu) == 0):
+        return None, 0.0
+    gecon, = sla.get_lapack_funcs(("gecon",), (lu,))
+    rcond, _ = gecon(lu, np.linalg.norm(matrix, 1), norm="1")
+    return (lambda rhs: sla.lu_solve((lu, piv), rhs)), float(rcond)
+
+
+def _mechanisms_solve(matrix, singular: str, rcond: float, regularization: float) -> tuple:
+    """Solve function of a singular or near-singular symmetric matrix, deflated from its mechanisms (see StiffnessFactorization).
+
+    The mechanisms Φ are removed by the LU factorization of the matrix bordered by them:
+        [K    Φ] [x]   [rhs]
+        [Φ.T  0] [μ] = [ 0 ]
+    which is regular, and sparse if K is. Since Φ are eigenvectors of K, x is the solution on the orthogonal complement
+    of the mechanisms, and μ = Φ.T @ rhs are the loads exciting the mechanisms. 
+
+    Args:
+        matrix: [N/m] - square np.ndarray or scipy.sparse matrix - stiffness matrix of the free DOFs
+        singular: "regularize" or "pseudo_inverse"
+        rcond: [-] - the mechanisms are the eigenvectors whose eigenvalues are lower than rcond times the largest one (in absolute value)
+        regularization: [-] - stiffness added along the mechanisms, relative to the largest eigenvalue ("regularize")
+
+    Returns:
+        tuple containing:
+        - function solving matrix @ x = rhs for rhs of shape (N,) or (N, k)
+        - int: number of mechanisms
+    """
+    eigenvalues, mechanisms, scale = _near_zero_modes(matrix, rcond)
+    n, m = mechanisms.shape
+    if sp.issparse(matrix):
+        modes = sp.csr_matrix(mechanisms)
+        bordered = sp.bmat([[matrix, modes], [modes.T, None]], format="csc")
+    else:
+        bordered = np.block([[matrix, mechanisms], [mechanisms.T, np.zeros((m, m))]])
+    lu_solve = _factorize(bordered)
+
+    inverse = np.zeros(m)
+    if singular == "regularize":
+        inverse = 1 / (np.abs(eigenvalues) + regularization * scale)
+
+    def solve(rhs):
+        bordered_rhs = np.zeros((n + m,) + rhs.shape[1:])
+        bordered_rhs[:n] = rhs
+        solution = lu_solve(bordered_rhs)
+        excitation = solution[n:] * inverse.reshape((-1,) + (1,) * (rhs.ndim - 1))
+        return solution[:n] + mechanisms @ excitation
+    return solve, m
+
+
+def _near_zero_modes(matrix, rcond: float, modes_count: int = 6) -> tuple:
+    """Mechanisms of a singular or near-singular symmetric matrix: its eigenvectors whose eigenvalues are lower 
+    than rcond times the largest one (in absolute value), or the eigenvector of the smallest eigenvalue if there is none.
+
+    The largest eigenvalue and the eigenvalues close to zero are computed by scipy.sparse.linalg.eigsh, the latter 
+    in shift-invert mode: the largest eigenvalues of (K - shift*I)^-1 are the eigenvalues of K closest to the small 
+    negative shift (K itself is singular). Since the Lanczos iterations may miss some copies of a repeated eigenvalue, 
+    the mechanisms already found are projected out of the operator, and the search is repeated (with twice more 
+    eigenvalues) until no new mechanism is found. 
+    Beyond n/16 eigenvectors (small matrices, or matrices with many mechanisms, such as slack cable nets), 
+    the dense eigendecomposition is cheaper and used instead.
+
+    Args:
+        matrix: [N/m] - square np.ndarray or scipy.sparse matrix
+        rcond: [-] - relative threshold of the eigenvalues of the mechanisms
+        modes_count: [-] - number of eigenvalues computed at first
+
+    Returns:
+        tuple containing:
+        - eigenvalues: [N/m] - shape (m,) - eigenvalues of the mechanisms
+        - mechanisms: [-] - shape (N, m) - orthonormal mechanisms
+        - scale: [N/m] - largest eigenvalue (in absolute value), 1 if the matrix is zero
+    """
+    n = matrix.shape[0]
+    matrix = sp.csc_matrix(matrix + matrix.T) / 2 if sp.issparse(matrix) else (matrix + matrix.T) / 2
+    modes = None
+    if 16 * modes_count <= n:
+        scale = float(np.abs(spla.eigsh(matrix, k=1, which="LM", return_eigenvectors=False, tol=1e-3)[0]))
+        scale = scale if scale > 0 else 1.0  # no stiffness at all: every DOF is a mechanism
+        modes = _shift_invert_mechanisms(matrix, rcond * scale, -np.sqrt(rcond) * scale, modes_count)
+    if modes is None:
+        eigenvalues, modes = np.linalg.eigh(matrix.toarray() if sp.issparse(matrix) else matrix)
+        scale = np.max(np.abs(eigenvalues), initial=0.0)
+        scale = scale if scale > 0 else 1.0
+        mechanisms = np.abs(eigenvalues) <= rcond * scale
+        if not np.any(mechanisms):
+            mechanisms[np.argmin(np.abs(eigenvalues))] = True  # the condition number estimate detected a near-singular matrix
+        modes = modes[:, mechanisms]
+    
+    # Rayleigh-Ritz: orthonormal mechanisms, and their eigenvalues
+    basis, _ = np.linalg.qr(modes)
+    eigenvalues, rotation = np.linalg.eigh(basis.T @ (matrix @ basis))
+    return eigenvalues, basis @ rotation, scale
+
+
+def _shift_invert_mechanisms(matrix, threshold: float, shift: float, modes_count: int):
+    """Eigenvectors of the matrix whose eigenvalues are lower than threshold (in absolute value), 
+    or the eigenvector of the eigenvalue closest to the shift if there is none (see _near_zero_modes).
+
+    Returns:
+        [-] - shape (N, m) - mechanisms, or None if the dense eigendecomposition should be used instead
+    """
+    n = matrix.shape[0]
+    try:
+        shifted_solve = _factorize(matrix - shift * (sp.identity(n, format="csc") if sp.issparse(matrix) else np.eye(n)))
+    except np.linalg.LinAlgError:  # the shift is an eigenvalue
+        return None
+
+    found = np.zeros((n, 0))
+    closest = None
+    k = modes_count
+    while 16 * (found.shape[1] + k) <= n:  # beyond, the dense eigendecomposition is cheaper
+        def shift_invert(x, found=found):  # (K - shift*I)^-1 on the orthogonal complement of the mechanisms found
+            x = x - found @ (found.T @ x)
+            y = shifted_solve(x)
+            return y - found @ (found.T @ y)
+        operator = spla.LinearOperator((n, n), matvec=shift_invert, dtype=float)
+        inverse_eigenvalues, modes = spla.eigsh(operator, k=k, which="LA")
+        eigenvalues = shift + 1 / inverse_eigenvalues
+        if closest is None:
+            closest = modes[:, [np.argmax(inverse_eigenvalues)]]
+        mechanisms = np.abs(eigenvalues) <= threshold
+        if not np.any(mechanisms):
+            return found if found.shape[1] > 0 else closest
+        found, _ = np.linalg.qr(np.column_stack((found, modes[:, mechanisms])))
+        k *= 2
+    return None
+
+
+def perturb(unstable_struct: PyTruss, magnitude: float = 1e-5, seed=None):
         """Create a copy of the structure with tiny random displacements applied to free DOFs.
         
         This method helps deal with singular stiffness matrices by slightly perturbing the structure.
         The perturbation is only applied to degrees of freedom that are not fixed by supports.
+        For a deterministic handling of singular stiffness matrices, see the singular argument of StiffnessFactorization.
         
         Args:
             magnitude: [m] Standard deviation for the random perturbation. Default is 1e-5 meters.
+            seed: None (default) to use the global numpy random state, or an int or np.random.Generator for a reproducible perturbation.
             
         Returns:
             New DM_Structure with perturbed node coordinates
         """
         # Create random perturbation with specified magnitude
-        perturbation = np.random.normal(0, magnitude, size=(unstable_struct.nodes.count, 3))
+        rng = np.random if seed is None else np.random.default_rng(seed)
+        perturbation = rng.normal(0, magnitude, size=(unstable_struct.nodes.count, 3))
         
         # Apply perturbation only to free DOFs (True = 1 if free DoF, False = 0 if fixed DoF)
         perturbation = perturbation * unstable_struct.nodes.dof
@@ -186,15 +531,31 @@ def perturb(unstable_struct: PyTruss, magnitude: float = 1e-5):
         )        
         return perturbed_struct
 
-def _constrain_stiffness_matrix(dof: np.ndarray, stiffness_matrix: np.ndarray) -> np.ndarray:
+
+_singular_modes = ("perturb",) + StiffnessFactorization.singular_modes[1:]
+
+
+def _check_singular_mode(singular: str):
+    """Check the singular argument of the solvers: "perturb", "regularize" or "pseudo_inverse"."""
+    if singular not in _singular_modes:
+        raise ValueError(f"singular must be one of {_singular_modes}, got {singular}")
+
+
+def _factorization_singular_mode(singular: str) -> str:
+    """Singular argument of StiffnessFactorization: with "perturb", the LinAlgError is raised and caught by the caller."""
+    return "raise" if singular == "perturb" else singular
+
+
+def _constrain_stiffness_matrix(dof: np.ndarray, stiffness_matrix):
     """Apply support conditions to the stiffness matrix of the structure.
 
     Args:
         dof: [-] - shape (nodes_count, 3) - Degrees of freedom of nodes (True if free, False if fixed)
-        stiffness_matrix: [N/m] - shape (3*nodes_count, 3*nodes_count) - Global stiffness matrix
+        stiffness_matrix: [N/m] - shape (3*nodes_count, 3*nodes_count) - Global stiffness matrix (np.ndarray or scipy.sparse matrix)
         
     Returns:
         [N/m] - shape (3*nodes_count + fixations_count, 3*nodes_count + fixations_count) - Constrained stiffness matrix
+        (scipy.sparse CSC matrix if stiffness_matrix is sparse)
     """
     # Get dimensions from input arrays
     n = stiffness_matrix.shape[0] // 3  # nodes_count
@@ -210,10 +571,13 @@ def _constrain_stiffness_matrix(dof: np.ndarray, stiffness_matrix: np.ndarray) -
     # Get indices of fixed DOFs
     fixed_dof_indices = np.arange(3*n)[~dof_flat]
     
+    if sp.issparse(stiffness_matrix):
+        constraints = sp.csr_matrix((np.ones(c), (np.arange(c), fixed_dof_indices)), shape=(c, 3*n))
+        return sp.bmat([[stiffness_matrix, constraints.T], [constraints, None]], format="csc")
+
     # Create constraint matrix
     constraints = np.zeros((c, 3*n))
-    for i, dof_index in enumerate(fixed_dof_indices):
-        constraints[i, dof_index] = 1
+    constraints[np.arange(c), fixed_dof_indices] = 1
 
     # Build constrained stiffness matrix
     K_constrained = np.zeros((3*n + c, 3*n + c))
@@ -224,39 +588,54 @@ def _constrain_stiffness_matrix(dof: np.ndarray, stiffness_matrix: np.ndarray) -
     return K_constrained
 
 def _post_process(displacements_increment: np.ndarray,
-                 local_material_stiffness_matrices: list, 
-                 local_geometric_stiffness_matrices: list,
+                 local_material_stiffness_matrices: np.ndarray, 
+                 local_geometric_stiffness_matrices: np.ndarray,
                  end_nodes: np.ndarray,
-                 direction_cosines: np.ndarray) -> np.ndarray:
+                 direction_cosines: np.ndarray,
+                 dof_indices: np.ndarray = None) -> tuple:
     """Compute additional element tensions from nodal displacements. Note that tensions are not computed from EA(elastic_elongation)/free_length because,
     in linear calculation, tension must be computed in the initial geometry and not in the deformed geometry (i.e. the compatibility equations have been linearized)
     
+    All elements (and all load cases) are post-processed at once.
+
     Args:
-        displacements_increment: [m] - shape (3*nodes_count,) - Nodal displacements due to additional loads
+        displacements_increment: [m] - shape (3*nodes_count,) or (3*nodes_count, k) - Nodal displacements due to additional loads (k load cases as columns)
+        local_material_stiffness_matrices: [N/m] - shape (elements_count, 6, 6)
+        local_geometric_stiffness_matrices: [N/m] - shape (elements_count, 6, 6)
+        end_nodes: [-] - shape (elements_count, 2) - Indices of end nodes
+        direction_cosines: [-] - shape (elements_count, 3) - Direction cosines of the elements
+        dof_indices: [-] - shape (elements_count, 6) - Optional global DOF indices of the elements, see compute_elements_dof_indices(end_nodes)
         
     Returns:
-        [N] - shape (elements_count,) - Element tensions
+        tuple containing:
+        - tension_increment: [N] - shape (elements_count,) or (elements_count, k) - Element tensions
+        - resisting_forces_increment: [N] - shape (3*nodes_count,) or (3*nodes_count, k) - Resisting forces
     """
+    from musclepy.utils.matrix_calculations import compute_elements_dof_indices
+
     elements_count = len(local_material_stiffness_matrices)
     assert elements_count == len(local_geometric_stiffness_matrices), "Local stiffness matrices must have the same length"
+    if dof_indices is None:
+        dof_indices = compute_elements_dof_indices(end_nodes)
     
-    # Initialize arrays
-    tension_increment = np.zeros(elements_count)
-    resisting_forces_increment = np.zeros_like(displacements_increment)
-    for i in range(elements_count):
-        n0, n1 = end_nodes[i]
-        index = np.array([3*n0, 3*n0+1, 3*n0+2, 3*n1, 3*n1+1, 3*n1+2])
-        d_local = displacements_increment[index]  # Local displacements at element nodes
-            
-        # Tangent local stiffness matrix
-        k_local = local_material_stiffness_matrices[i] + local_geometric_stiffness_matrices[i]
-            
-        # Local resisting forces at both element ends
-        f_local = k_local @ d_local
-        resisting_forces_increment[index] += f_local
-            
-        # Project forces to get tension
-        cx, cy, cz = direction_cosines[i]
-        tension_increment[i] = -(float(f_local[0])*cx + float(f_local[1])*cy + float(f_local[2])*cz) #axial forces
+    dofs_count = displacements_increment.shape[0]
+    d = displacements_increment.reshape((dofs_count, -1))  # (3n, k)
+    k = d.shape[1]
+
+    # Local displacements at element nodes : (b, 6, k)
+    d_local = d[dof_indices]
+        
+    # Local resisting forces at both element ends, with the tangent local stiffness matrices : (b, 6, k)
+    k_local = np.asarray(local_material_stiffness_matrices) + np.asarray(local_geometric_stiffness_matrices)
+    f_local = np.matmul(k_local, d_local)
+
+    # Scatter the local resisting forces on the nodes : (3n, k)
+    flat_indices = (dof_indices.reshape((-1, 1)) * k + np.arange(k)).reshape(-1)
+    resisting_forces_increment = np.bincount(flat_indices, weights=f_local.reshape(-1), minlength=dofs_count * k).reshape((dofs_count, k))
             
+    # Project the forces at the start node to get tension : (b, k)
+    tension_increment = -np.einsum('bik,bi->bk', f_local[:, :3, :], direction_cosines)
+
+    if displacements_increment.ndim == 1:
+        return (tension_increment[:, 0], resisting_forces_increment[:, 0])
     return (tension_increment, resisting_forces_increment)
@@ -0,0 +1,143 @@
+# Muscle
+
+# Copyright <2015-2025> <Université catholique de Louvain (UCLouvain)>
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# List of the contributors to the development of Muscle: see NOTICE file.
+# Description and complete License: see NOTICE file.
+
+"""
+Linear displacement method for many load cases at once (e.g. load combinations of a design envelope).
+
+All load cases are solved against a single factorization of the stiffness matrix (see LinearDMSession),
+and the results are returned as stacked arrays instead of one PyTruss per load case.
+"""
+
+import numpy as np
+from musclepy.femodel.pytruss import PyTruss
+from musclepy.femodel.prestress_scenario import PrestressScenario
+from musclepy.solvers.dm.linear_dm_session import LinearDMSession
+
+
+class LinearDMBatchResults:
+    """Results of the linear displacement method for k load cases, and their envelopes.
+
+    All results are the final state of the structure (current state + increments), as in the PyTruss returned by main_linear_displacement_method.
+
+    Attributes:
+        count: Number of load cases k
+        displacements: [m] - shape (k, nodes.count, 3) - Nodal displacements
+        reactions: [N] - shape (k, nodes.count, 3) - Support reactions
+        resisting_forces: [N] - shape (k, nodes.count, 3) - Resisting forces
+        tension: [N] - shape (k, elements.count) - Axial forces
+        tension_min: [N] - shape (elements.count,) - Minimum axial force of each element over the load cases
+        tension_max: [N] - shape (elements.count,) - Maximum axial force of each element over the load cases
+        displacement_max: [m] - shape (nodes.count,) - Maximum displacement norm of each node over the load cases
+        displacement_max_case: [-] - shape (nodes.count,) - Index of the load case giving the maximum displacement of each node
+    """
+
+    def __init__(self, displacements: np.ndarray, reactions: np.ndarray, resisting_forces: np.ndarray, tension: np.ndarray):
+        """Store the results and compute the envelopes.
+
+        Args:
+            displacements: [m] - shape (k, nodes.count, 3)
+            reactions: [N] - shape (k, nodes.count, 3)
+            resisting_forces: [N] - shape (k, nodes.count, 3)
+            tension: [N] - shape (k, elements.count)
+        """
+        self.count = tension.shape[0]
+        self.displacements = displacements
+        self.reactions = reactions
+        self.resisting_forces = resisting_forces
+        self.tension = tension
+
+        # Envelopes
+        self.tension_min = tension.min(axis=0, initial=np.inf)
+        self.tension_max = tension.max(axis=0, initial=-np.inf)
+        displacement_norms = np.linalg.norm(displacements, axis=2)  # (k, nodes.count)
+        self.displacement_max = displacement_norms.max(axis=0, initial=0.0)
+        self.displacement_max_case = displacement_norms.argmax(axis=0) if self.count > 0 else np.zeros(displacements.shape[1], dtype=int)
+
+
+def main_linear_displacement_method_batch(structure: PyTruss, loads_increments: np.ndarray, free_length_variations: np.ndarray = None,
+                                          sparse: bool = False, solver: str = "lagrange", session: LinearDMSession = None,
+                                          singular: str = "perturb", seed=None) -> LinearDMBatchResults:
+    """Solve the linear displacement method for k load cases (external loads and prestress), with one factorization of the stiffness matrix.
+
+    The free length variations are applied as equivalent prestress loads on the stiffness matrix of the structure, 
+    shared by all the load cases: the change in stiffness due to the free length variations is neglected, hence the 
+    results of the prestressed load cases are equal to main_linear_displacement_method (and LinearDMSession.run) to first order.
+
+    Args:
+        structure: Current structure state
+        loads_increments: [N] - shape (k, 3*nodes.count) or (k, nodes.count, 3) - External load increments of each load case
+        free_length_variations: [m] - shape (k, elements.count) - Free length variations of each load case (zero if None)
+        sparse: If True, assemble and factorize the stiffness matrix in scipy.sparse format (for large models)
+        solver: "lagrange" (default) or "partition", how the support conditions are enforced
+        session: Optional LinearDMSession to reuse its factorization across calls. It is bound to the structure.
+        singular: "perturb" (default), "regularize" or "pseudo_inverse", how a singular stiffness matrix is handled (see main_linear_displacement_method). 
+                  Ignored if a session is provided (the singular mode of the session is used).
+        seed: None, int or np.random.Generator - seed of the random perturbation (see perturb). Ignored if a session is provided.
+
+    Returns:
+        LinearDMBatchResults: stacked results of the k load cases and their envelopes
+    """
+    assert isinstance(structure, PyTruss), "structure must be an instance of PyTruss"
+    n = structure.nodes.count
+    b = structure.elements.count
+
+    loads = np.asarray(loads_increments, dtype=float)
+    if loads.ndim == 1:
+        loads = loads.reshape((1, -1))
+    k = loads.shape[0]
+    if loads.size != k * 3 * n:
+        raise ValueError(f"loads_increments cannot be reshaped to ({k}, {3*n}), got shape {loads.shape}")
+    loads = loads.reshape((k, 3 * n))
+
+    if free_length_variations is None:
+        free_length_variations = np.zeros((k, b))
+    free_length_variations = np.asarray(free_length_variations, dtype=float).reshape((-1, b))
+    if free_length_variations.shape[0] != k:
+        raise ValueError(f"free_length_variations must have {k} rows (one per load case), got shape {free_length_variations.shape}")
+
+    if session is None:
+        session = LinearDMSession(structure, sparse, solver, singular, seed)
+    else:
+        assert isinstance(session, LinearDMSession), "session must be an instance of LinearDMSession"
+        session.structure = structure
+
+    # 1) Equivalent prestress loads and tensions of each load case
+    eq_loads = np.zeros((k, 3 * n))
+    eq_tension = np.zeros((k, b))
+    prestressed = np.flatnonzero(np.any(free_length_variations != 0, axis=1))
+    if prestressed.size > 0:
+        eq_tension[prestressed], prestress_loads = PrestressScenario.compute_batch(structure.elements, free_length_variations[prestressed])
+        eq_loads[prestressed] = prestress_loads.reshape((prestressed.size, 3 * n))
+
+    # 2) Solve all load cases against one factorization
+    displacements, reactions, resisting_forces, tension = session.solve(loads + eq_loads)
+    tension += eq_tension
+
+    # 3) Expand the reactions from the fixed DOFs to all DOFs
+    reactions_3n = np.zeros((k, 3 * n))
+    reactions_3n[:, ~structure.nodes.dof.reshape(-1)] = reactions
+
+    # 4) Add the increments to the current state
+    nodes = structure.nodes
+    return LinearDMBatchResults(
+        displacements=nodes.displacements + displacements.reshape((k, n, 3)),
+        reactions=nodes.reactions + reactions_3n.reshape((k, n, 3)),
+        resisting_forces=nodes.resisting_forces + resisting_forces.reshape((k, n, 3)),
+        tension=structure.elements.tension + tension
+    )
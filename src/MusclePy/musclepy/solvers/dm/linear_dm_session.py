@@ -0,0 +1,271 @@
+# Muscle
+
+# Copyright <2015-2025> <Université catholique de Louvain (UCLouvain)>
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# List of the contributors to the development of Muscle: see NOTICE file.
+# Description and complete License: see NOTICE file.
+
+"""
+Linear analysis session: reuse one factorization of the tangent stiffness matrix for many load cases.
+
+The linear displacement method assembles and factorizes the stiffness matrix of the structure at each call. 
+When the same structure is analysed for many load cases (e.g. in a design loop), the session assembles and 
+factorizes the stiffness matrix once, and then solves any number of load cases by back-substitution. 
+
+The factorization is keyed on a hash of the structure state (coordinates, free lengths, tensions, areas, Young's moduli, 
+support conditions and connectivity). It is recomputed automatically when this state changes.
+"""
+
+import hashlib
+import numpy as np
+from musclepy.femodel.pytruss import PyTruss
+from musclepy.femodel.prestress_scenario import PrestressScenario
+from musclepy.utils.matrix_calculations import compute_elements_dof_indices
+from musclepy.solvers.dm.linear_dm import assemble_tangent_stiffness_matrix, StiffnessFactorization, perturb, _post_process, _check_singular_mode, _factorization_singular_mode
+
+
+class LinearDMSession:
+    """Linear displacement method with a cached factorization of the stiffness matrix.
+
+    Example:
+        session = LinearDMSession(structure)
+        for loads, free_length_variation in load_cases:
+            result = session.run(loads, free_length_variation)  # the stiffness matrix is factorized only once
+
+    Attributes:
+        sparse: True to assemble and factorize the stiffness matrix in scipy.sparse format
+        solver: "lagrange" or "partition" (see StiffnessFactorization)
+        singular: "perturb", "regularize" or "pseudo_inverse", how a singular stiffness matrix is handled (see main_linear_displacement_method)
+        factorizations_count: Number of factorizations performed since the creation of the session
+    """
+
+    def __init__(self, structure: PyTruss, sparse: bool = False, solver: str = "lagrange", singular: str = "perturb", seed=None):
+        """Initialize a linear analysis session. The factorization is computed lazily, at the first solve.
+
+        Args:
+            structure: Structure on which the load cases are applied
+            sparse: If True, assemble and factorize the stiffness matrix in scipy.sparse format (for large models)
+            solver: "lagrange" (default) or "partition", how the support conditions are enforced
+            singular: "perturb" (default), "regularize" or "pseudo_inverse", how a singular stiffness matrix is handled
+            seed: None, int or np.random.Generator - seed of the random perturbations (see perturb)
+        """
+        assert isinstance(structure, PyTruss), "structure must be an instance of PyTruss"
+        if solver not in StiffnessFactorization.solvers:
+            raise ValueError(f"solver must be one of {StiffnessFactorization.solvers}, got {solver}")
+        _check_singular_mode(singular)
+        self._structure = structure
+        self.sparse = sparse
+        self.solver = solver
+        self.singular = singular
+        self._rng = None if seed is None else np.random.default_rng(seed)
+        self.factorizations_count = 0
+
+        # cached data, valid as long as the state key does not change
+        self._state_key = None
+        self._factorization = None
+        self._factorized_state = None  # structure (possibly perturbed) whose stiffness matrix is factorized
+        self._local_material_stiffness_matrices = None
+        self._local_geometric_stiffness_matrices = None
+        self._dof_indices = None
+        self._influence_matrices = {}  # prestress influence matrices of the factorized state, keyed on the actuated elements
+        self._modified_session = None  # session on the structure with modified free lengths (see run)
+
+    @property
+    def structure(self) -> PyTruss:
+        """Structure on which the load cases are applied"""
+        return self._structure
+
+    @structure.setter
+    def structure(self, value: PyTruss):
+        """Change the structure. The factorization is recomputed at the next solve if the state of the new structure differs."""
+        assert isinstance(value, PyTruss), "structure must be an instance of PyTruss"
+        self._structure = value
+
+    @property
+    def is_factorized(self) -> bool:
+        """True if the cached factorization corresponds to the current state of the structure"""
+        return self._factorization is not None and self._state_key == compute_state_key(self._structure)
+
+    def solve(self, loads_increment: np.ndarray) -> tuple:
+        """Solve the linear displacement method for one or several load cases, by back-substitution.
+
+        Args:
+            loads_increment: [N] - shape (3*nodes.count,) or (nodes.count, 3) for one load case, 
+                             or shape (k, 3*nodes.count) for k load cases (one per row)
+
+        Returns:
+            tuple containing, for one load case (or k load cases):
+            - displacements_increment: [m] - shape (3*nodes.count,) (or (k, 3*nodes.count))
+            - reactions_increment: [N] - shape (fixations.count,) (or (k, fixations.count))
+            - resisting_forces_increment: [N] - shape (3*nodes.count,) (or (k, 3*nodes.count))
+            - tension_increment: [N] - shape (elements.count,) (or (k, elements.count))
+        """
+        loads, is_batch = self._check_loads(loads_increment)
+        self._factorize_if_needed()
+
+        # displacements (3n, k) and reactions (c, k) for all load cases
+        displacements, reactions = self._factorization.solve(loads.T)
+
+        current = self._factorized_state
+        tension, resisting_forces = _post_process(displacements,
+                                                  self._local_material_stiffness_matrices,
+                                                  self._local_geometric_stiffness_matrices,
+                                                  current.elements.end_nodes,
+                                                  current.elements.direction_cosines,
+                                                  self._dof_indices)
+
+        results = (displacements.T, reactions.T, resisting_forces.T, tension.T)
+        if not is_batch:
+            results = tuple(result[0] for result in results)
+        return results
+
+    def run(self, loads_increment: np.ndarray, free_length_variation: np.ndarray = None) -> PyTruss:
+        """Equivalent of main_linear_displacement_method, reusing the cached factorization.
+
+        The free length variations are converted into equivalent loads (see PrestressScenario). As in main_linear_displacement_method, 
+        these loads are solved with the stiffness matrix of the structure with the modified free lengths: when free_length_variation is 
+        not zero, this stiffness matrix is factorized in a secondary session, reused as long as the same variation is applied.
+
+        Args:
+            loads_increment: [N] - shape (3*nodes.count,) - External load increments to apply
+            free_length_variation: [m] - shape (elements.count,) - Free length variations to apply
+
+        Returns:
+            Updated PyTruss with incremented state
+        """
+        structure = self._structure
+        loads_increment = structure.nodes._check_and_reshape_array(loads_increment, "loads_increment")
+        free_length_variation = structure.elements._check_and_reshape_array(free_length_variation, "free_length_variation")
+
+        prestress_increment = PrestressScenario(structure.elements, free_length_variation)
+        total_loads_increment = (loads_increment + prestress_increment.equivalent_loads).reshape((-1,))
+
+        if np.any(free_length_variation):
+            # the free length variations modify the stiffness matrix (see main_linear_displacement_method)
+            initial = structure.copy_and_add(free_length_variation=free_length_variation)
+            if self._modified_session is None:
+                self._modified_session = LinearDMSession(initial, self.sparse, self.solver, self.singular, self._rng)
+            else:
+                self._modified_session.structure = initial
+            factorizations_count = self._modified_session.factorizations_count
+            displacements, reactions, resisting_forces, tension = self._modified_session.solve(total_loads_increment)
+            self.factorizations_count += self._modified_session.factorizations_count - factorizations_count
+        else:
+            displacements, reactions, resisting_forces, tension = self.solve(total_loads_increment)
+        tension += prestress_increment.equivalent_tension
+
+        return structure.copy_and_add(
+            loads_increment=loads_increment,
+            displacements_increment=displacements,
+            reactions_increment=reactions,
+            free_length_variation=free_length_variation,
+            tension_increment=tension,
+            resisting_forces_increment=resisting_forces
+        )
+
+    def prestress_influence_matrix(self, actuated_elements: np.ndarray = None):
+        """Influence of a unit free length variation of each actuated element, cached on the state of the structure.
+
+        The k unit prestress scenarios (see PrestressScenario.compute_unit_influence) are solved against the cached factorization. 
+        The influence matrix is computed again only if the state of the structure changed. When the influence of all the elements 
+        is cached, the influence of any subset of them is extracted from it without solving.
+
+        Args:
+            actuated_elements: [-] - shape (k,) - Indices of the actuated elements (all the elements if None)
+
+        Returns:
+            PrestressInfluenceMatrix: influence of the k actuated elements
+        """
+        from musclepy.solvers.dm.prestress_influence import PrestressInfluenceMatrix
+        elements = self._structure.elements
+        if actuated_elements is None:
+            actuated_elements = np.arange(elements.count)
+        actuated_elements = np.asarray(actuated_elements, dtype=int).reshape((-1,))
+        if np.any((actuated_elements < 0) | (actuated_elements >= elements.count)):
+            raise ValueError(f"actuated_elements must be indices between 0 and {elements.count - 1}")
+
+        self._factorize_if_needed()
+
+        key = actuated_elements.tobytes()
+        influence = self._influence_matrices.get(key)
+        if influence is None:
+            all_elements = np.arange(elements.count).tobytes()
+            if all_elements in self._influence_matrices:
+                influence = self._influence_matrices[all_elements].select(actuated_elements)
+            else:
+                eq_tension, eq_loads = PrestressScenario.compute_unit_influence(elements, actuated_elements)
+                displacements, reactions, _, tension = self.solve(eq_loads.reshape((actuated_elements.size, -1)))
+                tension += eq_tension
+                influence = PrestressInfluenceMatrix(actuated_elements, tension.T, displacements.T, reactions.T)
+            self._influence_matrices[key] = influence
+        return influence
+
+    def _check_loads(self, loads_increment) -> tuple:
+        """Reshape the loads into a (k, 3*nodes.count) array. Returns the loads and whether several load cases were given."""
+        nodes = self._structure.nodes
+        loads = np.asarray(loads_increment, dtype=float)
+        if loads.ndim == 2 and loads.shape[1] == 3 * nodes.count and loads.shape != (nodes.count, 3):
+            return loads, True
+        return nodes._check_and_reshape_array(loads, "loads_increment").reshape((1, -1)), False
+
+    def _factorize_if_needed(self):
+        """Assemble and factorize the stiffness matrix if the state of the structure changed since the last factorization."""
+        key = compute_state_key(self._structure)
+        if self._factorization is not None and key == self._state_key:
+            return
+
+        current = self._structure
+        try:
+            factorization, km, kg = self._factorize(current)
+        except np.linalg.LinAlgError:
+            if self.singular != "perturb":
+                raise
+            # In case of singular matrix, perturb the structure with tiny displacements (see main_linear_displacement_method)
+            current = perturb(current, seed=self._rng)
+            factorization, km, kg = self._factorize(current)
+
+        self._state_key = key
+        self._factorization = factorization
+        self._factorized_state = current
+        self._influence_matrices = {}  # computed on the previous state
+        self._local_material_stiffness_matrices = km
+        self._local_geometric_stiffness_matrices = kg
+        self._dof_indices = compute_elements_dof_indices(current.elements.end_nodes)
+
+    def _factorize(self, current: PyTruss) -> tuple:
+        """Assemble and factorize the tangent stiffness matrix of the current structure."""
+        K, km, kg = assemble_tangent_stiffness_matrix(current, self.sparse)
+        factorization = StiffnessFactorization(K, current.nodes.dof, self.solver, _factorization_singular_mode(self.singular))
+        self.factorizations_count += 1
+        return factorization, km, kg
+
+
+def compute_state_key(structure: PyTruss) -> str:
+    """Compute a hash of the structure state on which the tangent stiffness matrix depends.
+
+    Args:
+        structure: PyTruss instance
+
+    Returns:
+        str: hexadecimal digest of coordinates, free lengths, tensions, areas, Young's moduli, DOF and end nodes.
+    """
+    nodes, elements = structure.nodes, structure.elements
+    h = hashlib.blake2b(digest_size=16)
+    for arr in (nodes.coordinates, elements.free_length, elements.tension, elements.area, elements.youngs,
+                nodes.dof, elements.end_nodes):
+        arr = np.ascontiguousarray(arr)
+        h.update(str((arr.dtype.str, arr.shape)).encode())
+        h.update(arr)
+    return h.hexdigest()
@@ -22,25 +22,132 @@
 
 
 from musclepy.femodel.pytruss import PyTruss
-from musclepy.solvers.dm.linear_dm import core_linear_displacement_method, perturb
+from musclepy.femodel.pyelements import PyElements
+from musclepy.solvers.dm.linear_dm import core_linear_displacement_method, assemble_tangent_stiffness_matrix, StiffnessFactorization, perturb, _factorization_singular_mode
+from musclepy.solvers.dm.py_config_dm import PyConfigDM
+from musclepy.utils.matrix_calculations import compute_nodal_resisting_forces
 import numpy as np
+import time
 
 
-def main_nonlinear_displacement_method(structure: PyTruss, loads_increment: np.ndarray, n_steps: int) -> PyTruss:
-    """Execute the incremental (but not iterative) Newton-Raphson procedure with arc length control.
+class NonlinearDMStep:
+    """Record of a load step of the nonlinear displacement method, yielded by iterate_nonlinear_displacement_method.
+
+    The record only refers to the arrays of the state at the end of the step (no PyTruss is kept), 
+    such that the equilibrium path can be streamed without keeping the intermediate states in memory.
+
+    Attributes:
+        step: [-] - Index of the load step (0 for the first step)
+        load_factor: [-] - Advancement factor lambda at the end of the step (lambda=1 is the final stage)
+        load_factor_increment: [-] - Increment of the advancement factor during the step (negative after a limit point)
+        loads: [N] - shape (nodes.count, 3) - External loads
+        displacements: [m] - shape (nodes.count, 3) - Nodal displacements
+        displacements_increment: [m] - shape (nodes.count, 3) - Increment of the nodal displacements during the step
+        reactions: [N] - shape (nodes.count, 3) - Support reactions
+        tension: [N] - shape (elements.count,) - Axial forces
+        iterations: [-] - Number of equilibrium iterations of the step (0 without equilibrium iterations)
+        residual_norm: [N] - Norm of the out-of-balance forces at the free DOFs at the end of the step (None without equilibrium iterations)
+        converged: True if the equilibrium was reached within config.max_iterations (always True without equilibrium iterations)
+        elapsed_time: [s] - Duration of the step, including the rejected attempts ("adaptive" step control)
+    """
+
+    def __init__(self, step: int, load_factor: float, load_factor_increment: float, state: PyTruss, previous_state: PyTruss,
+                 residual_norms: list, converged: bool, elapsed_time: float):
+        """Record the state at the end of a load step.
+
+        Args:
+            step: Index of the load step
+            load_factor: Advancement factor at the end of the step
+            load_factor_increment: Increment of the advancement factor during the step
+            state: State at the end of the step
+            previous_state: State at the beginning of the step
+            residual_norms: [N] - Norms of the out-of-balance forces during the equilibrium iterations (None without equilibrium iterations)
+            converged: True if the equilibrium iterations converged
+            elapsed_time: [s] - Duration of the step
+        """
+        self.step = step
+        self.load_factor = load_factor
+        self.load_factor_increment = load_factor_increment
+        self.loads = state.nodes.loads
+        self.displacements = state.nodes.displacements
+        self.displacements_increment = state.nodes.displacements - previous_state.nodes.displacements
+        self.reactions = state.nodes.reactions
+        self.tension = state.elements.tension
+        self.iterations = 0 if residual_norms is None else len(residual_norms) - 1
+        self.residual_norm = None if residual_norms is None else residual_norms[-1]
+        self.converged = converged
+        self.elapsed_time = elapsed_time
+
+
+def main_nonlinear_displacement_method(structure: PyTruss, loads_increment: np.ndarray, n_steps: int, sparse: bool = False, solver: str = "lagrange",
+                                       config: PyConfigDM = None) -> PyTruss:
+    """Execute the incremental Newton-Raphson procedure with arc length control, optionally with equilibrium iterations at each step,
+    and with an incremental length adapted to the nonlinearity of the response (see PyConfigDM.step_control).
     
     Args:
         structure: Initial state of the linear structure
         loads_increment: Total load increment to apply
-        n_steps: Number of steps to use in the nonlinear solver
+        n_steps: Number of steps to use in the nonlinear solver (the initial number of steps with the "adaptive" step control)
+        sparse: If True, assemble and solve the tangent stiffness matrix in scipy.sparse format at each step (for large models).
+        solver: "lagrange" (default) or "partition", how the support conditions are enforced (see StiffnessFactorization).
+        config: Configuration of the equilibrium iterations (see PyConfigDM). By default, the procedure is incremental but not iterative.
         
     Returns:
         PyTruss in deformed state
+
+    Note:
+        The config object is updated in-place with the number of load steps, the iterations and residual norms of each step,
+        and the path of the procedure (load factor, incremental length and displacements at the end of each step).
+    """
+    current_state = structure.copy()
+    for current_state, _ in _nonlinear_steps(structure, loads_increment, n_steps, sparse, solver, config, records=False):
+        pass
+    return current_state
+
+
+def iterate_nonlinear_displacement_method(structure: PyTruss, loads_increment: np.ndarray, n_steps: int, sparse: bool = False, solver: str = "lagrange",
+                                          config: PyConfigDM = None):
+    """Execute the nonlinear displacement method step by step, yielding a record of each load step as the solve proceeds.
+
+    The equilibrium path can be streamed (e.g. to a file or a user interface), and the procedure can be stopped early 
+    by breaking the loop, for instance at the first cable slackening:
+
+        for record in iterate_nonlinear_displacement_method(structure, loads, n_steps=10, config=PyConfigDM(record_path=False)):
+            if np.any(record.tension[cables] <= 0):
+                break
+
+    Args:
+        Same as main_nonlinear_displacement_method. 
+        With PyConfigDM(record_path=False), the config does not keep the displacements of each step either.
+
+    Yields:
+        NonlinearDMStep: record of each accepted load step
+
+    Returns:
+        PyTruss in deformed state, at the end of the procedure (the value of the StopIteration, or of "yield from")
+    """
+    current_state = structure.copy()
+    for current_state, record in _nonlinear_steps(structure, loads_increment, n_steps, sparse, solver, config, records=True):
+        yield record
+    return current_state
+
+
+def _nonlinear_steps(structure: PyTruss, loads_increment: np.ndarray, n_steps: int, sparse: bool, solver: str, config: PyConfigDM, records: bool):
+    """Generator of the load steps of the nonlinear displacement method (see main_nonlinear_displacement_method).
+
+    Yields:
+        tuple containing:
+        - PyTruss: state at the end of each accepted load step
+        - NonlinearDMStep: record of the step (None if records is False)
     """
     # Note: the nonlinear DM does not support prestress.
     # This is due to the reorientation of the elements during a non linear procedure.
     # which means that the free_length_variation cannot be converted into an equivalent external loads, because the equivalent loads reorient at each step.
     # -> use Dynamic Relaxation for non-linear prestressing problems.
+    if config is None:
+        config = PyConfigDM() #use default solver configuration
+    else:
+        assert isinstance(config, PyConfigDM), "config must be a PyConfigDM instance"
 
     # total loads increment to apply on the structure
     loads_increment = structure.nodes._check_and_reshape_array(loads_increment, "loads_increment")
@@ -50,69 +157,262 @@ def main_nonlinear_displacement_method(structure: PyTruss, loads_increment: np.n
     l0 = 1 / n_steps  # incremental length
     max_steps = n_steps * 5  # max number of steps allowed
     perturbation = 1e-3  # [m] perturbation of the nodes coordinates if singular matrix
+    adaptive = config.step_control == "adaptive"
+    if adaptive:
+        max_steps = int(np.ceil(max_steps / config.min_step_ratio))  # the incremental length may shrink down to min_step_ratio * l0
 
     # Initialize solution tracking variables
     step = 0  # current step number
     _lambda = 0.0  # advancement factor: 0 <= lambda <= 1 (lambda=1 is final stage)
+    length = l0  # incremental length of the current step
+    v_previous = None  # displacements due to the total load increment, given the stiffness of the previous step
+    iterations_previous = None  # equilibrium iterations of the previous step
 
-    # Initialize incremental variables to be added on the structure at each step
-    loads_incr = np.zeros((3 * structure.nodes.count,)) # a fraction of the total load increment
-    displacements_incr = np.zeros((3 * structure.nodes.count,))
-    resisting_forces_incr = np.zeros((3 * structure.nodes.count,))
-    tensions_incr = np.zeros((structure.elements.count,))
-    reactions_incr = np.zeros((np.sum(~structure.nodes.dof.flatten()),))
-    
-    previous_state = structure.copy()
+    singular = _factorization_singular_mode(config.singular)
+    rng = None if config.seed is None else np.random.default_rng(config.seed)
+
+    current_state = structure.copy()
+    stiffness = _TangentStiffness(config, sparse, solver, rng) if config.newton is not None else None
     
     # Iteratively solve until convergence or max steps reached
+    start_time = time.perf_counter()
     while (_lambda < 1 and step < max_steps):
-        # update current state on which a new load_increment will be applied
-        current_state = previous_state.copy_and_add(
-            loads_increment=loads_incr,
-            displacements_increment=displacements_incr,
-            reactions_increment=reactions_incr,
-            tension_increment=tensions_incr,
-            resisting_forces_increment=resisting_forces_incr
-            ) # note that at step 0 , the increments are 0, so the current_state is the initial_state
-        
-        # the current_state contains the results from the previous calculation
+        if stiffness is None:
+            try:
+                # Apply the total load increment on the current state of the structure, given the current structure's stiffness
+                v, r, f, t = core_linear_displacement_method(current_state, total_loads_incr, sparse, solver, singular) 
+                # v, r, f, t are the total increments of displacements, reactions, resisting forces and axial forces, due to the application of the total load increment.
+                # see Jonas Feron's master thesis (2016) for explanations.  
+                
+            except np.linalg.LinAlgError:
+                if config.singular != "perturb":
+                    raise
+                # In case of singular matrix, perturb the structure with tiny displacements
+                current_state = perturb(current_state, magnitude=perturbation, seed=rng)
+                v, r, f, t = core_linear_displacement_method(current_state, total_loads_incr, sparse, solver)
+            config.n_factorization += 1
+        else:
+            # Predict the displacements with the (possibly reused) factorization of the tangent stiffness matrix. 
+            # The tensions, resisting forces and reactions are then computed by the equilibrium iterations.
+            if config.newton == "full" or config.refactorization == "step":
+                stiffness.invalidate()
+            try:
+                factorization = stiffness.factorization(current_state, perturbed_fallback=False)
+            except np.linalg.LinAlgError:
+                if config.singular != "perturb":
+                    raise
+                # In case of singular matrix, perturb the structure with tiny displacements
+                current_state = perturb(current_state, magnitude=perturbation, seed=rng)
+                factorization = stiffness.factorization(current_state)
+            v, _ = factorization.solve(total_loads_incr)
+            r, f, t = np.zeros_like(v), np.zeros_like(v), np.zeros(current_state.elements.count)
 
-        try:
-            # Apply the total load increment on the current state of the structure, given the current structure's stiffness
-            v, r, f, t = core_linear_displacement_method(current_state, total_loads_incr) 
-            # v, r, f, t are the total increments of displacements, reactions, resisting forces and axial forces, due to the application of the total load increment.
-            # see Jonas Feron's master thesis (2016) for explanations.  
-            
-        except np.linalg.LinAlgError:
-            # In case of singular matrix, perturb the structure with tiny displacements
-            perturbed = perturb(current_state, magnitude=perturbation)
-            current_state = perturbed.copy()
-            v, r, f, t = core_linear_displacement_method(current_state, total_loads_incr)
+        # Adapt the incremental length to the nonlinearity of the response during the previous step
+        if adaptive and step > 0:
+            length = _adapt_step_length(length, l0, config, v, v_previous, iterations_previous)
             
         # Calculate advancement using arc length control
-        d_lambda = _arc_length_control(l0, _lambda, v, total_loads_incr)
+        d_lambda = _arc_length_control(length, _lambda, v, total_loads_incr)
         
-        # Update solution increments
+        # Apply a fraction of the total load increment, and the corresponding increments of the solution
         step += 1
-        _lambda += d_lambda
-        loads_incr = total_loads_incr * d_lambda # the current loads increment is a fraction of the total load increment
-        displacements_incr = v * d_lambda
-        tensions_incr = t * d_lambda
-        reactions_incr = r * d_lambda
-        resisting_forces_incr = f * d_lambda
-
-        # Update previous state 
-        previous_state = current_state.copy()
-
-    # when _lambda reaches exactly 1, the while loop stops, so apply the last load increment
-    final_state = previous_state.copy_and_add(
-            loads_increment=loads_incr,
-            displacements_increment=displacements_incr,
-            reactions_increment=reactions_incr,
-            tension_increment=tensions_incr,
-            resisting_forces_increment=resisting_forces_incr
+        previous_state = current_state
+        current_state = current_state.copy_and_add(
+            loads_increment=total_loads_incr * d_lambda,
+            displacements_increment=v * d_lambda,
+            reactions_increment=r * d_lambda,
+            tension_increment=t * d_lambda,
+            resisting_forces_increment=f * d_lambda
             )
-    return final_state
+
+        # Correct the out-of-balance forces of the new state
+        residual_norms, converged = None, True
+        if stiffness is not None:
+            current_state, residual_norms, converged = _equilibrium_iterations(current_state, structure, config, stiffness)
+            config.n_iteration += len(residual_norms) - 1
+            if not converged and adaptive and length > config.min_step_ratio * l0:
+                # Reject the step, and retry from the previous state with a shorter incremental length
+                current_state = previous_state
+                length = max(length / 2, config.min_step_ratio * l0)
+                v_previous, iterations_previous = None, None
+                config.n_rejected_step += 1
+                continue
+            config.converged = config.converged and converged
+            config.step_iterations.append(len(residual_norms) - 1)
+            config.step_residual_norms.append(residual_norms)
+            iterations_previous = len(residual_norms) - 1
+
+        _lambda += d_lambda
+        v_previous = v
+        config.n_load_step += 1
+        config.load_factors.append(_lambda)
+        config.step_lengths.append(length)
+        if config.record_path:
+            config.path_displacements.append(current_state.nodes.displacements)
+
+        record = None
+        if records:
+            end_time = time.perf_counter()
+            record = NonlinearDMStep(config.n_load_step - 1, _lambda, d_lambda, current_state, previous_state, residual_norms, converged, end_time - start_time)
+        yield current_state, record
+        start_time = time.perf_counter()  # the time spent by the caller is not included in the next step
+
+
+def _equilibrium_iterations(current: PyTruss, initial: PyTruss, config: PyConfigDM, stiffness: '_TangentStiffness') -> tuple:
+    """Iterate on the displacements until the out-of-balance forces of the current state meet the tolerances of PyTruss.is_in_equilibrium.
+
+    Args:
+        current: State obtained at the end of a load step
+        initial: Initial state of the nonlinear procedure, from which the tensions are updated (see _update_internal_forces)
+        config: Configuration of the equilibrium iterations
+        stiffness: Factorization of the tangent stiffness matrix, refactorized according to config
+
+    Returns:
+        tuple containing:
+        - PyTruss: corrected state
+        - list: [N] - norms of the out-of-balance forces at the free DOFs, before each iteration and at the end
+        - bool: True if the equilibrium was reached within config.max_iterations
+    """
+    free = current.nodes.dof.reshape(-1)
+    current = _update_internal_forces(current, initial)
+    residual_norms = [float(np.linalg.norm(current.nodes.residuals.reshape(-1)[free]))]
+
+    while not current.is_in_equilibrium(config.zero_residual_rtol, config.zero_residual_atol):
+        if len(residual_norms) > config.max_iterations:
+            stiffness.invalidate()
+            return current, residual_norms, False
+        if config.newton == "full":
+            stiffness.invalidate()
+        displacements, _ = stiffness.factorization(current).solve(current.nodes.residuals.reshape(-1))
+        current = _update_internal_forces(current.copy_and_add(displacements_increment=displacements), initial)
+        residual_norms.append(float(np.linalg.norm(current.nodes.residuals.reshape(-1)[free])))
+
+        if residual_norms[-1] > config.stall_ratio * residual_norms[-2] and config.refactorization == "adaptive":
+            stiffness.invalidate()  # the convergence stalls: use the tangent stiffness of the current state in the next iteration
+
+    return current, residual_norms, True
+
+
+def _update_internal_forces(current: PyTruss, initial: PyTruss) -> PyTruss:
+    """Compute the tensions, resisting forces and reactions corresponding to the current displacements.
+
+    The tension of each element is updated from its initial tension with the change of the tension given by its material law
+    since the initial state: t = t_initial + N(L) - N(L_initial), see _material_tension. The Young's modulus in compression 
+    or in tension is used depending on the sign of the elastic elongation, hence a cable becoming slack (L < L_free) 
+    loses its tension. If the initial tensions are consistent with the free lengths (t_initial = N(L_initial)), then t = N(L). 
+    Otherwise (e.g. a prestress given as an initial tension, with free lengths equal to the initial lengths), 
+    the difference is kept as a constant offset.
+    The reactions equilibrate the resisting forces at the fixed DOFs, hence the out-of-balance forces are located at the free DOFs only.
+
+    Args:
+        current: State of the structure, whose displacements are known
+        initial: Initial state of the nonlinear procedure
+
+    Returns:
+        PyTruss: copy of the current state with the updated tensions, resisting forces and reactions
+    """
+    elements = current.elements
+    tension = initial.elements.tension + _material_tension(elements) - _material_tension(initial.elements)
+    resisting_forces = compute_nodal_resisting_forces(elements.end_nodes, elements.direction_cosines, tension, current.nodes.count)
+    reactions = np.where(current.nodes.dof, 0.0, resisting_forces - current.nodes.loads)
+    return current.copy_and_update(reactions=reactions, tension=tension, resisting_forces=resisting_forces)
+
+
+def _material_tension(elements: PyElements) -> np.ndarray:
+    """[N] - shape (elements_count,) - Tension given by the bilinear material law N(L) = E*A/L_free * (L - L_free), 
+    where E is the Young's modulus in compression or in tension depending on the sign of the elastic elongation (see PyElements.young)."""
+    return elements.young * elements.area * elements.elastic_elongation / elements.free_length
+
+
+class _TangentStiffness:
+    """Factorization of the tangent stiffness matrix, kept until it is invalidated or until the stiffness of the elements changed too much.
+
+    The change of stiffness is only checked with the "adaptive" refactorization policy of the modified Newton-Raphson method.
+    """
+
+    def __init__(self, config: PyConfigDM, sparse: bool, solver: str, rng: np.random.Generator = None):
+        self._config = config
+        self._sparse = sparse
+        self._solver = solver
+        self._singular = _factorization_singular_mode(config.singular)
+        self._rng = rng  # random perturbations of the singular matrices (None for the global numpy random state)
+        self._factorization = None
+        self._elements = None  # PyElements at the last factorization
+
+    def invalidate(self):
+        """Refactorize at the next call of factorization."""
+        self._factorization = None
+
+    def factorization(self, current: PyTruss, perturbed_fallback: bool = True) -> StiffnessFactorization:
+        """Get the factorization, refactorized at the current state if needed.
+
+        Args:
+            current: Current state of the structure
+            perturbed_fallback: If True and config.singular is "perturb", a singular tangent stiffness matrix is replaced 
+                    by the one of the perturbed current state. Otherwise, np.linalg.LinAlgError is raised.
+        """
+        if self._factorization is not None and self._config.refactorization == "adaptive" and self._config.newton == "modified":
+            if _stiffness_change(self._elements, current.elements) > self._config.stiffness_change_rtol:
+                self._factorization = None
+
+        if self._factorization is None:
+            try:
+                K, _, _ = assemble_tangent_stiffness_matrix(current, self._sparse)
+                self._factorization = StiffnessFactorization(K, current.nodes.dof, self._solver, self._singular)
+            except np.linalg.LinAlgError:
+                if not perturbed_fallback or self._singular != "raise":
+                    raise
+                # In case of singular matrix, use the stiffness of the structure perturbed with tiny displacements
+                K, _, _ = assemble_tangent_stiffness_matrix(perturb(current, seed=self._rng), self._sparse)
+                self._factorization = StiffnessFactorization(K, current.nodes.dof, self._solver)
+            self._elements = current.elements
+            self._config.n_factorization += 1
+        return self._factorization
+
+
+def _stiffness_change(factorized: PyElements, current: PyElements) -> float:
+    """[-] - Largest change of the stiffness of an element since the factorization, relative to the largest axial stiffness.
+
+    The change of the element stiffness in global coordinates is estimated from the change of its axial stiffness EA/L_free, 
+    of its geometric stiffness t/L, and from its rotation (the change of its direction cosines, scaled by its axial stiffness).
+    """
+    axial = 1 / factorized.flexibility
+    change = (np.abs(1 / current.flexibility - axial)
+              + np.abs(current.tension / current.current_length - factorized.tension / factorized.current_length)
+              + axial * np.linalg.norm(current.direction_cosines - factorized.direction_cosines, axis=1))
+    return np.max(change, initial=0.0) / np.max(axial, initial=np.finfo(float).tiny)
+
+
+def _adapt_step_length(length: float, l0: float, config: PyConfigDM, v: np.ndarray, v_previous: np.ndarray, iterations_previous: int) -> float:
+    """Calculate the incremental length of the next step, from the nonlinearity of the response during the previous step.
+
+    With equilibrium iterations, the incremental length is scaled by sqrt(desired_iterations / iterations) of the previous step.
+    Without, it is scaled by sqrt(desired_tangent_change / change), where change is the relative change of the displacements v 
+    due to the total load increment, between the previous and the current tangent stiffness. 
+    The scaling is bounded between 0.5 and 2, and the incremental length between min_step_ratio * l0 and max_step_ratio * l0.
+
+    Args:
+        length (float): Incremental length of the previous step
+        l0 (float): Initial incremental length (1/n_steps)
+        config (PyConfigDM): Configuration of the step control
+        v (np.ndarray): Displacement vector obtained by linear analysis when applying the total load, given the current stiffness
+        v_previous (np.ndarray): Same as v, given the stiffness of the previous step (None after a rejected step)
+        iterations_previous (int): Number of equilibrium iterations of the previous step (None without equilibrium iterations, or after a rejected step)
+
+    Returns:
+        float: Incremental length of the next step
+    """
+    if config.newton is not None:
+        if iterations_previous is None:
+            return length  # keep the length of the retried step
+        factor = np.sqrt(config.desired_iterations / max(iterations_previous, 1))
+    else:
+        if v_previous is None:
+            return length
+        change = np.linalg.norm(v - v_previous) / max(np.linalg.norm(v_previous), np.finfo(float).tiny)
+        factor = np.sqrt(config.desired_tangent_change / max(change, np.finfo(float).tiny))
+    factor = min(max(factor, 0.5), 2.0)
+    return min(max(length * factor, config.min_step_ratio * l0), config.max_step_ratio * l0, 1.0)
 
 
 def _arc_length_control(l0: float, _lambda: float, v: np.ndarray, p: np.ndarray) -> float:
@@ -0,0 +1,120 @@
+# Muscle
+
+# Copyright <2015-2025> <Université catholique de Louvain (UCLouvain)>
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# List of the contributors to the development of Muscle: see NOTICE file.
+# Description and complete License: see NOTICE file.
+
+"""
+Prestress influence matrix: effect of a unit free length variation of each actuated element on the whole structure.
+
+When choosing the placement of the actuators, the same question is asked for many candidate elements: 
+"which tensions and displacements does a unit free length variation of element j produce?". 
+The influence matrix answers it for k actuated elements at once, from one factorization of the stiffness matrix 
+(see LinearDMSession), and the effect of any linear combination of actuations is then a matrix product.
+"""
+
+import numpy as np
+from musclepy.femodel.pytruss import PyTruss
+from musclepy.solvers.dm.linear_dm_session import LinearDMSession
+
+
+class PrestressInfluenceMatrix:
+    """Tensions, displacements and reactions due to a unit free length variation [m] of each actuated element.
+
+    The influence matrix is the linearization of the linear displacement method at the current state of the structure: 
+    the effect of small free length variations are superposed, with the current stiffness of the elements.
+
+    Attributes:
+        actuated_elements: [-] - shape (k,) - Indices of the actuated elements (one column per actuated element)
+        count: Number of actuated elements k
+        tension: [N/m] - shape (elements.count, k) - Tension increment in each element
+        displacements: [m/m] - shape (3*nodes.count, k) - Displacement increments of the nodes
+        reactions: [N/m] - shape (fixations.count, k) - Reaction increments at the fixed DOFs
+    """
+
+    def __init__(self, actuated_elements: np.ndarray, tension: np.ndarray, displacements: np.ndarray, reactions: np.ndarray):
+        """Store the influence matrices.
+
+        Args:
+            actuated_elements: [-] - shape (k,)
+            tension: [N/m] - shape (elements.count, k)
+            displacements: [m/m] - shape (3*nodes.count, k)
+            reactions: [N/m] - shape (fixations.count, k)
+        """
+        self.actuated_elements = np.asarray(actuated_elements, dtype=int).reshape((-1,))
+        self.count = self.actuated_elements.size
+        self.tension = tension
+        self.displacements = displacements
+        self.reactions = reactions
+
+    def query(self, actuations: np.ndarray) -> tuple:
+        """Compute the effect of a linear combination of actuations.
+
+        Args:
+            actuations: [m] - shape (k,) for one combination, or (m, k) for m combinations (one per row) - 
+                        free length variation of each actuated element
+
+        Returns:
+            tuple containing, for one combination (or m combinations):
+                - tension_increment: [N] - shape (elements.count,) (or (m, elements.count))
+                - displacements_increment: [m] - shape (nodes.count, 3) (or (m, nodes.count, 3))
+        """
+        actuations = np.asarray(actuations, dtype=float)
+        if actuations.shape[-1] != self.count or actuations.ndim > 2:
+            raise ValueError(f"actuations must have shape ({self.count},) or (m, {self.count}), got shape {actuations.shape}")
+        tension = actuations @ self.tension.T
+        displacements = actuations @ self.displacements.T
+        return tension, displacements.reshape(actuations.shape[:-1] + (-1, 3))
+
+    def select(self, actuated_elements: np.ndarray) -> 'PrestressInfluenceMatrix':
+        """Extract the influence matrix of a subset of the actuated elements.
+
+        Args:
+            actuated_elements: [-] - shape (k',) - Indices of elements, all in self.actuated_elements
+
+        Returns:
+            PrestressInfluenceMatrix with the k' corresponding columns
+        """
+        actuated_elements = np.asarray(actuated_elements, dtype=int).reshape((-1,))
+        column_of = {element: column for column, element in enumerate(self.actuated_elements.tolist())}
+        if any(element not in column_of for element in actuated_elements.tolist()):
+            raise ValueError("all the selected elements must be actuated in the influence matrix")
+        columns = np.array([column_of[element] for element in actuated_elements.tolist()], dtype=int)
+        return PrestressInfluenceMatrix(actuated_elements, self.tension[:, columns], self.displacements[:, columns], self.reactions[:, columns])
+
+
+def compute_prestress_influence_matrix(structure: PyTruss, actuated_elements: np.ndarray = None, sparse: bool = False, 
+                                       solver: str = "lagrange", session: LinearDMSession = None) -> PrestressInfluenceMatrix:
+    """Compute the prestress influence matrix of the structure, with one factorization of the stiffness matrix.
+
+    Args:
+        structure: Current structure state
+        actuated_elements: [-] - shape (k,) - Indices of the actuated elements (all the elements if None)
+        sparse: If True, assemble and factorize the stiffness matrix in scipy.sparse format (for large models)
+        solver: "lagrange" (default) or "partition", how the support conditions are enforced
+        session: Optional LinearDMSession to reuse its factorization, and its cached influence matrices, across calls. 
+                 It is bound to the structure.
+
+    Returns:
+        PrestressInfluenceMatrix: influence of the k actuated elements
+    """
+    assert isinstance(structure, PyTruss), "structure must be an instance of PyTruss"
+    if session is None:
+        session = LinearDMSession(structure, sparse, solver)
+    else:
+        assert isinstance(session, LinearDMSession), "session must be an instance of LinearDMSession"
+        session.structure = structure
+    return session.prestress_influence_matrix(actuated_elements)
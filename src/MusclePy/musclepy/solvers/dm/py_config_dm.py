@@ -0,0 +1,123 @@
+# Muscle
+
+# Copyright <2015-2025> <Université catholique de Louvain (UCLouvain)>
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# List of the contributors to the development of Muscle: see NOTICE file.
+# Description and complete License: see NOTICE file.
+
+class PyConfigDM:
+    """
+    Configuration parameters for the nonlinear Displacement Method.
+    
+    This class contains the parameters controlling the equilibrium iterations of the incremental Newton-Raphson procedure,
+    and the counters reporting the solver performances (updated in-place by main_nonlinear_displacement_method).
+    """
+
+    newton_methods = (None, "full", "modified")
+    refactorization_policies = ("step", "adaptive")
+    step_controls = ("fixed", "adaptive")
+    singular_modes = ("perturb", "regularize")
+
+    def __init__(self, newton=None, max_iterations=20, zero_residual_rtol=1e-4, zero_residual_atol=1e-6,
+                 refactorization="step", stall_ratio=0.3, stiffness_change_rtol=0.1,
+                 step_control="fixed", desired_iterations=None, desired_tangent_change=0.02, min_step_ratio=0.1, max_step_ratio=10.0,
+                 record_path=True, singular="perturb", seed=None):
+        """
+        Initialize the nonlinear Displacement Method configuration.
+        
+        Args:
+            newton: How the equilibrium is corrected at the end of each load step:
+                    - None (default): no correction, the procedure is purely incremental
+                    - "full": Newton-Raphson iterations, with the tangent stiffness matrix assembled and factorized at each iteration
+                    - "modified": modified Newton-Raphson iterations, with a factorization of the tangent stiffness matrix 
+                      reused according to the refactorization policy
+            max_iterations: Maximum number of equilibrium iterations per load step
+            zero_residual_rtol: Relative tolerance for zero residual check, compared to external loads magnitude (see PyTruss.is_in_equilibrium)
+            zero_residual_atol: Absolute tolerance (in N) for zero residual check, when loads are near zero
+            refactorization: When the modified Newton-Raphson method factorizes the tangent stiffness matrix:
+                    - "step" (default): once per load step, at the beginning of the step
+                    - "adaptive": the factorization is kept across the load steps, and is only recomputed when
+                      the residual reduction of an iteration stalls, when the stiffness of the elements changed too much 
+                      since the last factorization, or when a load step did not converge
+            stall_ratio: The residual reduction stalls when the norm of the residuals after an iteration is larger than 
+                    stall_ratio times the norm before the iteration ("adaptive" policy)
+            stiffness_change_rtol: Maximum change of the stiffness of the elements (axial, geometric and rotation) since the last factorization,
+                    relative to the largest axial stiffness ("adaptive" policy)
+            step_control: How the incremental length of the arc length control is chosen:
+                    - "fixed" (default): the incremental length is 1/n_steps at each load step
+                    - "adaptive": the incremental length grows when the response is close to linear, and shrinks when the 
+                      tangent stiffness changes quickly (e.g. near limit points or snap-through). With equilibrium iterations, 
+                      a load step that did not converge is rejected and retried with a shorter incremental length.
+            desired_iterations: Number of equilibrium iterations per load step targeted by the "adaptive" step control. 
+                    By default, 4 with the full Newton-Raphson method and 10 with the modified one (which converges linearly).
+            desired_tangent_change: Relative change of the tangent displacements (under the total load increment) between two load steps, 
+                    targeted by the "adaptive" step control without equilibrium iterations
+            min_step_ratio: Lower bound of the incremental length, relative to 1/n_steps ("adaptive" step control)
+            max_step_ratio: Upper bound of the incremental length, relative to 1/n_steps ("adaptive" step control)
+            record_path: If True (default), the displacements at the end of each load step are kept in path_displacements. 
+                    Set to False to stream the path with iterate_nonlinear_displacement_method without keeping it in memory.
+            singular: How a singular tangent stiffness matrix (mechanism) is handled:
+                    - "perturb" (default): the structure is perturbed with random displacements of 1e-3 m, and the system is solved again
+                    - "regularize": a small stiffness is added along the mechanisms (see StiffnessFactorization), 
+                      which is deterministic and avoids the second assembly and factorization.
+                    Note: the "pseudo_inverse" mode of the linear solvers is not available, since a loaded mechanism 
+                    would never leave its singular configuration (no displacement along the mechanisms).
+            seed: None (default), int or np.random.Generator - seed of the random perturbations (see perturb)
+        """
+        if newton not in self.newton_methods:
+            raise ValueError(f"newton must be one of {self.newton_methods}, got {newton}")
+        self.newton = newton
+        if refactorization not in self.refactorization_policies:
+            raise ValueError(f"refactorization must be one of {self.refactorization_policies}, got {refactorization}")
+        self.refactorization = refactorization
+        self.stall_ratio = stall_ratio if 0 < stall_ratio < 1 else 0.3
+        self.stiffness_change_rtol = stiffness_change_rtol if stiffness_change_rtol > 0 else 0.1
+
+        # Adaptive step control
+        if step_control not in self.step_controls:
+            raise ValueError(f"step_control must be one of {self.step_controls}, got {step_control}")
+        self.step_control = step_control
+        if desired_iterations is None or desired_iterations <= 0:
+            desired_iterations = 10 if newton == "modified" else 4
+        self.desired_iterations = desired_iterations
+        self.desired_tangent_change = desired_tangent_change if desired_tangent_change > 0 else 0.02
+        self.min_step_ratio = min_step_ratio if 0 < min_step_ratio <= 1 else 0.1
+        self.max_step_ratio = max_step_ratio if max_step_ratio >= 1 else 10.0
+        self.record_path = bool(record_path)
+
+        # Singular tangent stiffness matrices
+        if singular not in self.singular_modes:
+            raise ValueError(f"singular must be one of {self.singular_modes}, got {singular}")
+        self.singular = singular
+        self.seed = seed
+
+        # Termination criteria of the equilibrium iterations
+        self.max_iterations = max_iterations if max_iterations > 0 else 20  # Maximum number of iterations per load step
+        self.zero_residual_rtol = zero_residual_rtol if zero_residual_rtol > 0 else 1e-4  # Relative tolerance for zero checks
+        self.zero_residual_atol = zero_residual_atol if zero_residual_atol > 0 else 1e-6  # Absolute tolerance (in N) for zero checks
+
+        # Initialize counters, to be returned to the user for information regarding the solver performances.
+        self.n_load_step = 0  # Number of load steps performed
+        self.n_iteration = 0  # Total number of equilibrium iterations performed
+        self.n_factorization = 0  # Number of factorizations of the tangent stiffness matrix
+        self.step_iterations = []  # Number of equilibrium iterations of each load step
+        self.step_residual_norms = []  # [N] - Norm of the out-of-balance forces at the free DOFs, before each iteration and at the end of each load step
+        self.converged = True  # False if the equilibrium was not reached within max_iterations in any load step
+        self.n_rejected_step = 0  # Number of load steps rejected and retried with a shorter incremental length ("adaptive" step control)
+
+        # Path of the procedure, to trace the load-displacement curves
+        self.load_factors = []  # [-] - Advancement factor lambda at the end of each load step (lambda=1 is the final stage)
+        self.step_lengths = []  # [-] - Incremental length of the arc length control of each load step
+        self.path_displacements = []  # [m] - shape (nodes.count, 3) - Displacements at the end of each load step (if record_path)
@@ -32,9 +32,10 @@ References:
 """
 
 from .main import main_dynamic_relaxation
+from .dr_engine import DynamicRelaxationEngine, main_dynamic_relaxation_inplace
 from .py_config_dr import PyConfigDR
 from .py_truss_dr import PyTrussDR
 from .py_nodes_dr import PyNodesDR
 from .py_elements_dr import PyElementsDR
 
-__all__ = ['main_dynamic_relaxation', 'PyElementsDR', 'PyTrussDR', 'PyNodesDR', 'PyConfigDR']
+__all__ = ['main_dynamic_relaxation', 'main_dynamic_relaxation_inplace', 'DynamicRelaxationEngine', 'PyElementsDR', 'PyTrussDR', 'PyNodesDR', 'PyConfigDR']
@@ -0,0 +1,322 @@
+# Muscle
+
+# Copyright <2015-2025> <Université catholique de Louvain (UCLouvain)>
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# List of the contributors to the development of Muscle: see NOTICE file.
+# Description and complete License: see NOTICE file.
+
+"""
+In-place Dynamic Relaxation: the time loop updates preallocated state buffers instead of copying the structure.
+
+main_dynamic_relaxation creates two new PyTrussDR (with their PyNodesDR and PyElementsDR) at each time step. 
+DynamicRelaxationEngine keeps the state of the structure (displacements, velocities, residuals, masses, tensions, ...) 
+in arrays allocated once, and updates them in place at each time step. The element contributions are accumulated 
+on the end nodes without assembling any matrix (see the matrix-free mode of PyConfigDR).
+A PyTrussDR is only materialized at the end of the analysis, or on request at snapshot points.
+
+References:
+[1] Bel Hadj Ali N., Rhode-Barbarigos L., Smith I.F.C., "Analysis of clustered tensegrity structures using a modified dynamic relaxation algorithm", International Journal of Solids and Structures, Volume 48, Issue 5, 2011, Pages 637-647, https://doi.org/10.1016/j.ijsolstr.2010.10.029.
+"""
+
+import numpy as np
+from musclepy.femodel.pytruss import PyTruss
+from musclepy.femodel.pyelements import _compute_flexibility
+from musclepy.solvers.dr.py_truss_dr import PyTrussDR
+from musclepy.solvers.dr.py_nodes_dr import PyNodesDR
+from musclepy.solvers.dr.py_elements_dr import PyElementsDR
+from musclepy.solvers.dr.py_config_dr import PyConfigDR
+from musclepy.utils.matrix_calculations import compute_elements_dof_indices
+
+
+class DynamicRelaxationEngine:
+    """Dynamic Relaxation method with in-place updates of preallocated state buffers.
+
+    Example:
+        engine = DynamicRelaxationEngine(structure, loads_increment, free_length_variation, config)
+        result = engine.run(snapshot_every=100)  # PyTrussDR in equilibrium
+        history = engine.snapshots  # PyTrussDR every 100 time steps
+
+    Attributes:
+        config: Configuration of the Dynamic Relaxation method, updated in place with the number of time steps and kinetic energy resets
+        snapshots: List of the PyTrussDR materialized during run() at the snapshot points
+    """
+
+    def __init__(self, structure: PyTruss, loads_increment: np.ndarray = None,
+                 free_length_variation: np.ndarray = None, config: PyConfigDR = None):
+        """Initialize the engine and allocate the state buffers.
+
+        Args:
+            structure: Initial structure state
+            loads_increment: External load increments to apply
+            free_length_variation: Free length variation to apply
+            config: Configuration for the Dynamic Relaxation method
+        """
+        assert isinstance(structure, PyTruss), "Structure must be a PyTruss instance"
+        loads_increment = structure.nodes._check_and_reshape_array(loads_increment, "loads_increment")
+        free_length_variation = structure.elements._check_and_reshape_array(free_length_variation, "free_length_variation")
+        if config is None:
+            config = PyConfigDR() #use default solver configuration
+        else: 
+            assert isinstance(config, PyConfigDR), "config must be a PyConfigDR instance"
+        self.config = config
+        self.snapshots = []
+
+        # the initial state is copied once. Its immutable attributes are shared with the materialized PyTrussDR.
+        self._initial_state = PyTrussDR(structure).copy_and_add(loads_increment, free_length_variation)
+        nodes = self._initial_state.nodes
+        elements = self._initial_state.elements
+        n = nodes.count
+        b = elements.count
+
+        # Immutable data
+        self._initial_coordinates = nodes.initial_coordinates
+        self._dof = nodes.dof.astype(bool)
+        self._supports = ~self._dof
+        self._free_dof_indices = np.flatnonzero(self._dof)  # indices in the flattened (3n,) buffers
+        self._fixed_dof_indices = np.flatnonzero(self._supports)
+        self._loads = nodes.loads
+        self._end_nodes0 = np.ascontiguousarray(elements.end_nodes[:, 0], dtype=np.intp)  # np.take would copy strided indices
+        self._end_nodes1 = np.ascontiguousarray(elements.end_nodes[:, 1], dtype=np.intp)
+        dof_indices = compute_elements_dof_indices(elements.end_nodes)  # shape (b, 6)
+        self._start_dof_indices = dof_indices[:, :3].reshape(-1)  # contiguous copies, in the flattened (3n,) buffers
+        self._end_dof_indices = dof_indices[:, 3:].reshape(-1)
+        self._area = elements.area
+        self._youngs_compression = elements.youngs[:, 0]
+        self._youngs_tension = elements.youngs[:, 1]
+        self._youngs_max = np.maximum(self._youngs_compression, self._youngs_tension)
+        self._free_length = elements.free_length
+
+        # Nodes state buffers - shape (n, 3)
+        self._displacements = nodes.displacements.copy()
+        self._velocities = nodes.velocities.copy()
+        self._coordinates = np.empty((n, 3))
+        self._resisting_forces = np.empty((n, 3))
+        self._reactions = np.empty((n, 3))
+        self._residuals = np.empty((n, 3))
+        self._masses = np.empty((n, 3))
+        self._work = np.empty((n, 3))  # intermediate results
+        self._correction = np.empty((n, 3))  # displacements correction at energy peaks
+        self._residuals_check = np.empty((n, 3), dtype=bool)  # equilibrium check
+        self._free_work = np.empty(self._free_dof_indices.size)  # intermediate results on the free DOFs
+
+        # Elements state buffers - shape (b, 3), (b, 6) and (b,)
+        self._start_coordinates = np.empty((b, 3))
+        self._vectors = np.empty((b, 3))
+        self._contributions = np.empty((b, 3))
+        self._length = np.empty(b)
+        self._elongation = np.empty(b)
+        self._young = np.empty(b)
+        self._ea = np.empty(b)
+        self._flexibility = np.empty(b)
+        self._tension = np.empty(b)
+        self._element_work = np.empty(b)  # intermediate results
+        self._elastic = np.empty(b, dtype=bool)
+
+        self._kinetic_energy = self._initial_state.kinetic_energy
+        self._compute_residuals()
+
+    @property
+    def kinetic_energy(self) -> float:
+        """Total kinetic energy of the structure at the current time step"""
+        return self._kinetic_energy
+
+    @property
+    def displacements(self) -> np.ndarray:
+        """[m] - shape (nodes_count, 3) - Current nodal displacements (read-only view on the engine buffer)"""
+        return self._read_only(self._displacements)
+
+    @property
+    def velocities(self) -> np.ndarray:
+        """[m/s] - shape (nodes_count, 3) - Current nodal velocities (read-only view on the engine buffer)"""
+        return self._read_only(self._velocities)
+
+    @property
+    def residuals(self) -> np.ndarray:
+        """[N] - shape (nodes_count, 3) - Current residual forces (read-only view on the engine buffer)"""
+        return self._read_only(self._residuals)
+
+    @property
+    def tension(self) -> np.ndarray:
+        """[N] - shape (elements_count,) - Current tension in the elements (read-only view on the engine buffer)"""
+        return self._read_only(self._tension)
+
+    def is_in_equilibrium(self) -> bool:
+        """Check if the residuals are zero for each DOF (same criteria as PyTruss.is_in_equilibrium, with the config tolerances)."""
+        threshold = np.abs(self._loads, out=self._work)
+        threshold *= self.config.zero_residual_rtol
+        threshold += self.config.zero_residual_atol
+        return bool(np.less_equal(np.abs(self._residuals, out=self._correction), threshold, out=self._residuals_check).all())
+
+    def run(self, snapshot_every: int = 0) -> PyTrussDR:
+        """Perform the time steps until equilibrium, or until the maximum number of time steps or kinetic energy resets is reached.
+
+        Args:
+            snapshot_every: If > 0, a PyTrussDR is materialized and appended to snapshots every snapshot_every time steps.
+
+        Returns:
+            PyTrussDR: The final structure state after Dynamic Relaxation
+        """
+        config = self.config
+        while (config.n_time_step < config.max_time_step 
+                and config.n_ke_reset < config.max_ke_reset 
+                and not self.is_in_equilibrium()):
+            self.step()
+            if snapshot_every > 0 and config.n_time_step % snapshot_every == 0:
+                self.snapshots.append(self.snapshot())
+        return self.snapshot()
+
+    def step(self):
+        """Perform one time step (Masses, Velocities, Displacements, Kinetic Energy) in place, and compute the new residuals."""
+        config = self.config
+        dt = config.dt
+
+        # compute current masses (eq 19 of ref [1]), with a huge mass where the DOF are fixed
+        masses = self._masses
+        masses *= 2 * dt**2 * config.mass_ampl_factor
+        masses.put(self._fixed_dof_indices, config.huge_mass)
+
+        # velocities increment: Dt * Residual/Mass (/2 when all current velocities are zero), avoiding zero masses
+        all_velocities_near_zero = np.abs(self._velocities, out=self._work).max(initial=0.0) <= 1e-12  # np.allclose(velocities, 0)
+        velocities_incr = np.maximum(masses, config.min_mass, out=self._work)
+        np.divide(self._residuals, velocities_incr, out=velocities_incr)
+        velocities_incr *= dt
+        if all_velocities_near_zero:
+            velocities_incr /= 2
+        self._velocities += velocities_incr
+
+        # next kinetic energy, summed only where there is no support
+        kinetic_energy = np.square(self._velocities, out=self._work)
+        kinetic_energy *= masses
+        next_kinetic_energy = 0.5 * np.take(kinetic_energy, self._free_dof_indices, out=self._free_work, mode="clip").sum()
+
+        # displacements increment
+        displacements_incr = np.multiply(self._velocities, dt, out=self._work)
+        self._displacements += displacements_incr
+
+        # if energy peak detected, reset velocities and adjust displacements
+        if next_kinetic_energy <= self._kinetic_energy: # energy peak detected
+            np.maximum(masses, config.min_mass, out=masses) # avoid zero mass 
+            correction = np.multiply(self._velocities, -1.5 * dt, out=self._work)
+            peak_term = np.divide(self._residuals, masses, out=self._correction)
+            peak_term *= 0.5 * dt**2
+            correction += peak_term
+            self._displacements += correction
+            next_kinetic_energy = 0
+            self._velocities.fill(0.0)
+            config.n_ke_reset += 1
+
+        self._kinetic_energy = next_kinetic_energy
+        config.n_time_step += 1
+        self._compute_residuals()
+
+    def snapshot(self) -> PyTrussDR:
+        """Materialize the current state as a new PyTrussDR, whose residuals and matrices are computed according to the config."""
+        nodes = PyNodesDR(
+            self._initial_coordinates,
+            self._dof,
+            self._loads,
+            self._displacements.copy(),
+            velocities=self._velocities.copy()
+        )
+        elements = PyElementsDR(
+            nodes,
+            self._initial_state.elements.type,
+            self._initial_state.elements.end_nodes,
+            self._area,
+            self._initial_state.elements.youngs,
+            self._free_length,
+            self._tension.copy()
+        )
+        state = PyTrussDR(nodes, elements, self._kinetic_energy)
+        state.compute_residuals(self.config.sparse, self.config.matrix_free)
+        return state
+
+    def _compute_residuals(self):
+        """Compute in place the tensions, the stiffness diagonal (stored in the masses buffer), the resisting forces, the reactions and the residuals."""
+        np.add(self._initial_coordinates, self._displacements, out=self._coordinates)
+
+        # current length and direction cosines of the elements
+        cosines = self._vectors
+        np.take(self._coordinates, self._end_nodes1, axis=0, out=cosines, mode="clip")  # valid indices: "clip" avoids buffering out
+        np.take(self._coordinates, self._end_nodes0, axis=0, out=self._start_coordinates, mode="clip")
+        cosines -= self._start_coordinates
+        length = self._length
+        np.sqrt(np.einsum('bi,bi->b', cosines, cosines, out=length), out=length)
+        cosines /= length[:, np.newaxis]
+
+        # current young modulus: tension or compression modulus, maximum modulus when the elongation is zero (see PyElements.young)
+        elongation = np.subtract(length, self._free_length, out=self._elongation)
+        young = self._young
+        np.copyto(young, self._youngs_compression)
+        np.greater(elongation, 0, out=self._elastic)
+        np.copyto(young, self._youngs_tension, where=self._elastic)
+        np.less_equal(np.abs(elongation, out=self._element_work), 1e-8, out=self._elastic)  # np.isclose(elongation, 0)
+        np.copyto(young, self._youngs_max, where=self._elastic)
+
+        # flexibility L/EA, large value if EA = 0 (see PyElements.flexibility)
+        ea = np.multiply(young, self._area, out=self._ea)
+        flexibility = _compute_flexibility(self._free_length, ea, out=self._flexibility, mask=self._elastic)
+
+        # tension
+        np.divide(elongation, flexibility, out=self._tension)
+
+        # stiffness diagonal EA/L * c² + t/L on the 3 DOFs of both end nodes (see compute_global_stiffness_diagonal)
+        # accumulated in place in the zeroed buffers
+        contributions = np.square(cosines, out=self._contributions)
+        contributions /= flexibility[:, np.newaxis]
+        contributions += (np.divide(self._tension, length, out=self._element_work))[:, np.newaxis]
+        masses = self._masses.reshape(-1)
+        masses.fill(0.0)
+        np.add.at(masses, self._start_dof_indices, contributions.reshape(-1))
+        np.add.at(masses, self._end_dof_indices, contributions.reshape(-1))
+
+        # resisting forces [-cos, cos] * t (see compute_nodal_resisting_forces)
+        contributions = np.multiply(cosines, self._tension[:, np.newaxis], out=self._contributions)
+        resisting_forces = self._resisting_forces.reshape(-1)
+        resisting_forces.fill(0.0)
+        np.subtract.at(resisting_forces, self._start_dof_indices, contributions.reshape(-1))
+        np.add.at(resisting_forces, self._end_dof_indices, contributions.reshape(-1))
+
+        # reactions at the supports, and residuals (see PyNodesDR.compute_reactions and PyNodesDR.residuals)
+        self._reactions.fill(0.0)
+        np.subtract(self._resisting_forces, self._loads, out=self._reactions, where=self._supports)
+        np.add(self._loads, self._reactions, out=self._residuals)
+        self._residuals -= self._resisting_forces
+
+    @staticmethod
+    def _read_only(array: np.ndarray) -> np.ndarray:
+        view = array.view()
+        view.flags.writeable = False
+        return view
+
+
+def main_dynamic_relaxation_inplace(structure: PyTruss, loads_increment: np.ndarray = None, 
+                                    free_length_variation: np.ndarray = None, config: PyConfigDR = None) -> PyTrussDR:
+    """
+    Perform the Dynamic Relaxation Method on the Structure, updating the state in place at each time step.
+    
+    Args:
+        structure: Initial structure state
+        loads_increment: External load increments to apply
+        free_length_variation: Free length variation to apply
+        config: Configuration for the Dynamic Relaxation method
+        
+    Returns:
+        PyTrussDR: The final structure state after Dynamic Relaxation
+        
+    Note:
+        The config object is updated in-place with the number of time steps and kinetic energy resets.
+    """
+    return DynamicRelaxationEngine(structure, loads_increment, free_length_variation, config).run()
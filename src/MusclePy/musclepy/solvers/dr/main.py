@@ -59,12 +59,16 @@ def main_dynamic_relaxation(structure: PyTruss, loads_increment: np.ndarray = No
     else: 
         assert isinstance(config, PyConfigDR), "config must be a PyConfigDR instance"
 
+    if config.in_place:
+        from musclepy.solvers.dr.dr_engine import DynamicRelaxationEngine
+        return DynamicRelaxationEngine(structure, loads_increment, free_length_variation, config).run()
+
     input_state = PyTrussDR(structure)
     
     current_state = input_state.copy_and_add(loads_increment, free_length_variation)
 
     # Compute Residuals
-    current_state.compute_residuals() 
+    current_state.compute_residuals(config.sparse, config.matrix_free) 
     
     #4) Enter the time-incremental method
     Prev = None
@@ -79,7 +83,7 @@ def main_dynamic_relaxation(structure: PyTruss, loads_increment: np.ndarray = No
         # Set the new time: t <-- t+Dt
         config.n_time_step +=1
         current_state = next_state.copy()
-        current_state.compute_residuals()
+        current_state.compute_residuals(config.sparse, config.matrix_free)
             
     return current_state
 
@@ -125,11 +129,15 @@ def compute_next_state(current: PyTrussDR, config: PyConfigDR):
 
 def _compute_current_masses(current: PyTrussDR, config: PyConfigDR) -> np.ndarray:
     
-    # compute material + geometric stiffness matrices of shape: (3*NodesCount, 3*NodesCount)
-    K = current.global_material_stiffness_matrix + current.global_geometric_stiffness_matrix
-    
-    #The diagonal of the matrix contains the sum of the stiffnesses for each elements, associated to one DoF
-    diagonal_of_K = np.diag(K).reshape(current.nodes.count, 3)
+    if config.matrix_free:
+        # the diagonal of the stiffness matrix was accumulated element by element - shape (NodesCount, 3)
+        diagonal_of_K = current.stiffness_diagonal
+    else:
+        # compute material + geometric stiffness matrices of shape: (3*NodesCount, 3*NodesCount), dense or sparse
+        K = current.global_material_stiffness_matrix + current.global_geometric_stiffness_matrix
+        
+        #The diagonal of the matrix contains the sum of the stiffnesses for each elements, associated to one DoF
+        diagonal_of_K = K.diagonal().reshape(current.nodes.count, 3)
     
     # compute masses  (eq 19 of ref [1]) - shape: (NodesCount, 3)
     current_masses = 2 * config.dt**2 * diagonal_of_K * config.mass_ampl_factor
@@ -26,7 +26,7 @@ class PyConfigDR:
     termination criteria.
     """
     
-    def __init__(self, dt=0.01, mass_ampl_factor=1, min_mass=0.005, max_time_step=10000, max_ke_reset=1000, zero_residual_rtol=1e-4, zero_residual_atol=1e-6):
+    def __init__(self, dt=0.01, mass_ampl_factor=1, min_mass=0.005, max_time_step=10000, max_ke_reset=1000, zero_residual_rtol=1e-4, zero_residual_atol=1e-6, sparse=False, matrix_free=False, in_place=False):
         """
         Initialize the Dynamic Relaxation configuration.
         
@@ -38,6 +38,11 @@ class PyConfigDR:
             max_ke_reset: Maximum number of kinetic energy resets before termination
             zero_residual_rtol: Relative tolerance for zero residual check, compared to external loads magnitude
             zero_residual_atol: Absolute tolerance (in N) for zero residual check, when loads are near zero
+            sparse: If True, the global stiffness matrices are assembled in scipy.sparse format (for large models)
+            matrix_free: If True, no global matrix is assembled: the fictitious masses and the resisting forces are accumulated 
+                    element by element on the end nodes (for very large models). The sparse parameter is then ignored.
+            in_place: If True, the time steps update preallocated state buffers instead of copying the structure at each time step 
+                    (see DynamicRelaxationEngine). The element contributions are then always accumulated without assembling any matrix.
         """
         # Mass parameters
         self.mass_ampl_factor = mass_ampl_factor if mass_ampl_factor > 0 else 1  # Amplification factor for masses
@@ -53,6 +58,11 @@ class PyConfigDR:
         self.zero_residual_rtol = zero_residual_rtol if zero_residual_rtol > 0 else 1e-4  # Relative tolerance for zero checks
         self.zero_residual_atol = zero_residual_atol if zero_residual_atol > 0 else 1e-6  # Absolute tolerance (in N) for zero checks
 
+        # Assembly parameters
+        self.sparse = bool(sparse)  # True to assemble the global stiffness matrices in scipy.sparse format
+        self.matrix_free = bool(matrix_free)  # True to skip the assembly of the global matrices
+        self.in_place = bool(in_place)  # True to update the state in place during the time steps
+
         # Initialize counters, to be returned to the user for information regarding the solver performances.
         self.n_time_step = 0  # Number of time steps performed
         self.n_ke_reset = 0  # Number of kinetic energy resets performed
\ No newline at end of file
@@ -29,7 +29,7 @@ class PyElementsDR(PyElements):
     
     Attributes:
         All attributes from PyElements
-        local_geometric_stiffness_matrices: List of local geometric stiffness matrices
+        local_geometric_stiffness_matrices: Array of local geometric stiffness matrices, shape (elements_count, 6, 6)
     """
     
     def __init__(self, elements_or_nodes, type=None, end_nodes=None, area=None, youngs=None, 
@@ -75,10 +75,10 @@ class PyElementsDR(PyElements):
             super().__init__(nodes, type, end_nodes, area, youngs, free_length, tension)
         
         # Initialize DR-specific attributes
-        self._local_geometric_stiffness_matrices = []  # [N/m] - List(elements.count) of shape (6,6) matrices
+        self._local_geometric_stiffness_matrices = np.zeros((0, 6, 6))  # [N/m] - shape (elements.count, 6, 6)
     
     @property
-    def local_geometric_stiffness_matrices(self) -> list:
+    def local_geometric_stiffness_matrices(self) -> np.ndarray:
         """Get the local geometric stiffness matrices."""
         return self._local_geometric_stiffness_matrices
     
@@ -87,14 +87,18 @@ class PyElementsDR(PyElements):
         """Set the local geometric stiffness matrices."""
         self._local_geometric_stiffness_matrices = value
     
-    def compute_current_state(self):
+    def compute_current_state(self, stiffness_matrices: bool = True):
         """Compute the current state of the elements.
         
         This is a public function to be called once, in order to avoid recomputing 
         the local stiffness matrices at each constructor call.
+        
+        Args:
+            stiffness_matrices: If False, only the tension is computed (the local stiffness matrices are not needed by the matrix-free DR).
         """
         self._compute_tension()
-        self._compute_stiffness_matrices()
+        if stiffness_matrices:
+            self._compute_stiffness_matrices()
     
     def _compute_tension(self):
         """Compute the tension for each element based on elastic elongation and flexibility."""
@@ -105,13 +109,13 @@ class PyElementsDR(PyElements):
         from musclepy.utils.matrix_calculations import compute_local_geometric_stiffness_matrices
         
         # Not used in DR
-        # # local material stiffnesses : [N/m] - List(elements.count) of shape (6,6) matrices
+        # # local material stiffnesses : [N/m] - shape (elements.count, 6, 6)
         # self.local_material_stiffness_matrices = compute_local_material_stiffness_matrices(
         #     self.direction_cosines,
         #     self.flexibility
         # )
         
-        # local geometric stiffnesses : [N/m] - List(elements.count) of shape (6,6) matrices
+        # local geometric stiffnesses : [N/m] - shape (elements.count, 6, 6)
         self.local_geometric_stiffness_matrices = compute_local_geometric_stiffness_matrices(
             self.tension,
             self.current_length
@@ -151,12 +155,12 @@ class PyElementsDR(PyElements):
         free_length = self.free_length if free_length is None else free_length
         
         # Create a new instance with the updated state
-        return self._create_copy(
+        return self._share_connectivity(self._create_copy(
             new_nodes,
-            self.type.copy(),
-            self.end_nodes.copy(),
-            self.area.copy(),
-            self.youngs.copy(),
+            self.type,
+            self.end_nodes,
+            self.area,
+            self.youngs,
             free_length,
             self.tension.copy()
-        )
+        ))
@@ -134,8 +134,8 @@ class PyNodesDR(PyNodes):
             A new instance with the current state
         """
         return self._create_copy(
-            self._initial_coordinates.copy(),
-            self._dof.copy(),
+            self._initial_coordinates,
+            self._dof,
             self._loads.copy(),
             self._displacements.copy(),
             self._reactions.copy(),
@@ -167,8 +167,8 @@ class PyNodesDR(PyNodes):
         
         # Create a new instance with the updated state
         return self._create_copy(
-            self._initial_coordinates.copy(),
-            self._dof.copy(),
+            self._initial_coordinates,
+            self._dof,
             loads,
             displacements,
             self._reactions.copy(),
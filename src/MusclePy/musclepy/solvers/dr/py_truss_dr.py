@@ -32,9 +32,10 @@ class PyTrussDR(PyTruss):
     Attributes:
         All attributes from PyTruss
         kinetic_energy: Total kinetic energy of the structure
-        equilibrium_matrix: Equilibrium matrix computed from elements.connectivity and nodes.coordinates
+        equilibrium_matrix: Equilibrium matrix computed from elements.incidence_matrix and nodes.coordinates
         global_material_stiffness_matrix: Global material stiffness matrix
         global_geometric_stiffness_matrix: Global geometric stiffness matrix
+        stiffness_diagonal: Diagonal of the global stiffness matrix, computed without assembling any matrix (matrix-free DR)
     """
     
     def __init__(self, structure_or_nodes, elements=None, kinetic_energy=0.0):
@@ -77,6 +78,7 @@ class PyTrussDR(PyTruss):
         self._equilibrium_matrix = None
         self._global_material_stiffness_matrix = None
         self._global_geometric_stiffness_matrix = None
+        self._stiffness_diagonal = None
     
     def _convert_to_dr_types(self, nodes, elements):
         """Convert nodes and elements to PyNodesDR and PyElementsDR types.
@@ -139,26 +141,40 @@ class PyTrussDR(PyTruss):
         """Set the global geometric stiffness matrix."""
         self._global_geometric_stiffness_matrix = value
     
-    def compute_residuals(self):
+    @property
+    def stiffness_diagonal(self) -> np.ndarray:
+        """[N/m] - shape (nodes_count, 3) - Diagonal of the global (material + geometric) stiffness matrix. Only computed by the matrix-free DR."""
+        return self._stiffness_diagonal
+
+    def compute_residuals(self, sparse: bool = False, matrix_free: bool = False):
         """Compute the current state of the structure.
         
         This is a public function to be called once, to avoid recomputing 
         the matrices at each constructor call.
         
+        Args:
+            sparse: If True, the global stiffness matrices are assembled in scipy.sparse format
+            matrix_free: If True, no matrix is assembled. Only the diagonal of the global stiffness matrix and the resisting forces
+                    are accumulated element by element on the end nodes, in O(elements_count) time and memory.
+        
         Steps:
         1. Compute local geometric stiffness matrices and axial forces
-        2. Compute equilibrium matrix and global stiffness matrices
+        2. Compute equilibrium matrix and global stiffness matrices (or only the stiffness diagonal if matrix_free)
         3. Compute resisting forces
         4. Compute reactions at supports
         """
         # Compute local geometric stiffness matrices and axial forces
-        self.elements.compute_current_state() 
+        self.elements.compute_current_state(stiffness_matrices=not matrix_free) 
 
-        # Compute equilibrium matrix and global stiffness matrices
-        self._compute_matrices()
+        if matrix_free:
+            # Compute the stiffness diagonal and the resisting forces from the elements contributions
+            self._compute_matrix_free()
+        else:
+            # Compute equilibrium matrix and global stiffness matrices
+            self._compute_matrices(sparse)
 
-        # Compute resisting forces
-        self._compute_resisting_forces()
+            # Compute resisting forces
+            self._compute_resisting_forces()
 
         # Compute reactions at supports
         self.nodes.compute_reactions()
@@ -166,33 +182,80 @@ class PyTrussDR(PyTruss):
         # residual forces (loads + reactions - resisting forces) are computed automatically when called
         # see PyNodesDR.residuals (get method)
 
-    def _compute_matrices(self):
-        """Compute all matrices based on the current state."""
+    def _compute_matrices(self, sparse: bool = False):
+        """Compute all matrices based on the current state.
+        
+        Args:
+            sparse: If True, the global stiffness matrices are assembled from the local ones in scipy.sparse format.
+                    If False, dense matrices are used (for small models).
+        """
         from musclepy.utils.matrix_calculations import (
             compute_equilibrium_matrix,
+            compute_sparse_equilibrium_matrix,
             compute_global_material_stiffness_matrix,
+            compute_local_material_stiffness_matrices,
             local_to_global_matrix
         )
         
         # Compute equilibrium matrix
-        self._equilibrium_matrix = compute_equilibrium_matrix(
-            self.elements.connectivity,
-            self.nodes.coordinates
-        )
+        if sparse:
+            self._equilibrium_matrix = compute_sparse_equilibrium_matrix(
+                self.elements.end_nodes,
+                self.elements.direction_cosines,
+                self.nodes.count
+            )
+        else:
+            self._equilibrium_matrix = compute_equilibrium_matrix(
+                self.elements.incidence_matrix,
+                self.nodes.coordinates
+            )
         
         # Compute global material stiffness matrix
-        self._global_material_stiffness_matrix = compute_global_material_stiffness_matrix(
-            self.equilibrium_matrix, 
-            self.elements.flexibility
-        )
+        if sparse:
+            self._global_material_stiffness_matrix = local_to_global_matrix(
+                compute_local_material_stiffness_matrices(self.elements.direction_cosines, self.elements.flexibility),
+                self.elements.end_nodes,
+                self.nodes.count,
+                sparse=True
+            )
+        else:
+            self._global_material_stiffness_matrix = compute_global_material_stiffness_matrix(
+                self.equilibrium_matrix, 
+                self.elements.flexibility
+            )
 
         # Compute global geometric stiffness matrix
         self.global_geometric_stiffness_matrix = local_to_global_matrix(
             self.elements.local_geometric_stiffness_matrices,
             self.elements.end_nodes,
-            self.nodes.count
+            self.nodes.count,
+            sparse=sparse
         )
     
+    def _compute_matrix_free(self):
+        """Compute the stiffness diagonal and the resisting forces, without assembling the equilibrium and stiffness matrices."""
+        from musclepy.utils.matrix_calculations import (
+            compute_global_stiffness_diagonal,
+            compute_nodal_resisting_forces
+        )
+        
+        elements = self.elements
+        cosines = elements.direction_cosines
+        self._stiffness_diagonal = compute_global_stiffness_diagonal(
+            elements.end_nodes,
+            cosines,
+            elements.flexibility,
+            elements.tension,
+            elements.current_length,
+            self.nodes.count
+        )
+        self.nodes.resisting_forces = compute_nodal_resisting_forces(
+            elements.end_nodes,
+            cosines,
+            elements.tension,
+            self.nodes.count
+        )
+
     def _compute_resisting_forces(self):
         """Compute the resisting forces based on the current state."""
         # Get the equilibrium matrix and element tensions
@@ -21,6 +21,6 @@
 musclepy.solvers.selfstress - Self-stress solver
 """
 
-from .modes import localize_self_stress_modes
+from .modes import localize_self_stress_modes, self_stress_modes_to_dense
 
-__all__ = ['localize_self_stress_modes']
+__all__ = ['localize_self_stress_modes', 'self_stress_modes_to_dense']
@@ -35,27 +35,47 @@ references:
 """
 
 from musclepy.femodel.pytruss import PyTruss
+from musclepy.utils.matrix_calculations import compute_equilibrium_matrix
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
 
 
-def localize_self_stress_modes(structure : PyTruss, Vs_T : np.ndarray, zero_atol=1e-6) -> np.ndarray:
+def localize_self_stress_modes(structure : PyTruss, Vs_T : np.ndarray, zero_atol=1e-6, sparse=False, modules=None, processes=None, zero_rtol=1e-3):
     """
     Localizes and sorts self-stress modes to minimize the number of elements involved in each mode.
     
     Args:
         structure: Structure object containing element information
         Vs_T: Self-stress modes matrix of shape (s, elements_count). _T stands for Transposed, indicating that one row of Vs_T is one self-stress mode.
+              A scipy.sparse matrix is also accepted.
         zero_tol: Tolerance for considering values as zero (default: 1e-6)
+        sparse: If True, the localized modes are returned as a scipy.sparse CSR matrix, which only stores the active elements of each mode
+                (the values below zero_atol are dropped). See self_stress_modes_to_dense to convert them back.
+                Only the output is sparse: the localization itself works on dense (s, elements_count) matrices, 
+                hence its memory use still scales with s * elements_count.
+        modules: If None (default), all the modes are localized together. Otherwise, the elements are partitioned into modules: 
+                - "components": the connected components of the structure (elements connected by nodes with free DOF)
+                - array of shape (elements_count,) : the module index of each element (e.g. the modules of a tensegrity grid). 
+                  A negative index marks an interface element, which does not belong to any module.
+                The self-stress modes inside each module are computed and localized independently, then only the remaining interface modes
+                (which span several modules) are reduced globally, the modules' modes being used as pivots. 
+        processes: Number of worker processes used to localize the modules in parallel (only with modules). None: sequential.
+        zero_rtol: Tolerance for considering the singular values of the modules' equilibrium matrices as zero, 
+                relative to their highest singular value (only with modules)
         
     Returns:
-        np.ndarray: Localized and sorted self-stress modes matrix
+        np.ndarray or sp.csr_matrix: Localized and sorted self-stress modes matrix - shape (s, elements_count)
     """
     # Validate input
     if structure.elements.count == 0:
         raise ValueError("Structure must have elements defined")
     
     # Validate Vs_T shape
-    if not isinstance(Vs_T, np.ndarray):  # if Vs_T is a C# array
+    if sp.issparse(Vs_T):
+        Vs_T = Vs_T.toarray()
+    elif not isinstance(Vs_T, np.ndarray):  # if Vs_T is a C# array
         Vs_T = np.array(Vs_T, dtype=float, copy=True)
     
     if Vs_T.shape[1] != structure.elements.count:
@@ -66,20 +86,21 @@ def localize_self_stress_modes(structure : PyTruss, Vs_T : np.ndarray, zero_atol
     
     # Get element lengths
     element_lengths = structure.elements.current_length
-    L = np.diag(element_lengths)
-    Linv = np.diag(1.0 / element_lengths)
     
-    # Convert force vectors to force densities, to help with localization
-    qs_T = Vs_T @ Linv  # [1/m] - force densities for each self-stress mode
+    # Convert force vectors to force densities, to help with localization (the columns are scaled by broadcasting)
+    qs_T = Vs_T * (1.0 / element_lengths)  # [1/m] - force densities for each self-stress mode
     
-    # Apply recursive reduction to localize modes
-    qs_T_localized = _recursively_reduce(qs_T, structure.elements.type, zero_atol)
+    # Apply iterative reduction to localize modes
+    if modules is None:
+        qs_T_localized = _iteratively_reduce(qs_T, structure.elements.type, zero_atol)
+    else:
+        qs_T_localized = _localize_per_module(structure, Vs_T, modules, zero_atol, zero_rtol, processes)
     
     # Sort the localized modes, to have the modes involving the least number of elements first
     qs_T_sorted = _sort_reduced_modes(qs_T_localized, zero_atol)
     
     # Convert back to dimensionless vectors
-    Vs_T_sorted = qs_T_sorted @ L
+    Vs_T_sorted = qs_T_sorted * element_lengths
     
     # Normalize each mode
     S_T = np.zeros((s, b))
@@ -87,9 +108,27 @@ def localize_self_stress_modes(structure : PyTruss, Vs_T : np.ndarray, zero_atol
         S_T[i] = normalize_self_stress_mode(Vs_T_sorted[i], zero_atol)
     
     # Return the localized, sorted and normalized self-stress modes
+    if sparse:
+        S_T[np.abs(S_T) <= zero_atol] = 0
+        return sp.csr_matrix(S_T)
     return S_T 
 
 
+def self_stress_modes_to_dense(modes) -> np.ndarray:
+    """
+    Converts self-stress modes to the dense layout of Vs_T (one row per mode).
+
+    Args:
+        modes: scipy.sparse matrix of shape (s, elements_count), see localize_self_stress_modes(sparse=True), or dense array-like
+
+    Returns:
+        np.ndarray - shape (s, elements_count) : self-stress modes as row vectors
+    """
+    if sp.issparse(modes):
+        return modes.toarray()
+    return np.asarray(modes, dtype=float)
+
+
 def normalize_self_stress_mode(mode, zero_atol=1e-6):
     """
     Normalizes one self-stress mode such that the most compressed element correspond to -1 value.
@@ -119,17 +158,24 @@ def normalize_self_stress_mode(mode, zero_atol=1e-6):
     return normalized_mode
 
 
-def _recursively_reduce(modes : np.ndarray, elements_type : np.ndarray, zero_atol=1e-6) -> np.ndarray:
+def _iteratively_reduce(modes : np.ndarray, elements_type : np.ndarray, zero_atol=1e-6, max_entries=2**20, frozen_count=0) -> np.ndarray:
     """
-    Recursively reduces the self-stress modes to localize them.
+    Iteratively reduces the self-stress modes to localize them.
     
     This implements the Gauss-Jordan elimination with pivoting to minimize
     the number of elements involved in each self-stress mode.
+    At each iteration, the modes are sorted by number of elements, and the first beneficial reduction 
+    Lj -> Lj - Li * Lj[k]/Li[k] is applied, looking from the most general mode j to the most localized mode i, 
+    and from the last element k to the first one. The iterations stop when no reduction is beneficial anymore.
+    
+    The modes are reduced in place in a dense (s, b) copy, whose rows are combined by vectorized trial reductions.
     
     Args:
-        structure: Structure object with element information
         modes: Force density matrix for self-stress modes
-        zero_tol: Tolerance for considering values as zero
+        elements_type: Elements' type (1 for cables, -1 for struts, 0 otherwise)
+        zero_atol: Tolerance for considering values as zero
+        max_entries: Maximum number of entries of the arrays of trial reductions evaluated at once (limits the memory use)
+        frozen_count: Number of (already localized) first modes which are used to reduce the other modes, but are never reduced themselves
         
     Returns:
         np.ndarray: Localized (reduced) self-stress modes
@@ -141,90 +187,195 @@ def _recursively_reduce(modes : np.ndarray, elements_type : np.ndarray, zero_ato
     # Validate element types
     if elements_type is None or len(elements_type) != b:
         raise ValueError("Element types must be provided and match the number of elements")
+    elements_type = np.asarray(elements_type)
+
+    modes = np.array(modes, dtype=float)  # the modes stay in place, their sorted order is given by the permutation "order"
+    non_zero_mask = np.abs(modes) > zero_atol
+    elements_per_mode = non_zero_mask.sum(axis=1)
+    conform_per_mode = _is_conform(modes, elements_type).sum(axis=1)
+    shared = (non_zero_mask.astype(int) @ non_zero_mask.T.astype(int)) > 0  # (s, s) : True if two modes share elements
+    not_beneficial = np.zeros((s, s), dtype=bool)  # [i, j] : True if mode i was found not to reduce mode j 
+    not_beneficial[:, :frozen_count] = True  # the frozen modes are never reduced
+    order = np.arange(s)
+
+    # positions (i, j) of the pairs of sorted modes, in the order they are tried: j from s-1 to 1, then i from 0 to j-1
+    pairs_i, pairs_j = np.triu_indices(s, k=1)
+    pairs_order = np.lexsort((pairs_i, -pairs_j))
+    pairs_i, pairs_j = pairs_i[pairs_order], pairs_j[pairs_order]
+
+    while True:
+        # Sort modes by number of elements (ascending: most localized (up) to most general (down)) 
+        order = order[np.argsort(elements_per_mode[order])]
+
+        # Skip the pairs of modes without common elements, and the pairs already found not beneficial (and unchanged since)
+        i, j = order[pairs_i], order[pairs_j]
+        pending = shared[i, j] & ~not_beneficial[i, j]
+        reduction = _find_reduction(modes, i[pending], j[pending], non_zero_mask, elements_per_mode, conform_per_mode, 
+                                    not_beneficial, elements_type, zero_atol, max_entries)
+        if reduction is None:
+            return modes[order]
+
+        # Apply the reduction
+        i, j, k = reduction
+        factor = modes[j][k] / modes[i][k]
+        modes[j] -= modes[i] * factor
+        modes[j] = np.where(np.abs(modes[j]) <= zero_atol, 0, modes[j])
         
-    # Count non-zero elements in each mode
-    non_zero_mask = ~np.isclose(modes, np.zeros((s, b)), atol=zero_atol)
-    elements_per_mode = np.sum(non_zero_mask, axis=1)
-    
-    # Sort modes by number of elements (descending: most localized (up) to most general (down)) 
-    sort_indices = np.argsort(elements_per_mode)
-    sorted_modes = modes[sort_indices]
-    elements_per_mode_sorted = elements_per_mode[sort_indices]
-    
-    # Try to reduce modes starting from the most general (with most elements)
-    # up to the most localized
-    reduction_performed = False
-    
-    # Loop through modes from most general to most localized
-    for j in range(s-1, 0, -1):
-        # Try to use each more localized mode to reduce the current mode
-        for i in range(0, j):
-            # Try each element as a potential pivot
-            for k in range(b-1, -1, -1):
-                # Skip if either mode has zero at this element
-                if (np.isclose(sorted_modes[i][k], 0, atol=zero_atol) or 
-                    np.isclose(sorted_modes[j][k], 0, atol=zero_atol)):
-                    continue
-                
-                # Test if reduction would better localize the mode j (reduce the number of elements)
-                mode_i = sorted_modes[i].copy()
-                mode_j = sorted_modes[j].copy()
-                
-                # Perform Gauss-Jordan elimination: Lj -> Lj - Li * Lj[k]/Li[k]
-                factor = mode_j[k] / mode_i[k]
-                mode_j -= mode_i * factor
-                
-                # Set near-zero values to exactly zero
-                mode_j = np.where(np.isclose(mode_j, 0, atol=zero_atol), 0, mode_j)
-                
-                # Count non-zero elements after reduction
-                elements_in_reduced_mode = np.count_nonzero(mode_j)
-                
-                # Check if reduction is beneficial
-                perform_reduction = elements_in_reduced_mode < elements_per_mode_sorted[j]
-                
-                # If number of elements is unchanged, check if reduction improves element compatibility
-                if elements_in_reduced_mode == elements_per_mode_sorted[j]:
-                    # Check if more elements conform to their expected behavior
-                    # (cables in tension, struts in compression)
-                    # Count elements with correct sign before reduction
-                    conform_before = np.sum(_is_conform(sorted_modes[j], elements_type))
-                        
-                    # Count elements with correct sign after reduction
-                    conform_after = np.sum(_is_conform(mode_j, elements_type))
-                        
-                    perform_reduction = conform_after > conform_before
-                
-                if perform_reduction:
-                    # Apply the reduction
-                    factor = sorted_modes[j][k] / sorted_modes[i][k]
-                    sorted_modes[j] -= sorted_modes[i] * factor
-                    sorted_modes[j] = np.where(np.isclose(sorted_modes[j], 0, atol=zero_atol), 0, sorted_modes[j])
-                    
-                    # Normalize the mode
-                    sorted_modes[j] = normalize_self_stress_mode(sorted_modes[j], zero_atol)
-                    
-                    # Ensure correct sign based on element types
-                    conform = np.sum(_is_conform(sorted_modes[j], elements_type))
-                    anti_conform = np.sum(_is_conform(-sorted_modes[j], elements_type))
-                        
-                    if anti_conform > conform:
-                        sorted_modes[j] = -sorted_modes[j]
-                    
-                    reduction_performed = True
-                    break
-            
-            if reduction_performed:
-                break
+        # Normalize the mode
+        modes[j] = normalize_self_stress_mode(modes[j], zero_atol)
         
-        if reduction_performed:
-            break
-    
-    # Recursively continue reduction if changes were made
-    if reduction_performed:
-        sorted_modes = _recursively_reduce(sorted_modes, elements_type, zero_atol)
+        # Ensure correct sign based on element types
+        conform = np.sum(_is_conform(modes[j], elements_type))
+        anti_conform = np.sum(_is_conform(-modes[j], elements_type))
+        if anti_conform > conform:
+            modes[j] = -modes[j]
+
+        # Update the masks of the reduced mode
+        non_zero_mask[j] = np.abs(modes[j]) > zero_atol
+        elements_per_mode[j] = non_zero_mask[j].sum()
+        conform_per_mode[j] = np.sum(_is_conform(modes[j], elements_type))
+        shared[j, :] = shared[:, j] = (non_zero_mask @ non_zero_mask[j]) > 0
+        not_beneficial[j, :] = not_beneficial[:, j] = False
+        not_beneficial[j, :frozen_count] = True
+
+
+def _localize_per_module(structure : PyTruss, Vs_T : np.ndarray, modules, zero_atol=1e-6, zero_rtol=1e-3, processes=None) -> np.ndarray:
+    """
+    Localizes the self-stress modes module by module, see localize_self_stress_modes(modules=...).
+
+    The self-stress modes inside a module are the null space of the equilibrium matrix restricted to the elements of the module. 
+    They are localized independently (in parallel if processes > 1). The interface modes complete the modules' modes 
+    to span the self-stress modes Vs_T, and are reduced globally with the modules' modes as (frozen) pivots.
+
+    Returns:
+        np.ndarray: Localized (reduced) force densities of the self-stress modes - shape (s, elements_count)
+    """
+    s, b = Vs_T.shape
+    if isinstance(modules, str):
+        if modules != "components":
+            raise ValueError(f"Unknown modules '{modules}', expected 'components' or an array of module indices")
+        modules = _connected_elements(structure)
+    modules = np.asarray(modules, dtype=int).reshape(-1)
+    if modules.size != b:
+        raise ValueError("The module indices must match the number of elements")
+
+    # equilibrium matrix of the free DOF (rows) and of the elements of each module (columns)
+    dof = structure.nodes.dof.reshape(-1)
+    A = compute_equilibrium_matrix(structure.elements.incidence_matrix, structure.nodes.coordinates, sparse=True)[dof, :].tocsc()
+    lengths = structure.elements.current_length
+    elements_type = np.asarray(structure.elements.type)
+    blocks = [np.flatnonzero(modules == index) for index in np.unique(modules[modules >= 0])]
+    tasks = [(A[:, elements].toarray(), lengths[elements], elements_type[elements], zero_atol, zero_rtol) for elements in blocks]
+
+    if processes is not None and processes > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(_localize_block, *zip(*tasks), chunksize=max(1, len(tasks) // (4 * processes))))
+    else:
+        results = [_localize_block(*task) for task in tasks]
+
+    # assemble the modules' modes: orthonormal bases and localized force densities
+    s_modules = sum(basis.shape[1] for basis, _ in results)
+    if s_modules > s:
+        raise ValueError(f"The modules have {s_modules} self-stress modes, but the structure only has {s}. Please check zero_rtol.")
+    basis = np.zeros((b, s_modules))
+    qs_T = np.zeros((s, b))
+    start = 0
+    for elements, (block_basis, block_qs_T) in zip(blocks, results):
+        stop = start + block_basis.shape[1]
+        basis[elements, start:stop] = block_basis
+        qs_T[start:stop, elements] = block_qs_T
+        start = stop
+
+    # interface modes: orthonormal complement of the modules' modes within the self-stress modes
+    Vs = Vs_T.T
+    residual = Vs - basis @ (basis.T @ Vs)
+    interface = np.linalg.svd(residual, full_matrices=False)[0][:, :s - s_modules]
+    qs_T[s_modules:] = interface.T * (1.0 / lengths)
+
+    return _iteratively_reduce(qs_T, elements_type, zero_atol, frozen_count=s_modules)
+
+
+def _localize_block(A, lengths, elements_type, zero_atol=1e-6, zero_rtol=1e-3):
+    """
+    Computes and localizes the self-stress modes of one module, from its equilibrium matrix A of shape (n_dof, module elements). 
+
+    Returns:
+        tuple: the orthonormal self-stress modes (module elements, s_module), and their localized force densities (s_module, module elements)
+    """
+    b = A.shape[1]
+    A = A[np.any(A != 0, axis=1)]  # only the DOF of the module's nodes
+    if A.shape[0] == 0:  # e.g. an element between two supports
+        basis = np.eye(b)
+    else:
+        Sval, V_T = np.linalg.svd(A)[1:]
+        r = int(np.sum(Sval >= Sval.max() * zero_rtol))
+        basis = V_T[r:].T
+    qs_T = _iteratively_reduce(basis.T * (1.0 / lengths), elements_type, zero_atol) 
+    return basis, qs_T
+
+
+def _connected_elements(structure : PyTruss) -> np.ndarray:
+    """
+    Returns:
+        np.ndarray - shape (elements_count,) : index of the connected component of each element. 
+        Two elements are connected if they share a node with at least one free DOF (the supports decouple the elements).
+    """
+    free_nodes = structure.nodes.dof.reshape((-1, 3)).any(axis=1)
+    incidence = abs(structure.elements.incidence_matrix)[:, free_nodes]
+    return connected_components(incidence @ incidence.T, directed=False)[1]
+
+
+def _find_reduction(modes, pairs_i, pairs_j, non_zero_mask, elements_per_mode, conform_per_mode, not_beneficial, 
+                    elements_type, zero_atol=1e-6, max_entries=2**20):
+    """
+    Finds the first beneficial reduction Lj -> Lj - Li * Lj[k]/Li[k], trying the pairs of modes (i, j) in the given order, 
+    and the pivot elements k from the last to the first. A reduction is beneficial if it reduces the number of elements of the mode j, 
+    or (for the same number of elements) if it increases the number of elements whose axial force conforms to their type 
+    (cables in tension, struts in compression). 
     
-    return sorted_modes
+    All trial reductions are evaluated at once, by blocks of at most max_entries values. 
+    The pairs tried before the first beneficial one are marked in not_beneficial.
+
+    Returns:
+        tuple or None: (i, j, k) the modes and the pivot element of the reduction, None if no reduction is beneficial
+    """
+    b = modes.shape[1]
+    block_size = max(1, max_entries // b)
+    # the first beneficial reduction is often found early: the number of pairs evaluated at once grows geometrically
+    start, pairs_count = 0, 4
+    while start < pairs_i.size:
+        block_i, block_j = pairs_i[start:start + pairs_count], pairs_j[start:start + pairs_count]
+
+        # candidate pivots : the common elements of both modes, from the last to the first
+        pair, k = np.nonzero((non_zero_mask[block_i] & non_zero_mask[block_j])[:, ::-1])
+        k = b - 1 - k
+        for first in range(0, pair.size, block_size):
+            trial_pair, trial_k = pair[first:first + block_size], k[first:first + block_size]
+            i, j = block_i[trial_pair], block_j[trial_pair]
+
+            # Perform the Gauss-Jordan eliminations - shape (trials, elements)
+            factors = modes[j, trial_k] / modes[i, trial_k]
+            reduced = modes[j] - modes[i] * factors[:, None]
+            reduced[np.abs(reduced) <= zero_atol] = 0
+            elements_in_reduced_modes = np.count_nonzero(reduced, axis=1)
+            
+            # Check if reduction is beneficial
+            beneficial = elements_in_reduced_modes < elements_per_mode[j]
+            same_count = elements_in_reduced_modes == elements_per_mode[j]
+            if same_count.any():
+                # Check if more elements conform to their expected behavior (cables in tension, struts in compression)
+                conform_after = np.sum(_is_conform(reduced[same_count], elements_type), axis=1)
+                beneficial[same_count] = conform_after > conform_per_mode[j[same_count]]
+
+            if beneficial.any():
+                found = np.argmax(beneficial)
+                tried = start + trial_pair[found]
+                not_beneficial[pairs_i[:tried], pairs_j[:tried]] = True
+                return i[found], j[found], trial_k[found]
+        start, pairs_count = start + pairs_count, min(2 * pairs_count, block_size)
+
+    not_beneficial[pairs_i, pairs_j] = True
+    return None
 
 def _is_conform(tension, type):
     """
@@ -233,7 +384,7 @@ def _is_conform(tension, type):
     Parameters
     ----------
     tension : np.ndarray
-        Axial forces in the elements (tension >0, compression <0)
+        Axial forces in the elements (tension >0, compression <0), or several rows of axial forces
     type : np.ndarray
         Elements' type (1 if elements withstand only tension, -1 if withstand only compression, 0 if withstand both)
     
@@ -243,7 +394,7 @@ def _is_conform(tension, type):
         Boolean array indicating whether the element withstands the sign of the axial force or not
     """
     # assert the shape of tension and type
-    assert tension.shape == type.shape, "Tension and type arrays must have the same shape"
+    assert tension.shape[-1] == type.shape[-1], "Tension and type arrays must have the same number of elements"
     
     # For elements that withstand only tension (type=1), tension should be ≥ 0
     # For elements that withstand only compression (type=-1), tension should be ≤ 0
@@ -279,7 +430,7 @@ def _sort_reduced_modes(reduced_modes, zero_tol=1e-6):
         return reduced_modes
     
     # Count non-zero elements in each mode
-    non_zero_mask = ~np.isclose(reduced_modes, np.zeros((s, b)), atol=zero_tol)
+    non_zero_mask = np.abs(reduced_modes) > zero_tol
     elements_per_mode = np.sum(non_zero_mask, axis=1)
     
     # Find groups of modes with the same number of elements
@@ -323,15 +474,8 @@ def _sort_mode_group(group_modes, zero_tol=1e-6):
         return group_modes
     
     # Find the index of the first non-zero element in each mode
-    first_indices = np.zeros(sub_s, dtype=int)
-    
-    for i in range(sub_s):
-        mode = group_modes[i]
-        non_zero_indices = np.where(~np.isclose(mode, 0, atol=zero_tol))[0]
-        if len(non_zero_indices) > 0:
-            first_indices[i] = non_zero_indices[0]
-        else:
-            first_indices[i] = b  # Place modes with all zeros at the end
+    non_zero_mask = np.abs(group_modes) > zero_tol
+    first_indices = np.where(non_zero_mask.any(axis=1), non_zero_mask.argmax(axis=1), b)  # Place modes with all zeros at the end
     
     # Sort by first non-zero index
     sort_indices = np.argsort(first_indices)
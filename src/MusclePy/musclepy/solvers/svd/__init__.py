@@ -21,7 +21,7 @@
 musclepy.solvers.svd - Singular Value Decomposition solver
 """
 
-from .main import main_singular_value_decomposition
+from .main import main_singular_value_decomposition, update_singular_value_decomposition
 from .py_results_svd import PyResultsSVD
 
-__all__ = ['main_singular_value_decomposition', 'PyResultsSVD']
+__all__ = ['main_singular_value_decomposition', 'update_singular_value_decomposition', 'PyResultsSVD']
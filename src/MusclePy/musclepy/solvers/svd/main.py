@@ -21,19 +21,40 @@ from musclepy.solvers.svd.py_results_svd import PyResultsSVD
 from musclepy.femodel.pytruss import PyTruss
 from musclepy.utils.matrix_calculations import compute_equilibrium_matrix
 import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
 
+SVD_METHODS = ("full", "sparse")
 
-def main_singular_value_decomposition(structure: PyTruss, zero_rtol: float = 1e-3) -> PyResultsSVD:
+def main_singular_value_decomposition(structure: PyTruss, zero_rtol: float = 1e-3, method: str = "full", 
+                                      extensional_modes: bool = None) -> PyResultsSVD:
     """
     Compute the Singular Value Decomposition of the Equilibrium Matrix of the structure
     
     Args:
         structure: PyTruss instance to analyze
         zero_rtol: Tolerance for considering singular values as zero, relative to the highest singular value
+        method: How the decomposition is computed:
+                - "full" (default): complete SVD of the dense equilibrium matrix. 
+                - "sparse": only the null spaces (self-stress modes Vs and mechanisms Um) are computed, as the eigenvectors 
+                  of the sparse matrices A.T @ A and A @ A.T associated to (near) zero eigenvalues, by sparse inverse iterations.
+                  The complete U (n_dof x n_dof) and V (b x b) matrices are never formed (for large structures).
+        extensional_modes: If False, the extensional modes Ur, Vr and the singular values Sr are not returned (None). 
+                None (default) means True with the "full" method, and False with the "sparse" method. 
+                With the "sparse" method and True, they are computed from the economy SVD of the dense equilibrium matrix: 
+                O(n_dof * b * min(n_dof, b)) time and O(n_dof * b) memory, which defeats the purpose of the sparse method 
+                on large structures (the r extensional modes span nearly the whole spaces).
             
     Returns:
         PyResultsSVD: Object containing the SVD results
     """
+    if method not in SVD_METHODS:
+        raise ValueError(f"Unknown SVD method '{method}', expected one of {SVD_METHODS}")
+    if extensional_modes is None:
+        extensional_modes = method == "full"
+    if method == "sparse":
+        return _sparse_singular_value_decomposition(structure, zero_rtol, extensional_modes)
+
     # 1) Validate input structure
     assert isinstance(structure, PyTruss), "Input structure must be an instance of PyTruss"
        
@@ -44,7 +65,7 @@ def main_singular_value_decomposition(structure: PyTruss, zero_rtol: float = 1e-
     n_dof = dof.sum() # 3 n - fixations_count
     
     # 3) Compute equilibrium matrix based on current nodes coordinates
-    A_3n = compute_equilibrium_matrix(structure.elements.connectivity, structure.nodes.coordinates) # shape (3*n, b)
+    A_3n = compute_equilibrium_matrix(structure.elements.incidence_matrix, structure.nodes.coordinates) # shape (3*n, b)
     A = A_3n[dof, :] # shape (3 n - fixations_count, b)
         
     # 4) Validate the equilibrium matrix
@@ -81,6 +102,8 @@ def main_singular_value_decomposition(structure: PyTruss, zero_rtol: float = 1e-
         Um_3n= U_3n[:, r:]  # # the m last remaining columns 
 
     # 9) Create and return PyResultsSVD object
+    if not extensional_modes:
+        Ur_3n, Sr, Vr = None, None, None
     return PyResultsSVD(
             r=r,
             s=s,
@@ -91,3 +114,241 @@ def main_singular_value_decomposition(structure: PyTruss, zero_rtol: float = 1e-
             Vr=Vr,
             Vs=Vs   
         )
+
+
+def _sparse_singular_value_decomposition(structure: PyTruss, zero_rtol: float, extensional_modes: bool) -> PyResultsSVD:
+    """Compute the null spaces of the sparse equilibrium matrix, see main_singular_value_decomposition(method="sparse")."""
+    assert isinstance(structure, PyTruss), "Input structure must be an instance of PyTruss"
+    n = structure.nodes.count
+    b = structure.elements.count
+    dof = structure.nodes.dof.reshape((-1,))
+    n_dof = dof.sum()
+
+    # sparse equilibrium matrix of the free DOF - shape (n_dof, b)
+    A = compute_equilibrium_matrix(structure.elements.incidence_matrix, structure.nodes.coordinates, sparse=True)[dof, :]
+    assert A.shape == (n_dof, b), "Please check the equilibrium matrix (A) shape"
+    AT_A = (A.T @ A).tocsc()  # (b, b) : eigenvalues = squared singular values (+ b - n_dof zeros if b > n_dof)
+    A_AT = (A @ A.T).tocsc()  # (n_dof, n_dof)
+
+    # singular values are zero below Smax * zero_rtol, i.e. eigenvalues of the Gram matrices below (Smax * zero_rtol)²
+    Smax = np.sqrt(_largest_eigenvalue(AT_A if b <= n_dof else A_AT))
+    zero = (Smax * zero_rtol)**2
+
+    Vs = _null_space(AT_A, zero, min_count=b - n_dof)  # s self-stress modes (at least b - n_dof)
+    s = Vs.shape[1]
+    r = b - s  # Rank of equilibrium matrix
+    m = n_dof - r  # Degree of kinematic indeterminacy (mechanisms)
+    Um = _null_space(A_AT, zero, count=m)  # m inextensional modes
+
+    # Reformat node space eigenvectors from n_dof to 3n : the fixed DOF are filled with 0 at the supports. 
+    Um_3n = np.zeros((3*n, m))
+    Um_3n[dof, :] = Um
+
+    Ur_3n, Sr, Vr = None, None, None
+    if extensional_modes:  # dense, see main_singular_value_decomposition
+        U, Sval, V_T = np.linalg.svd(A.toarray(), full_matrices=False)
+        Sr = Sval[:r]
+        Vr = V_T[:r].T
+        Ur_3n = np.zeros((3*n, r))
+        Ur_3n[dof, :] = U[:, :r]
+
+    return PyResultsSVD(r=r, s=s, m=m, Ur=Ur_3n, Um=Um_3n, Sr=Sr, Vr=Vr, Vs=Vs)
+
+
+def _largest_eigenvalue(G) -> float:
+    """Largest eigenvalue of the symmetric positive semi-definite sparse matrix G (only used to scale the zero threshold)."""
+    size = G.shape[0]
+    if size == 0:
+        return 0.0
+    if size <= 2:
+        return float(np.linalg.eigvalsh(G.toarray()).max())
+    # the largest eigenvalues of trusses are clustered: a larger Krylov subspace converges much faster than the default one
+    return float(spla.eigsh(G, k=1, which="LA", ncv=min(size - 1, 32), tol=1e-8, return_eigenvectors=False)[0])
+
+
+def _null_space(G, zero: float, count: int = None, min_count: int = 0, iterations: int = 4) -> np.ndarray:
+    """Orthonormal eigenvectors of the symmetric positive semi-definite sparse matrix G whose eigenvalues are below zero.
+
+    The eigenvectors are found by a block inverse iteration with the sparse LU factorization of G + zero*I (positive definite), 
+    followed by a Rayleigh-Ritz projection. As the null space is separated from the other eigenvalues by a large gap, 
+    a few iterations are sufficient, and (unlike Lanczos methods) all the vectors of a degenerate null space are found.
+    If the number of eigenvectors is not known (count=None), the size of the block is doubled (starting from min_count) 
+    until an eigenvalue above zero is found.
+
+    Returns:
+        np.ndarray - shape (size, count) : column eigenvectors
+    """
+    size = G.shape[0]
+    if count == 0 or size == 0:
+        return np.zeros((size, 0))
+    solve = spla.splu((G + zero * sp.identity(size, format="csc")).tocsc()).solve
+    rng = np.random.default_rng(0)  # deterministic results
+    k = count if count is not None else min(max(8, min_count), size)
+    while True:
+        block_size = min(size, k + 8)  # oversampling
+        X = rng.standard_normal((size, block_size))
+        for _ in range(iterations):
+            X, _ = np.linalg.qr(solve(X))
+
+        # Rayleigh-Ritz projection: eigenvalues sorted in ascending order
+        eigenvalues, Y = np.linalg.eigh(X.T @ (G @ X))
+        eigenvectors = X @ Y
+
+        if count is not None:
+            return eigenvectors[:, :count]
+        is_zero = eigenvalues < zero
+        if is_zero.sum() < block_size or block_size == size:
+            return eigenvectors[:, is_zero]
+        k = 2 * k
+
+
+def update_singular_value_decomposition(previous: PyResultsSVD, structure: PyTruss, removed_elements=None, added_elements=None, 
+                                        moved_nodes=None, zero_rtol: float = 1e-3, tolerance: float = 1e-8) -> PyResultsSVD:
+    """
+    Update the Singular Value Decomposition of the Equilibrium Matrix after a few elements were removed, added or moved. 
+
+    Instead of decomposing the modified equilibrium matrix from scratch, the modified columns are applied as a low-rank update 
+    A' = A + X @ Y.T of the previous decomposition (Brand M., 2006, Fast low-rank modifications of the thin singular value decomposition, 
+    Linear Algebra and its Applications 415, 20-30). Only a small (r+c, r+c) matrix is decomposed, c being the number of modified columns. 
+    The null spaces (self-stress modes and mechanisms) are updated by rotations within the previous null spaces. 
+    
+    The updated decomposition is checked against the equilibrium matrix of the structure: if the relative error exceeds the tolerance 
+    (or if the previous extensional modes were not computed, or the nodes or supports changed), the SVD is fully recomputed.
+
+    Args:
+        previous: PyResultsSVD of the structure before the modification
+        structure: PyTruss after the modification. The remaining elements of the previous structure must keep their relative order.
+        removed_elements: [/] - shape (k,) - indices of the elements of the previous structure which were removed
+        added_elements: [/] - shape (a,) - indices of the elements of the (updated) structure which were added
+        moved_nodes: [/] - shape (p,) - indices of the nodes whose coordinates changed: the elements connected to them are updated
+        zero_rtol: Tolerance for considering singular values as zero, relative to the highest singular value
+        tolerance: Maximum relative error of the updated singular triplets, before falling back to a full recomputation
+            
+    Returns:
+        PyResultsSVD: Object containing the updated SVD results
+    """
+    assert isinstance(previous, PyResultsSVD), "previous must be a PyResultsSVD instance"
+    assert isinstance(structure, PyTruss), "Input structure must be an instance of PyTruss"
+    removed = np.unique(np.asarray([] if removed_elements is None else removed_elements, dtype=int))
+    added = np.unique(np.asarray([] if added_elements is None else added_elements, dtype=int))
+    moved = np.unique(np.asarray([] if moved_nodes is None else moved_nodes, dtype=int))
+
+    n = structure.nodes.count
+    b = structure.elements.count
+    dof = structure.nodes.dof.reshape((-1,))
+    n_dof = dof.sum()
+    b_old = previous.r + previous.s
+    if (previous.Ur is None or previous.Vr is None or previous.Sr is None  # extensional modes are required 
+            or previous.Um.shape[0] != 3*n or previous.r + previous.m != n_dof  # nodes or supports changed
+            or np.any(previous.Ur[~dof]) or np.any(previous.Um[~dof]) 
+            or b_old - removed.size + added.size != b):
+        return main_singular_value_decomposition(structure, zero_rtol)
+
+    # equilibrium matrix of the updated structure - shape (n_dof, b)
+    A = compute_equilibrium_matrix(structure.elements.incidence_matrix, structure.nodes.coordinates, sparse=True)[dof, :]
+
+    # correspondence between the kept elements of the previous structure and of the updated structure 
+    kept_old = np.setdiff1d(np.arange(b_old), removed)
+    kept_new = np.setdiff1d(np.arange(b), added)
+    # the elements of the updated structure connected to moved nodes 
+    is_moved = np.isin(structure.elements.end_nodes, moved).any(axis=1)[kept_new]
+    modified_old, modified_new = kept_old[is_moved], kept_new[is_moved]
+
+    # previous decomposition in the space of the free DOF. The added elements are appended as zero columns (= new self-stress modes)
+    Ur, Um, Sr = previous.Ur[dof, :], previous.Um[dof, :], previous.Sr
+    b_ext = b_old + added.size
+    Vr = np.zeros((b_ext, previous.r))
+    Vr[:b_old] = previous.Vr
+    Vs = np.zeros((b_ext, previous.s + added.size))
+    Vs[:b_old, :previous.s] = previous.Vs
+    Vs[b_old + np.arange(added.size), previous.s + np.arange(added.size)] = 1.0
+
+    # low-rank update A' = A + X @ Y.T, with Y the unit vectors of the modified columns
+    previous_columns = lambda old: (Ur * Sr) @ previous.Vr[old].T  # shape (n_dof, k)
+    X = np.hstack([-previous_columns(removed), 
+                   A[:, modified_new].toarray() - previous_columns(modified_old), 
+                   A[:, added].toarray()])
+    columns = np.concatenate([removed, modified_old, b_old + np.arange(added.size)])
+    if columns.size == 0:
+        return previous
+    Y = np.zeros((b_ext, columns.size))
+    Y[columns, np.arange(columns.size)] = 1.0
+
+    Ur, Um, Sr, Vr, Vs = _low_rank_update(Ur, Um, Sr, Vr, Vs, X, Y, zero_rtol)
+
+    # delete the rows of the removed elements : their unit vectors belong to the null space 
+    if removed.size > 0:
+        Vs = _deflate(Vs, Vs[removed].T)
+    order = np.empty(b, dtype=int)
+    order[kept_new] = kept_old
+    order[added] = b_old + np.arange(added.size)
+    Vr, Vs = Vr[order], Vs[order]
+
+    # check the updated singular triplets against the equilibrium matrix
+    Smax = Sr[0] if Sr.size > 0 else 1.0
+    error = max(np.linalg.norm(A @ Vr - Ur * Sr), np.linalg.norm(A.T @ Ur - Vr * Sr)) / Smax
+    if error > tolerance:
+        return main_singular_value_decomposition(structure, zero_rtol)
+
+    r = Sr.size
+    Ur_3n = np.zeros((3*n, r))
+    Ur_3n[dof, :] = Ur
+    Um_3n = np.zeros((3*n, n_dof - r))
+    Um_3n[dof, :] = Um
+    return PyResultsSVD(r=r, s=b - r, m=n_dof - r, Ur=Ur_3n, Um=Um_3n, Sr=Sr, Vr=Vr, Vs=Vs)
+
+
+def _low_rank_update(Ur, Um, Sr, Vr, Vs, X, Y, zero_rtol):
+    """Update the complete SVD [Ur Um] diag(Sr) [Vr Vs].T of A into the one of A + X @ Y.T (see update_singular_value_decomposition)."""
+    r = Sr.size
+    # components of X and Y orthogonal to the extensional modes, i.e. within the null spaces - eq. 2 of ref (Brand, 2006)
+    P, Rx = _orthogonal_extension(Ur, X)
+    Q, Ry = _orthogonal_extension(Vr, Y)
+    Mx = np.vstack([Ur.T @ X, Rx])
+    My = np.vstack([Vr.T @ Y, Ry])
+
+    # small core matrix K - shape (r+cp, r+cq)
+    K = Mx @ My.T
+    K[np.arange(r), np.arange(r)] += Sr
+    Uk, Sk, Vk_T = np.linalg.svd(K)
+    r_new = int(np.sum(Sk >= Sk.max() * zero_rtol)) if Sk.size > 0 else 0
+
+    U_extended = np.hstack([Ur, P]) @ Uk
+    V_extended = np.hstack([Vr, Q]) @ Vk_T.T
+    # the null spaces: the remaining columns of the core rotation + the previous null spaces, deflated of P and Q
+    Um = np.hstack([U_extended[:, r_new:], _deflate(Um, Um.T @ P)])
+    Vs = np.hstack([V_extended[:, r_new:], _deflate(Vs, Vs.T @ Q)])
+    return U_extended[:, :r_new], Um, Sk[:r_new], V_extended[:, :r_new], Vs
+
+
+def _orthogonal_extension(basis, X):
+    """Orthonormal basis P of the component of X orthogonal to the basis, and the coordinates R of this component: X - basis @ basis.T @ X = P @ R."""
+    residual = X - basis @ (basis.T @ X)
+    residual -= basis @ (basis.T @ residual)  # re-orthogonalization
+    if residual.shape[1] == 0:
+        return residual, np.zeros((0, 0))
+    P, S, W_T = np.linalg.svd(residual, full_matrices=False)
+    rank = int(np.sum(S > max(1.0, np.abs(X).max()) * 1e-12 * max(residual.shape)))
+    P = P[:, :rank]
+    return P, P.T @ residual
+
+
+def _deflate(basis, Z):
+    """Orthonormal basis of the subspace of span(basis) orthogonal to basis @ Z, with Z of shape (basis columns, k).
+
+    The basis is rotated by Householder reflections which bring the (orthonormalized) columns of Z on its first columns, 
+    which are then dropped. The cost is proportional to the number of columns of Z, instead of the size of the basis.
+    """
+    if Z.shape[1] == 0 or basis.shape[1] == 0:
+        return basis
+    Z, R = np.linalg.qr(Z)
+    Z = Z[:, np.abs(np.diag(R)) > 1e-8 * max(1.0, np.abs(R).max())]
+    for i in range(Z.shape[1]):
+        z = Z[:, i].copy()
+        z[0] += np.copysign(1.0, z[0])
+        z /= np.linalg.norm(z)
+        # Householder reflection H = I - 2 z z.T which maps the i-th column of Z onto the first axis
+        basis = basis - 2 * np.outer(basis @ z, z)
+        Z = Z - 2 * np.outer(z, z @ Z)
+        basis, Z = basis[:, 1:], Z[1:, :]
+    return basis
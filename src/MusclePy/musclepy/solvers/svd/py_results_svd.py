@@ -42,6 +42,7 @@ class PyResultsSVD():
         self.Vr = Vr # r extensional modes: axial forces in equilibrium with extensional loads OR elongations compatible with extensional displacements. 
         self.Vs = Vs # s self-stress modes: axial forces in equilibrium without external loads OR "incompatible" elongations (= elongations that can exist without displacements)
 
+        # note: Ur, Sr and Vr are None if the extensional modes were not computed (see main_singular_value_decomposition)
         # note: all vectors are column vectors by default
         # but grasshopper needs their transpose for visualisation purpose
 
@@ -52,7 +53,7 @@ class PyResultsSVD():
         Returns:
             np.ndarray - shape (r, 3*nodes_count) : extensional modes as row vectors (i.e. Transpose of Ur)
         """
-        return self.Ur.T
+        return None if self.Ur is None else self.Ur.T
     
     @property
     def Um_T(self):
@@ -68,7 +69,7 @@ class PyResultsSVD():
         Returns:
             np.ndarray - shape (r, elements_count) : extensional modes as row vectors (i.e. Transpose of Vr)
         """
-        return self.Vr.T
+        return None if self.Vr is None else self.Vr.T
     
     @property
     def Vs_T(self):
@@ -76,4 +77,14 @@ class PyResultsSVD():
         Returns:
             np.ndarray - shape (s, elements_count) : self-stress modes as row vectors (i.e. Transpose of Vs)
         """
-        return self.Vs.T
\ No newline at end of file
+        return self.Vs.T
+
+    def update(self, structure, removed_elements=None, added_elements=None, moved_nodes=None, zero_rtol: float = 1e-3, tolerance: float = 1e-8):
+        """
+        Update the decomposition after a few elements were removed, added or moved, see update_singular_value_decomposition.
+
+        Returns:
+            PyResultsSVD: the updated decomposition of the equilibrium matrix of the structure 
+        """
+        from musclepy.solvers.svd.main import update_singular_value_decomposition
+        return update_singular_value_decomposition(self, structure, removed_elements, added_elements, moved_nodes, zero_rtol, tolerance)
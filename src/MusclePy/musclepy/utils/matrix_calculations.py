@@ -29,8 +29,9 @@ References:
 """
 
 import numpy as np
+import scipy.sparse as sp
 
-def compute_equilibrium_matrix(connectivity_matrix, current_coordinates):
+def compute_equilibrium_matrix(connectivity_matrix, current_coordinates, sparse=False):
     """
     Compute the equilibrium matrix of the structure in its current state.
     
@@ -38,44 +39,55 @@ def compute_equilibrium_matrix(connectivity_matrix, current_coordinates):
     Feron J., Latteur P., Almeida J., 2024, Static Modal Analysis, Arch Comp Meth Eng.
     
     Args:
-        connectivity_matrix: (b, n) : connectivity matrix of the structure
+        connectivity_matrix: (b, n) : connectivity matrix of the structure, dense or scipy.sparse (see PyElements.incidence_matrix)
         current_coordinates: (n, 3) : current coordinates of the nodes
+        sparse: If True, return the equilibrium matrix in scipy.sparse CSR format. If False, return a dense array.
     
     Returns:
-        np.ndarray: (3* n, b) : equilibrium matrix of the structure (containing the free and fixed DOF)
+        np.ndarray or scipy.sparse.csr_matrix: (3* n, b) : equilibrium matrix of the structure (containing the free and fixed DOF)
     """
-    C = connectivity_matrix
+    C = sp.csr_matrix(connectivity_matrix)
     b, n = C.shape  # number of elements, number of nodes
     
     assert current_coordinates.shape == (n, 3), "Please check the shape of the current coordinates"
 
-    x, y, z = current_coordinates.T
+    # element vectors (x1-x0, y1-y0, z1-z0) - shape (b, 3)
+    dX = C @ current_coordinates
+    current_length = np.sqrt(np.sum(dX**2, axis=1))
+    cosines = dX / current_length[:, None]
 
-    dx = C @ x
-    dy = C @ y
-    dz = C @ z
+    # For each node (= one row i), if the element (= a column j) is connected to the node, 
+    # then the entry (i,j) of A contains the cosinus director, else 0.
+    # The Degrees Of Freedom are sorted like this [0X 0Y OZ 1X 1Y 1Z ... (n-1)X (n-1)Y (n-1)Z]
+    C = C.tocoo()
+    rows = (3 * C.col[:, None] + np.arange(3)).reshape(-1)
+    cols = np.repeat(C.row, 3)
+    data = (C.data[:, None] * cosines[C.row]).reshape(-1)
+    A = sp.coo_matrix((data, (rows, cols)), shape=(3 * n, b)).tocsr()
 
-    current_length = np.sqrt(dx**2 + dy**2 + dz**2)
+    return A if sparse else A.toarray()
 
-    cx = dx / current_length
-    cy = dy / current_length
-    cz = dz / current_length
 
-    # Calculate equilibrium matrix
-    # For each node (= one row i), if the element (= a column j) is connected to the node, 
-    # then the entry (i,j) of A contains the cosinus director, else 0.
-    Ax = C.T @ np.diag(cx)  # (n, b)  =  (n, b) @ (b, b)
-    Ay = C.T @ np.diag(cy)
-    Az = C.T @ np.diag(cz)
+def compute_sparse_equilibrium_matrix(elements_end_nodes, direction_cosines, nodes_count):
+    """
+    Compute the equilibrium matrix of the structure directly from the end nodes and the direction cosines of the elements.
 
-    A = np.zeros((3 * n, b))  
-    # The Degrees Of Freedom are sorted like this [0X 0Y OZ 1X 1Y 1Z ... (n-1)X (n-1)Y (n-1)Z]
-    # Vectorized assignment - more efficient than using a loop
-    A[0::3, :] = Ax  # X components for all nodes
-    A[1::3, :] = Ay  # Y components for all nodes
-    A[2::3, :] = Az  # Z components for all nodes
+    Args:
+        elements_end_nodes: [-] - shape (b, 2) - Indices of the start and end nodes of each element
+        direction_cosines: [-] - shape (b, 3) - Direction cosines of each element
+        nodes_count: [-] - Number of nodes n
+
+    Returns:
+        scipy.sparse.csr_matrix: (3* n, b) : equilibrium matrix of the structure (containing the free and fixed DOF)
+    """
+    b = len(elements_end_nodes)
+    assert direction_cosines.shape == (b, 3), "Please check the shape of the direction cosines"
 
-    return A
+    # column j of A contains -cos at the DOF of the start node and +cos at the DOF of the end node of element j
+    rows = compute_elements_dof_indices(elements_end_nodes).reshape(-1)
+    cols = np.repeat(np.arange(b), 6)
+    data = np.concatenate((-direction_cosines, direction_cosines), axis=1).reshape(-1)
+    return sp.coo_matrix((data, (rows, cols)), shape=(3 * nodes_count, b)).tocsr()
 
 
 def compute_global_material_stiffness_matrix(A, flexibility):
@@ -83,17 +95,20 @@ def compute_global_material_stiffness_matrix(A, flexibility):
     Compute the material stiffness matrix of the structure in its current state.
     
     Args:
-        A: np.ndarray: (3*n, b) : equilibrium matrix of the structure.
+        A: np.ndarray or scipy.sparse matrix: (3*n, b) : equilibrium matrix of the structure.
         flexibility: np.ndarray: (b,) : flexibility vector L/EA for each element.
     
     Returns:
-        np.ndarray: (3*n, 3*n) : material stiffness matrix of the structure
+        np.ndarray or scipy.sparse.csr_matrix: (3*n, 3*n) : material stiffness matrix of the structure (sparse if A is sparse)
     """
     _3n, b = A.shape
 
     # Assert that sizes are compatible        
     assert flexibility.size == b, "Please check the shape of the flexibility vector"
     
+    if sp.issparse(A):
+        return (A @ sp.diags(1 / flexibility) @ A.T).tocsr()
+
     # Create diagonal matrix of stiffness values (inverse of flexibility)
     Ke = np.diag(1 / flexibility)  # EA/L in a diagonal matrix. Note that EA/L can be equal to 0 if the cable is slacked
     
@@ -106,15 +121,15 @@ def compute_global_material_stiffness_matrix(A, flexibility):
 
 
 
-def compute_local_material_stiffness_matrices(cosinus: np.ndarray, flexibility: np.ndarray,) -> list:
-        """Compute local material stiffness matrices for each element.
+def compute_local_material_stiffness_matrices(cosinus: np.ndarray, flexibility: np.ndarray,) -> np.ndarray:
+        """Compute local material stiffness matrices for all elements at once.
         
         Args:
             cosinus: [-] - shape (elements_count, 3) - Direction cosines of each element
             flexibility: [m/N] - shape (elements_count,) - Element flexibilities L/(EA) based on free_length
             
         Returns:
-            List of local material stiffness matrices, each of shape (6,6)
+            [N/m] - shape (elements_count, 6, 6) - Local material stiffness matrices
         """
         # Get element count from flexibility array
         elements_count = len(flexibility)
@@ -122,30 +137,22 @@ def compute_local_material_stiffness_matrices(cosinus: np.ndarray, flexibility:
         # Assert that cosinus has the correct shape
         assert cosinus.shape == (elements_count, 3), f"cosinus must have shape ({elements_count}, 3), but has shape {cosinus.shape}"
         
-        if elements_count == 0:
-            return []
-        
-        km_loc_list = []
-        
-        for i in range(elements_count):
-            cx, cy, cz = cosinus[i]
-            cos = np.array([[-cx, -cy, -cz, cx, cy, cz]])
-            R = cos.T @ cos  # local compatibility * local equilibrium
-            km = (1/flexibility[i]) * R  # local material stiffness matrix
-            km_loc_list.append(km)
-            
-        return km_loc_list
+        # local equilibrium vector of each element [-cx, -cy, -cz, cx, cy, cz] : shape (elements_count, 6)
+        cos = np.concatenate((-cosinus, cosinus), axis=1)
+
+        # km = EA/L * cos.T @ cos  (local compatibility * local equilibrium)
+        return np.einsum('b,bi,bj->bij', 1/flexibility, cos, cos)
 
 
-def compute_local_geometric_stiffness_matrices(tension: np.ndarray, length: np.ndarray) -> list:
-        """Compute local geometric stiffness matrices for each element.
+def compute_local_geometric_stiffness_matrices(tension: np.ndarray, length: np.ndarray) -> np.ndarray:
+        """Compute local geometric stiffness matrices for all elements at once.
         
         Args:
             tension: [N] - shape (elements_count,) - Tension in each element
             length: [m] - shape (elements_count,) - Current length of each element
             
         Returns:
-            List of local geometric stiffness matrices, each of shape (6,6)
+            [N/m] - shape (elements_count, 6, 6) - Local geometric stiffness matrices
         """
         # Get element count from tension array
         elements_count = len(tension)
@@ -158,60 +165,163 @@ def compute_local_geometric_stiffness_matrices(tension: np.ndarray, length: np.n
         # Calculate force densities
         force_densities = tension / length
         
-        if elements_count == 0:
-            return []
-            
-        kg_loc_list = []
-        for i in range(elements_count):
-            kg = force_densities[i] * np.array([
-                [ 1, 0, 0,-1, 0, 0],
-                [ 0, 1, 0, 0,-1, 0],
-                [ 0, 0, 1, 0, 0,-1],
-                [-1, 0, 0, 1, 0, 0],
-                [ 0,-1, 0, 0, 1, 0],
-                [ 0, 0,-1, 0, 0, 1]
-            ])
-            kg_loc_list.append(kg)
-            
-        return kg_loc_list
+        # kg = t/L * [[ I, -I],
+        #             [-I,  I]]
+        unit_kg = np.kron(np.array([[1.0, -1.0], [-1.0, 1.0]]), np.eye(3))
+        return force_densities[:, np.newaxis, np.newaxis] * unit_kg
 
 
-def local_to_global_matrix(local_matrices, elements_end_nodes, nodes_count):
+def compute_elements_dof_indices(elements_end_nodes: np.ndarray) -> np.ndarray:
     """
-    Convert list of local matrices to global matrix.
+    Compute the global indices of the 6 DOFs of each element.
+    
+    Args:
+        elements_end_nodes: Array of element end nodes, shape (elements_count, 2)
+        
+    Returns:
+        np.ndarray: (elements_count, 6) : global DOF indices [3*n0, 3*n0+1, 3*n0+2, 3*n1, 3*n1+1, 3*n1+2] of each element
+    """
+    end_nodes = np.asarray(elements_end_nodes, dtype=int).reshape((-1, 2))
+    return (3 * end_nodes[:, :, np.newaxis] + np.arange(3)).reshape((-1, 6))
+
+
+def compute_coo_indices(elements_end_nodes: np.ndarray) -> tuple:
+    """
+    Compute the (row, column) COO indices of the entries of all local (6,6) matrices in the global matrix.
+    
+    The indices only depend on the topology of the structure. They can be precomputed once and reused 
+    for every assembly, as long as the end nodes of the elements do not change.
     
     Args:
-        local_matrices: List of local matrices, each of shape (6,6)
         elements_end_nodes: Array of element end nodes, shape (elements_count, 2)
-        nodes_count: Number of nodes in the structure
         
     Returns:
-        Global  matrix of shape (3*nodes_count, 3*nodes_count)
+        tuple containing:
+        - rows: (36*elements_count,) : global row index of each local entry
+        - cols: (36*elements_count,) : global column index of each local entry
+    """
+    idx = compute_elements_dof_indices(elements_end_nodes)  # (b, 6)
+    b = idx.shape[0]
+    rows = np.broadcast_to(idx[:, :, np.newaxis], (b, 6, 6)).reshape(-1)
+    cols = np.broadcast_to(idx[:, np.newaxis, :], (b, 6, 6)).reshape(-1)
+    return rows, cols
+
+
+def local_to_global_matrix(local_matrices, elements_end_nodes, nodes_count, sparse: bool = False, coo_indices: tuple = None):
     """
-    # Initialize global  matrix
-    K = np.zeros((3*nodes_count, 3*nodes_count))
+    Convert local matrices to global matrix.
     
+    All local contributions are scattered in one vectorized call, using the COO indices of the local entries.
+    
+    Args:
+        local_matrices: List or array of local matrices, each of shape (6,6)
+        elements_end_nodes: Array of element end nodes, shape (elements_count, 2)
+        nodes_count: Number of nodes in the structure
+        sparse: If True, return a scipy.sparse CSR matrix. If False (default), return a dense np.ndarray (for small models).
+        coo_indices: Optional (rows, cols) precomputed by compute_coo_indices(elements_end_nodes)
+        
+    Returns:
+        Global matrix of shape (3*nodes_count, 3*nodes_count)
+    """
     # Get element count from local_matrices
     elements_count = len(local_matrices)
     
     # Assert that elements_end_nodes has the correct shape
     assert elements_end_nodes.shape == (elements_count, 2), f"elements_end_nodes must have shape ({elements_count}, 2), but has shape {elements_end_nodes.shape}"
     
-    if elements_count == 0 or not local_matrices:
+    if sparse:
+        return local_to_global_sparse_matrix(local_matrices, elements_end_nodes, nodes_count, coo_indices)
+
+    if elements_count == 0:
         return np.array([], dtype=float)
     
     # Assembly of local matrices into global one
-    for i in range(elements_count):
-        n0, n1 = elements_end_nodes[i]
-        k = local_matrices[i]
+    rows, cols = compute_coo_indices(elements_end_nodes) if coo_indices is None else coo_indices
+    data = np.asarray(local_matrices, dtype=float).reshape(-1)
+    K = np.bincount(rows * (3*nodes_count) + cols, weights=data, minlength=(3*nodes_count)**2)
+    return K.reshape((3*nodes_count, 3*nodes_count))
+
+
+def local_to_global_sparse_matrix(local_matrices, elements_end_nodes, nodes_count, coo_indices: tuple = None) -> sp.csr_matrix:
+    """
+    Convert local matrices to a sparse global matrix.
+    
+    Args:
+        local_matrices: List or array of local matrices, each of shape (6,6)
+        elements_end_nodes: Array of element end nodes, shape (elements_count, 2)
+        nodes_count: Number of nodes in the structure
+        coo_indices: Optional (rows, cols) precomputed by compute_coo_indices(elements_end_nodes)
         
-        # Global indices for the 6 DOFs of the element
-        idx = np.array([3*n0, 3*n0+1, 3*n0+2, 3*n1, 3*n1+1, 3*n1+2], dtype=int)
+    Returns:
+        scipy.sparse.csr_matrix: Global matrix of shape (3*nodes_count, 3*nodes_count)
+    """
+    rows, cols = compute_coo_indices(elements_end_nodes) if coo_indices is None else coo_indices
+    data = np.asarray(local_matrices, dtype=float).reshape(-1)
+    assert data.size == rows.size, f"local_matrices must contain {rows.size // 36} matrices of shape (6,6)"
+    
+    # duplicate entries (DOFs shared by several elements) are summed during the conversion to CSR
+    return sp.coo_matrix((data, (rows, cols)), shape=(3*nodes_count, 3*nodes_count)).tocsr()
+
+
+def compute_global_stiffness_diagonal(elements_end_nodes, direction_cosines, flexibility, tension, length, nodes_count) -> np.ndarray:
+    """
+    Compute the diagonal of the global (material + geometric) stiffness matrix without assembling any matrix.
+    
+    The diagonal of the local material stiffness matrix is EA/L * [cx², cy², cz², cx², cy², cz²], and the diagonal of the local
+    geometric stiffness matrix is t/L * [1, 1, 1, 1, 1, 1]. The contributions of all elements are accumulated on their end nodes.
+    
+    Args:
+        elements_end_nodes: [-] - shape (elements_count, 2) - Indices of end nodes
+        direction_cosines: [-] - shape (elements_count, 3) - Direction cosines of each element
+        flexibility: [m/N] - shape (elements_count,) - Element flexibilities L/(EA)
+        tension: [N] - shape (elements_count,) - Tension in each element
+        length: [m] - shape (elements_count,) - Current length of each element
+        nodes_count: Number of nodes in the structure
         
-        # Add local contributions to global matrix
-        for j in range(6):
-            for l in range(6):
-                K[idx[j], idx[l]] += k[j, l]
-                
-    return K
+    Returns:
+        [N/m] - shape (nodes_count, 3) - Diagonal of the global stiffness matrix, for each DOF
+    """
+    elements_count = len(flexibility)
+    assert direction_cosines.shape == (elements_count, 3), f"direction_cosines must have shape ({elements_count}, 3), but has shape {direction_cosines.shape}"
+    
+    # contribution of each element to the 3 DOFs of each end node : shape (elements_count, 3)
+    local_diagonal = direction_cosines**2 / flexibility[:, np.newaxis] + (tension / length)[:, np.newaxis]
+    weights = np.concatenate((local_diagonal, local_diagonal), axis=1)
+    
+    dof_indices = compute_elements_dof_indices(elements_end_nodes)
+    diagonal = np.bincount(dof_indices.reshape(-1), weights=weights.reshape(-1), minlength=3*nodes_count)
+    return diagonal.reshape((nodes_count, 3))
 
+
+def compute_nodal_resisting_forces(elements_end_nodes, direction_cosines, tension, nodes_count) -> np.ndarray:
+    """
+    Compute the resisting forces A @ t without assembling the equilibrium matrix A.
+    
+    Each element contributes -t * cos to the resisting forces of its start node and t * cos to those of its end node, i.e. [-cos, cos] * t,
+    where cos are the direction cosines from the start to the end node (the opposite of the forces the element exerts on its nodes).
+    
+    Args:
+        elements_end_nodes: [-] - shape (elements_count, 2) - Indices of end nodes
+        direction_cosines: [-] - shape (elements_count, 3) - Direction cosines of each element
+        tension: [N] - shape (elements_count,) or (k, elements_count) - Tension in each element, for one or k cases
+        nodes_count: Number of nodes in the structure
+        
+    Returns:
+        [N] - shape (nodes_count, 3) or (k, nodes_count, 3) - Resisting forces at each node
+    """
+    tension = np.asarray(tension, dtype=float)
+    elements_count = tension.shape[-1]
+    assert direction_cosines.shape == (elements_count, 3), f"direction_cosines must have shape ({elements_count}, 3), but has shape {direction_cosines.shape}"
+    
+    forces = direction_cosines * tension[..., np.newaxis]  # shape (elements_count, 3) or (k, elements_count, 3)
+    weights = np.concatenate((-forces, forces), axis=-1)
+    
+    dof_indices = compute_elements_dof_indices(elements_end_nodes)
+    if tension.ndim == 2:
+        # each case k is accumulated in its own range of indices [3*nodes_count*k, 3*nodes_count*(k+1)[
+        k = tension.shape[0]
+        dof_indices = dof_indices[np.newaxis, :, :] + 3 * nodes_count * np.arange(k).reshape((k, 1, 1))
+        resisting_forces = np.bincount(dof_indices.reshape(-1), weights=weights.reshape(-1), minlength=3*nodes_count*k)
+        return resisting_forces.reshape((k, nodes_count, 3))
+    resisting_forces = np.bincount(dof_indices.reshape(-1), weights=weights.reshape(-1), minlength=3*nodes_count)
+    return resisting_forces.reshape((nodes_count, 3))
@@ -0,0 +1,101 @@
+# Muscle
+
+# Copyright <2015-2025> <Université catholique de Louvain (UCLouvain)>
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# List of the contributors to the development of Muscle: see NOTICE file.
+# Description and complete License: see NOTICE file.
+
+import os
+import json
+import tempfile
+import unittest
+import numpy as np
+from musclepy.benchmarks import (warren_truss, arch_truss, space_grid, cable_net, tensegrity_grid, vertical_loads,
+                                 run_benchmarks, benchmark_structure, write_results)
+from musclepy.solvers.dm.linear_dm import main_linear_displacement_method
+from musclepy.solvers.svd.main import main_singular_value_decomposition
+from musclepy.utils.matrix_calculations import compute_nodal_resisting_forces
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_sizes(self):
+        """Test the number of nodes and elements of the generated structures."""
+        structure = warren_truss(5)
+        self.assertEqual((structure.nodes.count, structure.elements.count), (11, 19))
+        structure = arch_truss(6)
+        self.assertEqual((structure.nodes.count, structure.elements.count), (14, 25))
+        structure = space_grid(3, 4)
+        self.assertEqual((structure.nodes.count, structure.elements.count), (4*5 + 3*4, 2*3*4+3+4 + 2*2*3+2+3 + 4*3*4))
+        structure = cable_net(3, 4)
+        self.assertEqual(structure.nodes.count, 4*5)
+        structure = tensegrity_grid(2, 3)
+        self.assertEqual((structure.nodes.count, structure.elements.count), (6*6, 12*6 + 3*(2*6-2-3)))
+
+    def test_warren_truss_is_statically_determinate(self):
+        """Test that the Warren truss has neither self-stress modes nor mechanisms."""
+        svd = main_singular_value_decomposition(warren_truss(4))
+        self.assertEqual((svd.s, svd.m), (0, 0))
+
+    def test_prestressed_structures_are_in_equilibrium(self):
+        """Test that the prestress of the cable net and of the tensegrity grid is self-equilibrated at the free nodes."""
+        for structure in (cable_net(3, 4), tensegrity_grid(2, 2)):
+            elements = structure.elements
+            resisting_forces = compute_nodal_resisting_forces(elements.end_nodes, elements.direction_cosines, elements.tension, structure.nodes.count)
+            np.testing.assert_allclose(resisting_forces[structure.nodes.dof], 0.0, atol=1e-6)
+            # the tension is consistent with the free length
+            np.testing.assert_allclose(elements.elastic_elongation / elements.flexibility, elements.tension, rtol=1e-9, atol=1e-9)
+
+        # the struts of the tensegrity grid are compressed, the cables are tensioned (or unstressed)
+        elements = tensegrity_grid(2, 2).elements
+        self.assertTrue(np.all(elements.tension[elements.type == -1] < 0))
+        self.assertTrue(np.all(elements.tension[elements.type == 1] >= 0))
+
+    def test_linear_dm_on_generated_structures(self):
+        """Test that the linear displacement method can be run on all generated structures (no singular stiffness matrix)."""
+        for structure in (warren_truss(3), arch_truss(3), space_grid(2, 2), cable_net(3, 3), tensegrity_grid(2, 1)):
+            result = main_linear_displacement_method(structure, vertical_loads(structure, -100.0), np.zeros(structure.elements.count))
+            self.assertTrue(result.is_in_equilibrium(rtol=1e-3, atol=1e-3))
+
+    def test_benchmark_structure(self):
+        """Test the records of the benchmark of one structure."""
+        records = benchmark_structure(warren_truss(3), solvers=("linear_dm", "dynamic_relaxation_in_place"), repeat=1)
+        phases = [record["phase"] for record in records if record["solver"] == "linear_dm"]
+        self.assertEqual(phases, ["copy", "assembly", "factorization", "solve", "post_process", "total"])
+        for record in records:
+            self.assertGreater(record["time"], 0.0)
+            self.assertGreater(record["peak_memory"], 0)
+            self.assertEqual(record["nodes_count"], 7)
+        self.assertGreater(records[-1]["info"]["n_time_step"], 0)
+
+        with self.assertRaises(ValueError):
+            benchmark_structure(warren_truss(3), solvers=("unknown",))
+
+    def test_run_benchmarks(self):
+        """Test that the results of the benchmarks are written in JSON format."""
+        results = run_benchmarks(["arch_truss", "cable_net"], sizes=(2, 3), solvers=("svd", "selfstress"), repeat=1, memory=False)
+        self.assertIn("numpy", results["metadata"])
+        self.assertEqual(len(results["results"]), 2 * 2 * 2)
+        self.assertIsNone(results["results"][0]["peak_memory"])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.json")
+            write_results(results, path)
+            with open(path, encoding="utf-8") as file:
+                self.assertEqual(json.load(file), results)
+
+
+if __name__ == '__main__':
+    unittest.main()
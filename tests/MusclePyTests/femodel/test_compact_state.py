@@ -0,0 +1,134 @@
+# Muscle
+
+# Copyright <2015-2025> <Université catholique de Louvain (UCLouvain)>
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# List of the contributors to the development of Muscle: see NOTICE file.
+# Description and complete License: see NOTICE file.
+
+import unittest
+import pickle
+import numpy as np
+from musclepy import femodel
+from musclepy.femodel.compact_state import CompactTrussState
+from musclepy.solvers.dm.linear_dm import main_linear_displacement_method
+
+
+class TestCompactTrussState(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures with a prestressed tight rope with vertical cable.
+        Structure layout:
+                    Node 3 (0,0,1)
+                    |
+                    | (cable 3)
+                    |
+        Node 0----Node 1----Node 2
+       (-2,0,0)   (0,0,0)    (2,0,0)         
+             cable1    cable2
+        """
+        nodes = femodel.PyNodes(
+            initial_coordinates=np.array([[-2.0, 0.0, 0.0], [0.0, 0.0, 0.0], [2.0, 0.0, 0.0], [0.0, 0.0, 1.0]]),
+            dof=np.array([[False, False, False], [True, False, True], [False, False, False], [False, False, False]]),
+            loads=np.array([[0.0, 0.0, 0.0], [0.0, 0.0, -100.0], [0.0, 0.0, 0.0], [0.0, 0.0, 0.0]])
+        )
+        elements = femodel.PyElements(
+            nodes=nodes,
+            type=np.array([1, 1, 1]),
+            end_nodes=np.array([[0, 1], [1, 2], [1, 3]]),
+            area=np.ones(3) * 50.26,  # [mm²]
+            youngs=np.array([[0.0, 70e3], [0.0, 70e3], [0.0, 70e3]]),  # [MPa]
+            tension=np.array([7000.0, 7000.0, 0.0])  # [N]
+        )
+        self.structure = femodel.PyTruss(nodes, elements)
+
+    def assertSameState(self, structure, expected, rtol=0.0):
+        for name in ["initial_coordinates", "dof", "loads", "displacements", "reactions", "resisting_forces"]:
+            np.testing.assert_allclose(getattr(structure.nodes, name), getattr(expected.nodes, name), rtol=rtol, err_msg=name)
+        for name in ["type", "end_nodes", "area", "youngs", "free_length", "tension"]:
+            np.testing.assert_allclose(getattr(structure.elements, name), getattr(expected.elements, name), rtol=rtol, err_msg=name)
+
+    def test_round_trip(self):
+        """Test that a structure packed in a compact state is unpacked identically, as views on the buffer."""
+        state = CompactTrussState.from_structure(self.structure)
+        structure = state.to_structure()
+        self.assertSameState(structure, self.structure)
+        self.assertEqual(structure.elements.end_nodes.dtype, np.int32)
+        for name in CompactTrussState.nodes_arrays:
+            self.assertTrue(np.shares_memory(getattr(structure.nodes, name), state.arrays[name]), name)
+        for name in ["type", "end_nodes", "area", "youngs", "free_length", "tension"]:
+            self.assertTrue(np.shares_memory(getattr(structure.elements, name), state.arrays[name]), name)
+        self.assertIs(structure.copy().nodes.initial_coordinates, structure.nodes.initial_coordinates)
+
+        # in-place modifications of the state are stored in the buffer
+        structure.nodes.displacements[1, 2] = -0.01
+        self.assertEqual(state.arrays["displacements"][1, 2], -0.01)
+
+        # the unpacked structure can be analysed
+        loads = np.zeros(12)
+        loads[5] = -100.0
+        expected = main_linear_displacement_method(self.structure, loads, np.zeros(3))
+        structure = CompactTrussState.from_structure(self.structure).to_structure()
+        result = main_linear_displacement_method(structure, loads, np.zeros(3))
+        np.testing.assert_allclose(result.elements.tension, expected.elements.tension, rtol=1e-12)
+
+    def test_write_through_arrays(self):
+        """Test that writing in the arrays of the compact state modifies the structure, including its cached geometry."""
+        state = CompactTrussState.from_structure(self.structure)
+        structure = state.to_structure()
+        np.testing.assert_allclose(structure.elements.current_length, [2.0, 2.0, 1.0])
+
+        state.arrays["displacements"][1] = [0.0, 0.0, -1.0]
+        np.testing.assert_allclose(structure.nodes.displacements[1], [0.0, 0.0, -1.0])
+        np.testing.assert_allclose(structure.elements.current_length, [np.sqrt(5), np.sqrt(5), 2.0])
+        np.testing.assert_allclose(structure.elements.direction_cosines[2], [0.0, 0.0, 1.0])
+
+        state.arrays["initial_coordinates"][3, 2] = 2.0
+        state.arrays["free_length"][2] = 1.5
+        np.testing.assert_allclose(structure.elements.current_length[2], 3.0)
+        np.testing.assert_allclose(structure.elements.elastic_elongation[2], 1.5)
+
+    def test_copy_and_pickle(self):
+        """Test that the copies and the pickled states are independent of the original state."""
+        state = CompactTrussState.from_structure(self.structure)
+        snapshot = state.copy()
+        self.assertFalse(np.shares_memory(snapshot.buffer, state.buffer))
+        state.arrays["tension"][0] = 0.0
+        self.assertEqual(snapshot.arrays["tension"][0], 7000.0)
+
+        unpickled = pickle.loads(pickle.dumps(snapshot))
+        self.assertEqual(unpickled.nbytes, snapshot.nbytes)
+        self.assertSameState(unpickled.to_structure(), self.structure)
+
+        # a state can wrap an existing buffer, e.g. in shared memory
+        shared = CompactTrussState(4, 3, buffer=snapshot.buffer)
+        self.assertTrue(np.shares_memory(shared.buffer, snapshot.buffer))
+        with self.assertRaises(ValueError):
+            CompactTrussState(5, 3, buffer=snapshot.buffer)
+
+    def test_float32(self):
+        """Test the float32 storage: half the memory of the floats, converted back to float64 for the computations."""
+        state64 = CompactTrussState.from_structure(self.structure, index_dtype=np.int64)
+        state32 = CompactTrussState.from_structure(self.structure, float_dtype=np.float32)
+        self.assertLess(state32.nbytes, 0.6 * state64.nbytes)
+
+        structure = state32.to_structure()
+        self.assertEqual(structure.nodes.loads.dtype, np.float64)
+        self.assertSameState(structure, self.structure, rtol=1e-6)
+
+        with self.assertRaises(ValueError):
+            CompactTrussState(4, 3, float_dtype=np.float16)
+
+
+if __name__ == '__main__':
+    unittest.main()
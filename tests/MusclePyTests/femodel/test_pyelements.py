@@ -19,6 +19,7 @@
 
 import unittest
 import numpy as np
+import scipy.sparse as sp
 from musclepy import femodel
 
 class TestPyElements(unittest.TestCase):
@@ -76,6 +77,14 @@ class TestPyElements(unittest.TestCase):
             [0, -1, 1]    # Element 1: node1 -> node2
         ])
         np.testing.assert_array_equal(self.elements.connectivity, expected_connectivity)
+
+    def test_incidence_matrix(self):
+        """Test that the connectivity matrix is stored in sparse format with 2 entries per element."""
+        C = self.elements.incidence_matrix
+        self.assertTrue(sp.isspmatrix_csr(C))
+        self.assertEqual(C.shape, (2, 3))
+        self.assertEqual(C.nnz, 4)
+        np.testing.assert_array_equal(C.toarray(), self.elements.connectivity)
         
     def test_current_young_tension(self):
         """Test computation of current properties based on tension state."""
@@ -184,6 +193,79 @@ class TestPyElements(unittest.TestCase):
             self.elements.tension + tension_inc
         )
         
+    def test_shared_immutable_arrays(self):
+        """Test that the copies share the immutable arrays and the incidence matrix, and copy the mutable state."""
+        elements_copy = self.elements.copy_and_add(self.nodes.copy(), tension_increment=np.array([1000.0, 1000.0]))
+
+        for name in ["type", "end_nodes", "area", "youngs"]:
+            self.assertIs(getattr(elements_copy, name), getattr(self.elements, name))
+            self.assertFalse(getattr(elements_copy, name).flags.writeable)
+        self.assertIs(elements_copy.incidence_matrix, self.elements.incidence_matrix)
+        self.assertFalse(np.shares_memory(elements_copy.tension, self.elements.tension))
+        self.assertFalse(np.shares_memory(elements_copy.free_length, self.elements.free_length))
+
+        with self.assertRaises(ValueError):
+            elements_copy.area[0] = 1.0
+        # the input arrays of the user remain writeable
+        area = np.array([2500.0, 2500.0])
+        elements = femodel.PyElements(nodes=self.nodes, type=np.array([-1, -1]), end_nodes=np.array([[0, 1], [1, 2]]), area=area)
+        self.assertTrue(area.flags.writeable)
+        # and modifying them later does not change the instances nor their copies
+        snapshot = elements.copy(self.nodes)
+        area[0] = 1.0
+        for e in (elements, snapshot):
+            np.testing.assert_array_equal(e.area, [2500.0, 2500.0])
+        self.assertIs(snapshot.area, elements.area)
+
+    def test_geometry_cache(self):
+        """Test that the state-dependent properties are computed once per state, and recomputed when the state changes."""
+        elements = self.elements
+        computations = elements.geometry_computations_count
+        flexibility = elements.flexibility
+        cosines = elements.direction_cosines
+        np.testing.assert_array_almost_equal(elements.current_length, [np.sqrt(2), np.sqrt(2)])
+        self.assertEqual(elements.geometry_computations_count, computations + 1)
+        self.assertGreaterEqual(elements.geometry_cache_hits, 2)
+        self.assertIs(elements.direction_cosines, cosines)
+        with self.assertRaises(ValueError):
+            flexibility[0] = 0.0  # the cached arrays are read-only
+
+        # in-place modification of the displacements, detected by the elements
+        self.nodes.displacements[1, 2] = 1.0
+        np.testing.assert_array_almost_equal(elements.current_length, [np.sqrt(5), np.sqrt(5)])
+        np.testing.assert_array_almost_equal(elements.direction_cosines[0], [1/np.sqrt(5), 0, 2/np.sqrt(5)])
+        self.assertEqual(elements.geometry_computations_count, computations + 2)
+
+        # in-place modification of the free lengths, detected by the elements
+        elements.free_length[:] = 2.0
+        np.testing.assert_array_almost_equal(elements.elastic_elongation, np.sqrt(5) - 2.0)
+        np.testing.assert_array_equal(elements.young, [5000.0, 5000.0])
+        np.testing.assert_array_almost_equal(elements.flexibility, 2.0 / (5000.0 * 2500.0))
+        self.assertEqual(elements.geometry_computations_count, computations + 3)
+
+    def test_geometry_cache_new_state(self):
+        """Test that the cached properties are recomputed when the nodes, their coordinates or displacements, or the free lengths are replaced."""
+        elements = self.elements
+        np.testing.assert_array_almost_equal(elements.current_length, [np.sqrt(2), np.sqrt(2)])
+        computations = elements.geometry_computations_count
+
+        # new initial coordinates: node 1 moved from z=1 to z=5
+        coordinates = self.nodes.initial_coordinates.copy()
+        coordinates[1, 2] = 5.0
+        self.nodes._initialize(coordinates, self.nodes.dof, None, None, None, None)
+        np.testing.assert_array_almost_equal(elements.current_length, [np.sqrt(26), np.sqrt(26)])
+        self.assertEqual(elements.geometry_computations_count, computations + 1)
+
+        # new nodes instance
+        elements._nodes = self.nodes.copy_and_update(displacements=np.array([[0, 0, 0], [0, 0, -4.0], [0, 0, 0]]))
+        np.testing.assert_array_almost_equal(elements.current_length, [np.sqrt(2), np.sqrt(2)])
+        self.assertEqual(elements.geometry_computations_count, computations + 2)
+
+        # new free lengths, in a copy sharing the nodes
+        updated = elements.copy_and_update(elements.nodes, free_length=np.array([1.0, 1.0]))
+        np.testing.assert_array_almost_equal(updated.elastic_elongation, np.sqrt(2) - 1.0)
+        np.testing.assert_array_almost_equal(elements.elastic_elongation, [0.0, 0.0])
+
     def test_error_handling(self):
         """Test error handling for invalid inputs."""
         # Test wrong shape input
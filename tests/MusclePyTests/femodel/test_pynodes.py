@@ -211,6 +211,43 @@ class TestPyNodes(unittest.TestCase):
                 resisting_forces=np.zeros((3, 3))
             )
 
+    def test_shared_immutable_arrays(self):
+        """Test that the copies share the initial coordinates and dof, and copy the mutable state."""
+        nodes_copy = self.nodes.copy_and_add(displacements_increment=np.ones(9))
+        self.assertIs(nodes_copy.initial_coordinates, self.nodes.initial_coordinates)
+        self.assertIs(nodes_copy.dof, self.nodes.dof)
+        self.assertFalse(np.shares_memory(nodes_copy.loads, self.nodes.loads))
+        np.testing.assert_array_equal(self.nodes.displacements, np.zeros((3, 3)))
+
+        with self.assertRaises(ValueError):
+            nodes_copy.dof[1, 1] = True
+        self.assertTrue(self.dof.flags.writeable)
+
+        # the instances do not alias the input arrays: modifying an input later does not change them
+        coordinates = np.array(self.initial_coordinates, dtype=float)
+        nodes = PyNodes(initial_coordinates=coordinates, dof=self.dof)
+        snapshot = nodes.copy()
+        coordinates[0, 0] = 100.0
+        self.dof[0, 0] = not self.dof[0, 0]
+        for n in (nodes, snapshot):
+            self.assertNotEqual(n.initial_coordinates[0, 0], 100.0)
+            self.assertNotEqual(n.dof[0, 0], self.dof[0, 0])
+        self.assertIs(snapshot.initial_coordinates, nodes.initial_coordinates)
+
+    def test_read_only_input_arrays(self):
+        """Test that read-only input arrays, e.g. views on a larger buffer, are taken over without copy."""
+        buffer = np.zeros(100)
+        coordinates = buffer[10:19].reshape(3, 3)
+        coordinates[:] = self.initial_coordinates
+        coordinates.flags.writeable = False
+        nodes = PyNodes(initial_coordinates=coordinates, dof=self.dof)
+        self.assertTrue(np.shares_memory(nodes.initial_coordinates, buffer))
+        self.assertIs(nodes.copy().initial_coordinates, nodes.initial_coordinates)
+
+        # a writeable view on the same buffer is still copied
+        nodes = PyNodes(initial_coordinates=buffer[10:19].reshape(3, 3), dof=self.dof)
+        self.assertFalse(np.shares_memory(nodes.initial_coordinates, buffer))
+
     def test_check_and_reshape_array(self):
         """Test the _check_and_reshape_array method for various input cases."""
         nodes = PyNodes(initial_coordinates=self.initial_coordinates)
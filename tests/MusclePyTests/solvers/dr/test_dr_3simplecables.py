@@ -164,6 +164,37 @@ class TestDR_3SimpleCables(unittest.TestCase):
         np.testing.assert_allclose(result.nodes.coordinates[3, 2], expected_node3_z, atol=1e-6)
 
 
+    def test_cable_prestressing_sparse(self):
+        """Test that the sparse assembly of the stiffness matrices gives the same results as the dense one."""
+        loads = np.zeros((4, 3))  # 4 nodes * 3 DOFs
+        delta_free_length=np.array([-126.775e-3, 0.0, 0.0])  # Prestress first cable
+
+        dense_config = PyConfigDR(zero_residual_rtol=1e-6, zero_residual_atol=1e-6, max_time_step=100, max_ke_reset=20)
+        sparse_config = PyConfigDR(zero_residual_rtol=1e-6, zero_residual_atol=1e-6, max_time_step=100, max_ke_reset=20, sparse=True)
+        dense = main_dynamic_relaxation(self.structure, loads, delta_free_length, dense_config)
+        sparse = main_dynamic_relaxation(self.structure, loads, delta_free_length, sparse_config)
+
+        self.assertEqual(sparse_config.n_time_step, dense_config.n_time_step)
+        np.testing.assert_allclose(sparse.elements.tension, dense.elements.tension, rtol=1e-9)
+        np.testing.assert_allclose(sparse.nodes.coordinates, dense.nodes.coordinates, rtol=1e-9)
+
+    def test_cable_prestressing_matrix_free(self):
+        """Test that the matrix-free dynamic relaxation gives the same results as the one assembling the global matrices."""
+        loads = np.zeros((4, 3))  # 4 nodes * 3 DOFs
+        delta_free_length=np.array([-126.775e-3, 0.0, 0.0])  # Prestress first cable
+
+        dense_config = PyConfigDR(zero_residual_rtol=1e-6, zero_residual_atol=1e-6, max_time_step=100, max_ke_reset=20)
+        free_config = PyConfigDR(zero_residual_rtol=1e-6, zero_residual_atol=1e-6, max_time_step=100, max_ke_reset=20, matrix_free=True)
+        dense = main_dynamic_relaxation(self.structure, loads, delta_free_length, dense_config)
+        free = main_dynamic_relaxation(self.structure, loads, delta_free_length, free_config)
+
+        self.assertIsNone(free.equilibrium_matrix)
+        self.assertIsNone(free.global_material_stiffness_matrix)
+        self.assertEqual(free_config.n_time_step, dense_config.n_time_step)
+        self.assertEqual(free_config.n_ke_reset, dense_config.n_ke_reset)
+        np.testing.assert_allclose(free.elements.tension, dense.elements.tension, rtol=1e-9)
+        np.testing.assert_allclose(free.nodes.coordinates, dense.nodes.coordinates, rtol=1e-9)
+
 
 if __name__ == '__main__':
     unittest.main()
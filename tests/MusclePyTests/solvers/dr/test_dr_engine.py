@@ -0,0 +1,125 @@
+# Muscle
+
+# Copyright <2015-2025> <Université catholique de Louvain (UCLouvain)>
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# List of the contributors to the development of Muscle: see NOTICE file.
+# Description and complete License: see NOTICE file.
+
+import unittest
+import tracemalloc
+import numpy as np
+from musclepy.benchmarks import cable_net
+from musclepy.solvers.dr.main import main_dynamic_relaxation
+from musclepy.solvers.dr.dr_engine import DynamicRelaxationEngine, main_dynamic_relaxation_inplace
+from musclepy.solvers.dr.py_truss_dr import PyTrussDR
+from musclepy.solvers.dr.py_config_dr import PyConfigDR
+from MusclePyTests.solvers.dr import test_dr_simplex
+
+
+class TestDR_Engine(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures with the simplex tensegrity structure of TestDR_Simplex, 
+        loaded by gravity and prestressed by the shortening of one cable."""
+        fixture = test_dr_simplex.TestDR_Simplex()
+        fixture.setUp()
+        self.structure = fixture.structure
+
+        self.loads = np.zeros((6, 3))
+        self.loads[0:3, 2] = 45.7  # N, vertical load on bottom nodes
+        self.loads[3:6, 2] = 41.6  # N, vertical load on top nodes
+
+        self.delta_free_length = np.zeros(12)  # m
+        self.delta_free_length[0:3] = 0.835e-3  # Struts
+        self.delta_free_length[8] = -35e-3  # Shortening of cable 5 (index 8)
+
+    def _config(self, **kwargs):
+        return PyConfigDR(zero_residual_rtol=1e-4, zero_residual_atol=1e-6, max_time_step=1000, max_ke_reset=100, **kwargs)
+
+    def test_in_place_equals_copies(self):
+        """Test that the in-place time loop gives the same results as the time loop copying the structure at each time step."""
+        reference_config = self._config()
+        reference = main_dynamic_relaxation(self.structure, self.loads, self.delta_free_length, reference_config)
+
+        config = self._config()
+        result = main_dynamic_relaxation_inplace(self.structure, self.loads, self.delta_free_length, config)
+
+        self.assertIsInstance(result, PyTrussDR)
+        self.assertEqual(config.n_time_step, reference_config.n_time_step)
+        self.assertEqual(config.n_ke_reset, reference_config.n_ke_reset)
+        self.assertTrue(result.is_in_equilibrium(config.zero_residual_rtol, config.zero_residual_atol))
+        np.testing.assert_allclose(result.elements.tension, reference.elements.tension, rtol=1e-8)
+        np.testing.assert_allclose(result.nodes.coordinates, reference.nodes.coordinates, rtol=1e-8, atol=1e-12)
+        np.testing.assert_allclose(result.nodes.reactions, reference.nodes.reactions, rtol=1e-8, atol=1e-6)
+        np.testing.assert_allclose(result.nodes.velocities, reference.nodes.velocities, rtol=1e-8, atol=1e-12)
+        self.assertAlmostEqual(result.kinetic_energy, reference.kinetic_energy)
+
+        # the in-place engine is selected by the config, e.g. from C#
+        config = self._config(in_place=True)
+        result = main_dynamic_relaxation(self.structure, self.loads, self.delta_free_length, config)
+        self.assertEqual(config.n_time_step, reference_config.n_time_step)
+        np.testing.assert_allclose(result.elements.tension, reference.elements.tension, rtol=1e-8)
+
+    def test_snapshots(self):
+        """Test the materialization of the state at snapshot points, without modification of the engine buffers."""
+        config = self._config()
+        engine = DynamicRelaxationEngine(self.structure, self.loads, self.delta_free_length, config)
+        result = engine.run(snapshot_every=50)
+
+        self.assertEqual(len(engine.snapshots), config.n_time_step // 50)
+        for snapshot in engine.snapshots:
+            self.assertIsInstance(snapshot, PyTrussDR)
+        self.assertFalse(engine.snapshots[0].is_in_equilibrium(config.zero_residual_rtol, config.zero_residual_atol))
+
+        # the snapshots own their data
+        np.testing.assert_array_equal(result.nodes.displacements, engine.displacements)
+        self.assertFalse(np.shares_memory(result.nodes.displacements, engine.displacements))
+        self.assertFalse(np.shares_memory(result.elements.tension, engine.tension))
+        with self.assertRaises(ValueError):
+            engine.displacements[0, 0] = 1.0  # read-only view on the engine buffers
+
+    def test_step(self):
+        """Test that the time steps can be performed one by one."""
+        config = self._config()
+        engine = DynamicRelaxationEngine(self.structure, self.loads, self.delta_free_length, config)
+        self.assertFalse(engine.is_in_equilibrium())
+        self.assertEqual(engine.kinetic_energy, 0.0)
+
+        engine.step()
+        self.assertEqual(config.n_time_step, 1)
+        self.assertGreater(engine.kinetic_energy, 0.0)
+        np.testing.assert_array_equal(engine.displacements[~self.structure.nodes.dof], 0.0)
+
+    def test_step_does_not_allocate_state_arrays(self):
+        """Test that the time steps reuse the preallocated buffers: the transient memory does not grow with the size of the structure."""
+        structure = cable_net(80, 80)
+        loads = np.zeros((structure.nodes.count, 3))
+        loads[:, 2] = -100.0
+        engine = DynamicRelaxationEngine(structure, loads, None, PyConfigDR(max_time_step=100))
+        engine.step()
+
+        tracemalloc.start()
+        try:
+            for _ in range(5):
+                engine.step()
+                engine.is_in_equilibrium()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        # only the fixed-size buffers of the numpy iterators (8192 values), much less than one array of the nodes' DOFs
+        self.assertLess(peak, 3 * structure.nodes.count * 8 / 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -19,7 +19,9 @@
 
 import unittest
 import numpy as np
-from musclepy.solvers.dm.linear_dm import main_linear_displacement_method
+import scipy.sparse as sp
+from musclepy.solvers.dm.linear_dm import main_linear_displacement_method, StiffnessFactorization, assemble_tangent_stiffness_matrix
+from musclepy.benchmarks import cable_net
 from musclepy.femodel.pytruss import PyTruss
 from musclepy.femodel.pynodes import PyNodes
 from musclepy.femodel.pyelements import PyElements
@@ -116,6 +118,103 @@ class TestLinearDM_2BarsTruss(unittest.TestCase):
 
         self.assertEqual(result.is_in_equilibrium(), True)
 
+    def test_vertical_load_sparse(self):
+        """Test that the sparse solver gives the same results as the dense solver."""
+        loads = np.zeros(9)  # 3 nodes * 3 DOFs
+        loads[5] = -100000.0  # Node 1, Z direction
+        free_length_variation = np.zeros(self.structure.elements.count)
+        
+        dense = main_linear_displacement_method(self.structure, loads, free_length_variation)
+        sparse = main_linear_displacement_method(self.structure, loads, free_length_variation, sparse=True)
+
+        np.testing.assert_allclose(sparse.nodes.displacements, dense.nodes.displacements, rtol=1e-9, atol=1e-12)
+        np.testing.assert_allclose(sparse.elements.tension, dense.elements.tension, rtol=1e-9)
+        np.testing.assert_allclose(sparse.nodes.reactions, dense.nodes.reactions, rtol=1e-9, atol=1e-6)
+        np.testing.assert_allclose(sparse.nodes.resisting_forces, dense.nodes.resisting_forces, rtol=1e-9, atol=1e-6)
+
+    def test_vertical_load_partition_solver(self):
+        """Test that eliminating the fixed DOFs gives the same results as the Lagrange multipliers, with dense and sparse matrices."""
+        loads = np.zeros(9)  # 3 nodes * 3 DOFs
+        loads[5] = -100000.0  # Node 1, Z direction
+        free_length_variation = np.zeros(self.structure.elements.count)
+        
+        lagrange = main_linear_displacement_method(self.structure, loads, free_length_variation)
+        for sparse in (False, True):
+            partition = main_linear_displacement_method(self.structure, loads, free_length_variation, sparse=sparse, solver="partition")
+            
+            np.testing.assert_allclose(partition.nodes.displacements, lagrange.nodes.displacements, rtol=1e-9, atol=1e-12)
+            np.testing.assert_allclose(partition.elements.tension, lagrange.elements.tension, rtol=1e-9)
+            np.testing.assert_allclose(partition.nodes.reactions, lagrange.nodes.reactions, rtol=1e-9, atol=1e-6)
+            self.assertTrue(partition.is_in_equilibrium())
+
+    def test_singular_stiffness_factorization(self):
+        """Test that a singular stiffness matrix raises a LinAlgError with all solvers."""
+        K = np.zeros((9, 9))  # no stiffness at all
+        for solver in StiffnessFactorization.solvers:
+            for matrix in (K, sp.csr_matrix(K)):
+                with self.assertRaises(np.linalg.LinAlgError):
+                    StiffnessFactorization(matrix, self.nodes.dof, solver)
+        with self.assertRaises(ValueError):
+            StiffnessFactorization(K, self.nodes.dof, "unknown")
+
+    def test_near_singular_stiffness_factorization(self):
+        """Test that the near-singular stiffness matrices are detected from the condition number, and solved deterministically."""
+        K = np.diag([1e6, 1e6, 1e6, 2e6, 1e6, 1e-9, 1e6, 1e6, 1e6])  # the 2 free DOFs of node 1 are x and z: z is (almost) a mechanism
+        loads = np.zeros(9)
+        loads[[3, 5]] = [2000.0, 1.0]
+        for matrix in (K, sp.csr_matrix(K)):
+            regular = StiffnessFactorization(matrix, self.nodes.dof, "partition", "regularize", rcond=1e-20)
+            self.assertEqual(regular.mechanisms_count, 0)
+            self.assertLess(regular.rcond, 1e-12)
+
+            regularized = StiffnessFactorization(matrix, self.nodes.dof, "lagrange", "regularize", regularization=1e-3)
+            self.assertEqual(regularized.solver, "partition")
+            self.assertEqual(regularized.mechanisms_count, 1)
+            displacements, reactions = regularized.solve(loads)
+            np.testing.assert_allclose(displacements[[3, 5]], [1e-3, 1.0 / (1e-9 + 2e3)])
+            self.assertEqual(reactions.shape, (7,))
+
+            pseudo_inverse = StiffnessFactorization(matrix, self.nodes.dof, "partition", "pseudo_inverse")
+            displacements, _ = pseudo_inverse.solve(np.column_stack((loads, 2 * loads)))
+            np.testing.assert_allclose(displacements[[3, 5]], [[1e-3, 2e-3], [0.0, 0.0]])
+
+            # no stiffness at all
+            zero = StiffnessFactorization(matrix * 0, self.nodes.dof, "partition", "pseudo_inverse")
+            self.assertEqual(zero.mechanisms_count, 2)
+            np.testing.assert_allclose(zero.solve(loads)[0], 0.0)
+
+        with self.assertRaises(ValueError):
+            StiffnessFactorization(K, self.nodes.dof, "partition", "ignore")
+
+    def test_mechanisms_of_large_stiffness_matrix(self):
+        """Test that the few mechanisms of a large stiffness matrix are found by the sparse eigensolver, consistently with a dense eigendecomposition."""
+        structure = cable_net(8, 8)
+        node = 4 * 9 + 4  # central node, released by removing the prestress of its 4 cables: its z DOF is a mechanism
+        tension = structure.elements.tension.copy()
+        tension[np.any(structure.elements.end_nodes == node, axis=1)] = 0.0
+        structure = PyTruss(structure.nodes, structure.elements.copy_and_update(structure.nodes, tension=tension))
+        K, _, _ = assemble_tangent_stiffness_matrix(structure, sparse=True)
+        loads = np.zeros(K.shape[0])
+        loads[[3 * node + 2, 3 * node + 5]] = [1.0, -100.0]
+
+        # reference: pseudo-inverse of K_ff by its dense eigendecomposition
+        free = np.flatnonzero(structure.nodes.dof.reshape(-1))
+        eigenvalues, modes = np.linalg.eigh(K.toarray()[np.ix_(free, free)])
+        mechanisms = np.abs(eigenvalues) <= 1e-12 * np.abs(eigenvalues).max()
+        self.assertEqual(np.count_nonzero(mechanisms), 1)
+        expected = modes[:, ~mechanisms] @ ((modes[:, ~mechanisms].T @ loads[free]) / eigenvalues[~mechanisms])
+
+        for matrix in (K, K.toarray()):
+            pseudo_inverse = StiffnessFactorization(matrix, structure.nodes.dof, "partition", "pseudo_inverse")
+            self.assertEqual(pseudo_inverse.mechanisms_count, 1)
+            displacements, _ = pseudo_inverse.solve(loads)
+            np.testing.assert_allclose(displacements[free], expected, atol=1e-12 * np.abs(expected).max())
+            self.assertAlmostEqual(displacements[3 * node + 2], 0.0)
+
+            regularized = StiffnessFactorization(matrix, structure.nodes.dof, "partition", "regularize")
+            displacements, _ = regularized.solve(loads)
+            np.testing.assert_allclose(displacements[3 * node + 2], 1.0 / (1e-6 * np.abs(eigenvalues).max()), rtol=1e-3)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -19,7 +19,8 @@
 
 import unittest
 import numpy as np
-from musclepy.solvers.dm.linear_dm import main_linear_displacement_method
+from musclepy.solvers.dm.linear_dm import main_linear_displacement_method, _post_process
+from musclepy.utils.matrix_calculations import compute_local_material_stiffness_matrices, compute_local_geometric_stiffness_matrices
 from musclepy.femodel.pytruss import PyTruss
 from musclepy.femodel.pynodes import PyNodes
 from musclepy.femodel.pyelements import PyElements
@@ -113,6 +114,23 @@ class TestLinearDM_3PrestressedCables(unittest.TestCase):
         self.assertLess(node1_force[0], 0)     # loads points left at middle node
         self.assertAlmostEqual(abs(node0_force[0]), prestress[0], places=3)  # Force magnitude matches prestress
 
+    def test_prestress_batch(self):
+        """Test the equivalent tension and loads of several prestress scenarios computed at once."""
+        free_length_variations = np.array([
+            self.free_length_variation,
+            [0.0, 0.0, 0.0],
+            [0.002, -0.003, 0.001],
+            [0.0, 0.0, 0.005]  # lengthening of the cable: compression with a zero Young's modulus
+        ])
+        tension, loads = PrestressScenario.compute_batch(self.elements, free_length_variations)
+        self.assertEqual(tension.shape, (4, 3))
+        self.assertEqual(loads.shape, (4, 4, 3))
+
+        for i, free_length_variation in enumerate(free_length_variations):
+            scenario = PrestressScenario(self.elements, free_length_variation)
+            np.testing.assert_allclose(tension[i], scenario.equivalent_tension)
+            np.testing.assert_allclose(loads[i], scenario.equivalent_loads, atol=1e-10)
+
     def test_prestress(self):
         """Test prestress through free length changes in cable structure."""
 
@@ -173,6 +191,34 @@ class TestLinearDM_3PrestressedCables(unittest.TestCase):
         stiffness = 1/result.elements.flexibility[2]
         self.assertAlmostEqual(result.elements.young[2], 0, places=5) #the stiffness in compression
 
+    def test_post_process(self):
+        """Test the vectorized post-processing of several displacement vectors against an element by element computation."""
+        elements = self.structure.elements.copy_and_add(self.nodes, tension_increment=np.array([1000.0, 1000.0, 500.0]))
+        cosines = elements.direction_cosines
+        km = compute_local_material_stiffness_matrices(cosines, elements.flexibility)
+        kg = compute_local_geometric_stiffness_matrices(elements.tension, elements.current_length)
+        displacements = np.random.default_rng(0).normal(0, 1e-3, size=(12, 2))
+
+        tension, resisting_forces = _post_process(displacements, km, kg, elements.end_nodes, cosines)
+        self.assertEqual(tension.shape, (3, 2))
+        self.assertEqual(resisting_forces.shape, (12, 2))
+
+        for j in range(2):
+            expected_tension = np.zeros(3)
+            expected_resisting_forces = np.zeros(12)
+            for i, (n0, n1) in enumerate(elements.end_nodes):
+                index = np.array([3*n0, 3*n0+1, 3*n0+2, 3*n1, 3*n1+1, 3*n1+2])
+                f_local = (km[i] + kg[i]) @ displacements[index, j]
+                expected_resisting_forces[index] += f_local
+                expected_tension[i] = -f_local[:3] @ cosines[i]
+            np.testing.assert_allclose(tension[:, j], expected_tension, rtol=1e-12)
+            np.testing.assert_allclose(resisting_forces[:, j], expected_resisting_forces, rtol=1e-12, atol=1e-9)
+
+            # one displacement vector
+            t, f = _post_process(displacements[:, j], km, kg, elements.end_nodes, cosines)
+            np.testing.assert_allclose(t, tension[:, j])
+            np.testing.assert_allclose(f, resisting_forces[:, j])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,136 @@
+# Muscle
+
+# Copyright <2015-2025> <Université catholique de Louvain (UCLouvain)>
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# List of the contributors to the development of Muscle: see NOTICE file.
+# Description and complete License: see NOTICE file.
+
+import unittest
+import numpy as np
+from musclepy.solvers.dm.linear_dm import main_linear_displacement_method
+from musclepy.solvers.dm.linear_dm_session import LinearDMSession
+from musclepy.solvers.dm.linear_dm_batch import main_linear_displacement_method_batch
+from musclepy.femodel.pytruss import PyTruss
+from musclepy.femodel.pynodes import PyNodes
+from musclepy.femodel.pyelements import PyElements
+
+
+class TestLinearDM_Batch(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures with a simple 2-bar structure.
+
+        Node 1 (1,0,1)
+           /\
+          /  \
+         /    \
+        Node 0  Node 2
+        (0,0,0) (2,0,0)
+        """
+        self.nodes = PyNodes(
+            initial_coordinates=np.array([
+                [0.0, 0.0, 0.0],  # Node 0: origin
+                [1.0, 0.0, 1.0],  # Node 1: top
+                [2.0, 0.0, 0.0]   # Node 2: right
+            ]),
+            dof=np.array([
+                [False, False, False],  # Node 0: fixed
+                [True, False, True],    # Node 1: free in x,z
+                [False, False, False]   # Node 2: fixed
+            ])
+        )
+        self.elements = PyElements(
+            nodes=self.nodes,
+            type=np.array([-1, -1]),  # Two struts
+            end_nodes=np.array([[0, 1], [1, 2]]),
+            area=np.array([2500.0, 2500.0]),  # [mm²]
+            youngs=np.array([[10000.0, 10000.0], [10000.0, 10000.0]]),  # [MPa]
+        )
+        self.structure = PyTruss(self.nodes, self.elements)
+
+        # 4 load cases: vertical load, horizontal load, combination, and no load
+        self.loads = np.zeros((4, 3, 3))
+        self.loads[0, 1, 2] = -100000.0
+        self.loads[1, 1, 0] = 50000.0
+        self.loads[2, 1] = [50000.0, 0.0, -100000.0]
+
+    def test_load_cases(self):
+        """Test that each load case gives the same results as main_linear_displacement_method."""
+        results = main_linear_displacement_method_batch(self.structure, self.loads)
+
+        self.assertEqual(results.count, 4)
+        self.assertEqual(results.displacements.shape, (4, 3, 3))
+        self.assertEqual(results.reactions.shape, (4, 3, 3))
+        self.assertEqual(results.tension.shape, (4, 2))
+
+        for i in range(4):
+            expected = main_linear_displacement_method(self.structure, self.loads[i], np.zeros(2))
+            np.testing.assert_allclose(results.displacements[i], expected.nodes.displacements, rtol=1e-9, atol=1e-12)
+            np.testing.assert_allclose(results.reactions[i], expected.nodes.reactions, rtol=1e-9, atol=1e-6)
+            np.testing.assert_allclose(results.resisting_forces[i], expected.nodes.resisting_forces, rtol=1e-9, atol=1e-6)
+            np.testing.assert_allclose(results.tension[i], expected.elements.tension, rtol=1e-9, atol=1e-6)
+
+    def test_envelopes(self):
+        """Test the envelopes of the axial forces and displacements."""
+        results = main_linear_displacement_method_batch(self.structure, self.loads)
+
+        np.testing.assert_allclose(results.tension_min, results.tension.min(axis=0))
+        np.testing.assert_allclose(results.tension_max, results.tension.max(axis=0))
+        self.assertTrue(np.all(results.tension_min <= 1e-6))  # load case 3 (no load) bounds the envelope
+        self.assertTrue(np.all(results.tension_max >= -1e-6))
+
+        # Only node 1 moves, load case 2 (combination) gives the largest displacement
+        np.testing.assert_allclose(results.displacement_max[[0, 2]], [0.0, 0.0], atol=1e-12)
+        self.assertEqual(results.displacement_max_case[1], 2)
+        self.assertAlmostEqual(results.displacement_max[1], np.linalg.norm(results.displacements[2, 1]))
+
+    def test_prestress_and_session_reuse(self):
+        """Test load cases with free length variations, solved with a session shared across calls."""
+        session = LinearDMSession(self.structure)
+        free_length_variations = np.zeros((4, 2))
+        free_length_variations[3] = [-0.001, -0.001]  # shorten both struts
+
+        main_linear_displacement_method_batch(self.structure, self.loads, session=session)
+        results = main_linear_displacement_method_batch(self.structure, self.loads, free_length_variations, session=session)
+        self.assertEqual(session.factorizations_count, 1)
+
+        expected = main_linear_displacement_method(self.structure, self.loads[3], free_length_variations[3])
+        np.testing.assert_allclose(results.tension[3], expected.elements.tension, rtol=1e-3)
+        np.testing.assert_allclose(results.displacements[3], expected.nodes.displacements, rtol=1e-3, atol=1e-9)
+
+    def test_singular_options(self):
+        """Test that the singular and seed options are passed to the session, as in main_linear_displacement_method."""
+        nodes = PyNodes(initial_coordinates=self.nodes.initial_coordinates,
+                        dof=np.array([[False, False, False], [True, True, True], [False, False, False]]))  # node 1 is a mechanism in y
+        elements = PyElements(nodes=nodes, type=self.elements.type, end_nodes=self.elements.end_nodes, area=self.elements.area, youngs=self.elements.youngs)
+        structure = PyTruss(nodes, elements)
+
+        for singular in ("pseudo_inverse", "regularize"):
+            results = main_linear_displacement_method_batch(structure, self.loads[:3], singular=singular)
+            for i in range(3):
+                expected = main_linear_displacement_method(structure, self.loads[i], np.zeros(2), singular=singular)
+                np.testing.assert_allclose(results.tension[i], expected.elements.tension, rtol=1e-9, err_msg=singular)
+                np.testing.assert_allclose(results.displacements[i], expected.nodes.displacements, rtol=1e-9, atol=1e-12, err_msg=singular)
+
+        # the random perturbation of the mechanism is reproducible with a seed
+        first = main_linear_displacement_method_batch(structure, self.loads[:3], singular="perturb", seed=42)
+        second = main_linear_displacement_method_batch(structure, self.loads[:3], singular="perturb", seed=42)
+        np.testing.assert_array_equal(first.tension, second.tension)
+
+        with self.assertRaises(ValueError):
+            main_linear_displacement_method_batch(structure, self.loads, singular="ignore")
+
+
+if __name__ == '__main__':
+    unittest.main()
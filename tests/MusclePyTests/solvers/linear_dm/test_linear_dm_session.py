@@ -0,0 +1,201 @@
+# Muscle
+
+# Copyright <2015-2025> <Université catholique de Louvain (UCLouvain)>
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# List of the contributors to the development of Muscle: see NOTICE file.
+# Description and complete License: see NOTICE file.
+
+import unittest
+import numpy as np
+from musclepy.solvers.dm.linear_dm import main_linear_displacement_method
+from musclepy.solvers.dm.linear_dm_session import LinearDMSession
+from musclepy.femodel.pytruss import PyTruss
+from musclepy.femodel.pynodes import PyNodes
+from musclepy.femodel.pyelements import PyElements
+
+
+class TestLinearDM_Session(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures with a tight rope structure with vertical cable, prestressed in an initial state.
+        Structure layout:
+                    Node 3 (0,0,1)
+                    |
+                    | (cable 3)
+                    |
+        Node 0----Node 1----Node 2
+       (-2,0,0)   (0,0,0)    (2,0,0)         
+             cable1    cable2
+        """
+        self.nodes = PyNodes(
+            initial_coordinates=np.array([
+                [-2.0, 0.0, 0.0],  # Node 0: left support
+                [0.0, 0.0, 0.0],   # Node 1: middle point
+                [2.0, 0.0, 0.0],   # Node 2: right support
+                [0.0, 0.0, 1.0]    # Node 3: top point
+            ]),
+            dof=np.array([
+                [False, False, False],  # Node 0: fixed
+                [True, False, True],    # Node 1: free in x,z
+                [False, False, False],  # Node 2: fixed
+                [False, False, False]   # Node 3: fixed
+            ])
+        )
+        self.elements = PyElements(
+            nodes=self.nodes,
+            type=np.array([1, 1, 1]),
+            end_nodes=np.array([[0, 1], [1, 2], [1, 3]]),
+            area=np.ones(3) * 50.26,  # [mm²]
+            youngs=np.ones((3, 2)) * 70e3,  # [MPa]
+            tension=np.array([7000.0, 7000.0, 0.0])  # [N] initial prestress
+        )
+        self.structure = PyTruss(self.nodes, self.elements)
+
+        # 3 load cases on node 1: horizontal, vertical, and both
+        self.load_cases = np.zeros((3, 12))
+        self.load_cases[0, 3] = 1000.0
+        self.load_cases[1, 5] = -1000.0
+        self.load_cases[2, [3, 5]] = [500.0, -2000.0]
+
+    def test_run_matches_linear_dm(self):
+        """Test that the session gives the same results as main_linear_displacement_method, with one factorization only."""
+        session = LinearDMSession(self.structure)
+        free_length_variation = np.zeros(3)
+
+        for loads in self.load_cases:
+            expected = main_linear_displacement_method(self.structure, loads, free_length_variation)
+            result = session.run(loads, free_length_variation)
+
+            np.testing.assert_allclose(result.nodes.displacements, expected.nodes.displacements, rtol=1e-9, atol=1e-12)
+            np.testing.assert_allclose(result.nodes.reactions, expected.nodes.reactions, rtol=1e-9, atol=1e-6)
+            np.testing.assert_allclose(result.nodes.resisting_forces, expected.nodes.resisting_forces, rtol=1e-9, atol=1e-6)
+            np.testing.assert_allclose(result.elements.tension, expected.elements.tension, rtol=1e-9)
+
+        self.assertEqual(session.factorizations_count, 1)
+
+    def test_run_with_prestress(self):
+        """Test that free length variations give the same results as main_linear_displacement_method, with the stiffness of the modified structure."""
+        session = LinearDMSession(self.structure, sparse=True, solver="partition")
+        free_length_variation = np.array([-0.007984, 0.0, 0.0])
+
+        expected = main_linear_displacement_method(self.structure, np.zeros(12), free_length_variation, sparse=True, solver="partition")
+        result = session.run(np.zeros(12), free_length_variation)
+
+        np.testing.assert_allclose(result.elements.free_length, expected.elements.free_length)
+        np.testing.assert_allclose(result.elements.tension, expected.elements.tension, rtol=1e-9)
+        np.testing.assert_allclose(result.nodes.displacements, expected.nodes.displacements, rtol=1e-9, atol=1e-12)
+        np.testing.assert_allclose(result.nodes.reactions, expected.nodes.reactions, rtol=1e-9, atol=1e-6)
+        self.assertEqual(session.factorizations_count, 1)
+
+        # the factorization of the modified structure is reused for the same variation, and the one of the structure is kept
+        session.run(self.load_cases[0], free_length_variation)
+        session.run(self.load_cases[0], np.zeros(3))
+        self.assertEqual(session.factorizations_count, 2)
+        session.run(self.load_cases[1], np.zeros(3))
+        self.assertEqual(session.factorizations_count, 2)
+
+    def test_batched_solve(self):
+        """Test that several load cases can be solved in one call."""
+        session = LinearDMSession(self.structure)
+        displacements, reactions, resisting_forces, tension = session.solve(self.load_cases)
+
+        self.assertEqual(displacements.shape, (3, 12))
+        self.assertEqual(reactions.shape, (3, 10))  # 10 fixed DOFs
+        self.assertEqual(resisting_forces.shape, (3, 12))
+        self.assertEqual(tension.shape, (3, 3))
+
+        for i, loads in enumerate(self.load_cases):
+            d, r, f, t = session.solve(loads)
+            np.testing.assert_allclose(displacements[i], d, rtol=1e-12, atol=1e-15)
+            np.testing.assert_allclose(reactions[i], r, rtol=1e-12, atol=1e-9)
+            np.testing.assert_allclose(tension[i], t, rtol=1e-12)
+        self.assertEqual(session.factorizations_count, 1)
+
+    def test_automatic_invalidation(self):
+        """Test that the factorization is recomputed when the state of the structure changes."""
+        session = LinearDMSession(self.structure)
+        session.solve(self.load_cases[0])
+        self.assertTrue(session.is_factorized)
+
+        # a new structure with the same state reuses the factorization
+        session.structure = self.structure.copy()
+        session.solve(self.load_cases[0])
+        self.assertEqual(session.factorizations_count, 1)
+
+        # a new state requires a new factorization
+        session.structure = self.structure.copy_and_add(tension_increment=np.array([1000.0, 1000.0, 0.0]))
+        self.assertFalse(session.is_factorized)
+        _, _, _, t = session.solve(self.load_cases[1])
+        self.assertEqual(session.factorizations_count, 2)
+        expected = main_linear_displacement_method(session.structure, self.load_cases[1], np.zeros(3))
+        np.testing.assert_allclose(session.structure.elements.tension + t, expected.elements.tension, rtol=1e-9)
+
+        # in-place modifications of the state are also detected
+        session.structure.nodes.displacements[1, 2] = -0.01
+        self.assertFalse(session.is_factorized)
+        session.solve(self.load_cases[1])
+        self.assertEqual(session.factorizations_count, 3)
+
+    def test_prestress_influence_matrix(self):
+        """Test that the prestress influence matrix superposes the unit free length variations of the actuated elements."""
+        from musclepy.solvers.dm.prestress_influence import compute_prestress_influence_matrix
+        session = LinearDMSession(self.structure)
+        influence = compute_prestress_influence_matrix(self.structure, session=session)
+        self.assertEqual(influence.tension.shape, (3, 3))
+        self.assertEqual(influence.displacements.shape, (12, 3))
+        self.assertEqual(influence.reactions.shape, (10, 3))
+
+        # small actuations: equal to the linear displacement method to first order
+        actuations = np.array([[-1e-4, 0.0, 0.0], [0.0, 0.0, -2e-4], [-1e-4, 5e-5, -2e-4]])
+        tension, displacements = influence.query(actuations)
+        self.assertEqual(tension.shape, (3, 3))
+        self.assertEqual(displacements.shape, (3, 4, 3))
+        for i, free_length_variation in enumerate(actuations):
+            expected = main_linear_displacement_method(self.structure, np.zeros(12), free_length_variation)
+            np.testing.assert_allclose(self.structure.elements.tension + tension[i], expected.elements.tension, rtol=1e-3)
+            np.testing.assert_allclose(displacements[i], expected.nodes.displacements, rtol=1e-3, atol=1e-9)
+
+        # the influence matrices are cached on the state of the structure: a subset of the elements requires no new solve
+        subset = session.prestress_influence_matrix([2, 0])
+        self.assertIs(session.prestress_influence_matrix([2, 0]), subset)
+        np.testing.assert_allclose(subset.tension, influence.tension[:, [2, 0]])
+        t, d = subset.query(np.array([-2e-4, -1e-4]))
+        np.testing.assert_allclose(t, tension[0] + tension[1])
+        self.assertEqual(session.factorizations_count, 1)
+
+        # a new state of the structure computes a new influence matrix
+        session.structure = self.structure.copy_and_add(tension_increment=np.array([1000.0, 1000.0, 0.0]))
+        self.assertIsNot(session.prestress_influence_matrix([2, 0]), subset)
+        self.assertEqual(session.factorizations_count, 2)
+
+        # a solve on a modified structure refactorizes first: the influence matrices of the previous state are not reused
+        session.structure = self.structure.copy_and_add(tension_increment=np.array([5000.0, 5000.0, 0.0]))
+        session.solve(self.load_cases[0])
+        stale = subset
+        subset = session.prestress_influence_matrix([2, 0])
+        self.assertIsNot(subset, stale)
+        expected = compute_prestress_influence_matrix(session.structure, [2, 0])
+        np.testing.assert_allclose(subset.tension, expected.tension, rtol=1e-9)
+        np.testing.assert_allclose(subset.displacements, expected.displacements, rtol=1e-9, atol=1e-15)
+
+        with self.assertRaises(ValueError):
+            influence.query(np.zeros(2))
+        with self.assertRaises(ValueError):
+            subset.select([1])
+        with self.assertRaises(ValueError):
+            session.prestress_influence_matrix([3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -19,7 +19,8 @@
 
 import unittest
 import numpy as np
-from musclepy.solvers.dm.nonlinear_dm import main_nonlinear_displacement_method
+from musclepy.solvers.dm.nonlinear_dm import main_nonlinear_displacement_method, iterate_nonlinear_displacement_method
+from musclepy.solvers.dm.py_config_dm import PyConfigDM
 from musclepy.femodel.pytruss import PyTruss
 from musclepy.femodel.pynodes import PyNodes
 from musclepy.femodel.pyelements import PyElements
@@ -108,6 +109,52 @@ class TestNonlinearDM_2BarsTruss(unittest.TestCase):
 
         # self.assertEqual(result.is_in_equilibrium, True) # is_in_equilibrium will most probably be false, since the incremental newton_raphson procedure is not iterative, it will not ensure that the residual loads are null.
 
+    def test_iterate_steps(self):
+        """Test that the records yielded step by step follow the same path as main_nonlinear_displacement_method, and that the procedure can be stopped early."""
+        loads = np.zeros(9)  # 3 nodes * 3 DOFs
+        loads[5] = -100000.0  # Node 1, Z direction
+
+        expected_config = PyConfigDM(newton="full")
+        expected = main_nonlinear_displacement_method(self.structure, loads, n_steps=5, config=expected_config)
+
+        config = PyConfigDM(newton="full", record_path=False)
+        steps = iterate_nonlinear_displacement_method(self.structure, loads, n_steps=5, config=config)
+        records = []
+        try:
+            while True:
+                records.append(next(steps))
+        except StopIteration as stop:
+            result = stop.value  # the final state is returned by the generator
+        self.assertEqual(len(records), expected_config.n_load_step)
+        self.assertEqual(config.path_displacements, [])
+        np.testing.assert_allclose(result.nodes.displacements, expected.nodes.displacements)
+
+        for i, record in enumerate(records):
+            self.assertEqual(record.step, i)
+            self.assertAlmostEqual(record.load_factor, expected_config.load_factors[i])
+            self.assertEqual(record.iterations, expected_config.step_iterations[i])
+            self.assertAlmostEqual(record.residual_norm, expected_config.step_residual_norms[i][-1])
+            self.assertTrue(record.converged)
+            self.assertGreaterEqual(record.elapsed_time, 0.0)
+            np.testing.assert_allclose(record.loads[1, 2], record.load_factor * loads[5])
+        np.testing.assert_allclose(sum(record.displacements_increment for record in records), result.nodes.displacements, atol=1e-12)
+        np.testing.assert_allclose(records[-1].tension, result.elements.tension)
+        np.testing.assert_allclose(records[-1].reactions, result.nodes.reactions)
+
+        # stop at the first step where the compression in the bars exceeds 50 kN
+        config = PyConfigDM(newton="full")
+        for record in iterate_nonlinear_displacement_method(self.structure, loads, n_steps=5, config=config):
+            if np.any(record.tension < -50000.0):
+                break
+        self.assertLess(record.load_factor, 1.0)
+        self.assertEqual(config.n_load_step, record.step + 1)
+        self.assertTrue(np.all(records[record.step - 1].tension >= -50000.0))
+
+        # without equilibrium iterations
+        record = next(iterate_nonlinear_displacement_method(self.structure, loads, n_steps=5))
+        self.assertEqual(record.iterations, 0)
+        self.assertIsNone(record.residual_norm)
+
     def test_snap_through(self):
         """Test snap through behavior of 2-bar truss.
         Check that Snap through has occurred (cfr J.Feron Master thesis p34 of pdf)
@@ -162,6 +209,128 @@ class TestNonlinearDM_2BarsTruss(unittest.TestCase):
         np.testing.assert_allclose(structure_up_coord1z, structure_down_coord1z, rtol=2e-2)
         np.testing.assert_allclose(result_up.elements.tension, result_down.elements.tension, rtol=2e-2)
 
+    def test_vertical_load_sparse(self):
+        """Test that the sparse solver follows the same equilibrium path as the dense solver."""
+        loads = np.zeros(9)  # 3 nodes * 3 DOFs
+        loads[5] = -100000.0  # Node 1, Z direction
+
+        dense = main_nonlinear_displacement_method(self.structure, loads, n_steps=100)
+        sparse = main_nonlinear_displacement_method(self.structure, loads, n_steps=100, sparse=True)
+
+        np.testing.assert_allclose(sparse.nodes.displacements, dense.nodes.displacements, rtol=1e-9, atol=1e-12)
+        np.testing.assert_allclose(sparse.elements.tension, dense.elements.tension, rtol=1e-9)
+
+    def test_vertical_load_newton(self):
+        """Test that the equilibrium iterations reach the equilibrium in the deformed state with a few load steps."""
+        loads = np.zeros(9)  # 3 nodes * 3 DOFs
+        loads[5] = -100000.0  # Node 1, Z direction
+
+        for newton in ["full", "modified"]:
+            config = PyConfigDM(newton=newton)
+            result = main_nonlinear_displacement_method(self.structure, loads, n_steps=2, config=config)
+            self.assertTrue(result.is_in_equilibrium())
+            self.assertTrue(config.converged)
+            self.assertEqual(config.n_load_step, len(config.step_iterations))
+            self.assertEqual(config.n_iteration, sum(config.step_iterations))
+            for iterations, residual_norms in zip(config.step_iterations, config.step_residual_norms):
+                self.assertEqual(len(residual_norms), iterations + 1)
+
+            # equilibrium of node 1 in the deformed state: 2 * t * sin(alpha) = P
+            L = result.elements.current_length[0]
+            sin_alpha = result.nodes.coordinates[1, 2] / L
+            np.testing.assert_allclose(2 * result.elements.tension[0] * sin_alpha, loads[5], rtol=1e-4)
+            # tension in agreement with the elongation of the bars
+            EA = 2500.0 * 10000.0
+            np.testing.assert_allclose(result.elements.tension, EA * (L - np.sqrt(2)) / np.sqrt(2), rtol=1e-9)
+            np.testing.assert_allclose(result.nodes.reactions[[0, 2]].sum(axis=0), [0.0, 0.0, -loads[5]], rtol=1e-4, atol=1e-6)
+
+        with self.assertRaises(ValueError):
+            PyConfigDM(newton="quasi")
+
+    def test_refactorization_policy(self):
+        """Test that the adaptive refactorization policy reuses the factorization across the load steps, and still reaches the equilibrium."""
+        loads = np.zeros(9)  # 3 nodes * 3 DOFs
+        loads[5] = -100000.0  # Node 1, Z direction
+
+        factorizations = {}
+        for newton, refactorization in [("full", "step"), ("modified", "step"), ("modified", "adaptive")]:
+            config = PyConfigDM(newton=newton, refactorization=refactorization)
+            result = main_nonlinear_displacement_method(self.structure, loads, n_steps=5, config=config)
+            self.assertTrue(result.is_in_equilibrium())
+            self.assertTrue(config.converged)
+            factorizations[newton, refactorization] = config.n_factorization
+
+            L = result.elements.current_length[0]
+            sin_alpha = result.nodes.coordinates[1, 2] / L
+            np.testing.assert_allclose(2 * result.elements.tension[0] * sin_alpha, loads[5], rtol=1e-4)
+
+        self.assertEqual(factorizations["modified", "step"], config.n_load_step)
+        self.assertGreater(factorizations["full", "step"], factorizations["modified", "step"])
+        self.assertLess(factorizations["modified", "adaptive"], factorizations["modified", "step"])
+
+        # a tight stiffness change criterion refactorizes more often
+        config = PyConfigDM(newton="modified", refactorization="adaptive", stiffness_change_rtol=1e-6)
+        main_nonlinear_displacement_method(self.structure, loads, n_steps=5, config=config)
+        self.assertGreater(config.n_factorization, factorizations["modified", "adaptive"])
+
+        with self.assertRaises(ValueError):
+            PyConfigDM(newton="modified", refactorization="never")
+
+    def test_adaptive_step_control(self):
+        """Test that the adaptive step control takes fewer steps than an over-specified n_steps, and records the path of the procedure."""
+        loads = np.zeros(9)  # 3 nodes * 3 DOFs
+        loads[5] = -100000.0  # Node 1, Z direction
+
+        fixed = PyConfigDM(newton="full")
+        expected = main_nonlinear_displacement_method(self.structure, loads, n_steps=20, config=fixed)
+        config = PyConfigDM(newton="full", step_control="adaptive")
+        result = main_nonlinear_displacement_method(self.structure, loads, n_steps=20, config=config)
+        self.assertTrue(result.is_in_equilibrium())
+        self.assertLess(config.n_load_step, fixed.n_load_step)
+        np.testing.assert_allclose(result.nodes.coordinates[1, 2], expected.nodes.coordinates[1, 2], rtol=1e-6)
+
+        # path of the procedure
+        for c in (fixed, config):
+            self.assertEqual(len(c.load_factors), c.n_load_step)
+            self.assertEqual(len(c.step_lengths), c.n_load_step)
+            self.assertEqual(len(c.path_displacements), c.n_load_step)
+            self.assertAlmostEqual(c.load_factors[-1], 1.0)
+        np.testing.assert_allclose(config.path_displacements[-1], result.nodes.displacements)
+        np.testing.assert_allclose(fixed.step_lengths, 1 / 20)
+        self.assertTrue(np.all(np.diff(config.step_lengths) > 0))  # the response is close to linear: the steps grow
+        self.assertTrue(np.all(np.array(config.step_lengths) <= config.max_step_ratio / 20))
+
+        # without equilibrium iterations, the change of the tangent displacements controls the steps
+        config = PyConfigDM(step_control="adaptive")
+        result = main_nonlinear_displacement_method(self.structure, loads, n_steps=20, config=config)
+        self.assertLess(config.n_load_step, 20)
+        np.testing.assert_allclose(result.nodes.coordinates[1, 2], expected.nodes.coordinates[1, 2], rtol=1e-4)
+
+        with self.assertRaises(ValueError):
+            PyConfigDM(step_control="automatic")
+
+    def test_snap_through(self):
+        """Test that the adaptive step control follows the equilibrium path through the limit point of the 2-bar truss, up to the final loads."""
+        loads = np.zeros(9)  # 3 nodes * 3 DOFs
+        loads[5] = -5e6  # Node 1, Z direction: larger than the limit load
+
+        config = PyConfigDM(newton="full", step_control="adaptive")
+        result = main_nonlinear_displacement_method(self.structure, loads, n_steps=20, config=config)
+        self.assertTrue(result.is_in_equilibrium())
+        np.testing.assert_allclose(result.nodes.loads[1, 2], loads[5])
+        self.assertLess(result.nodes.coordinates[1, 2], 0.0)  # node 1 snapped below the supports
+
+        # the load factor decreases after the limit point
+        load_factors = np.array(config.load_factors)
+        limit = np.argmax(load_factors[:-1] > load_factors[1:])
+        self.assertLess(load_factors[limit], 1.0)
+        self.assertTrue(np.all(np.diff(load_factors[:limit + 1]) > 0))
+        self.assertLess(np.min(load_factors), 0.0)
+        # the load-displacement curve of node 1: the limit point is reached above the supports
+        z = np.array([d[1, 2] for d in config.path_displacements])
+        self.assertTrue(np.all(np.diff(z[:limit + 1]) < 0))
+        self.assertGreater(z[limit] + self.structure.nodes.initial_coordinates[1, 2], 0.0)
+
 
 if __name__ == '__main__':
     unittest.main()
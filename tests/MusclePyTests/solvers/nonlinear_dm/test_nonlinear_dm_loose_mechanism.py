@@ -20,6 +20,8 @@
 import unittest
 import numpy as np
 from musclepy.solvers.dm.nonlinear_dm import main_nonlinear_displacement_method
+from musclepy.solvers.dm.py_config_dm import PyConfigDM
+from musclepy.solvers.dm.linear_dm import main_linear_displacement_method
 from musclepy.femodel.pytruss import PyTruss
 from musclepy.femodel.pynodes import PyNodes
 from musclepy.femodel.pyelements import PyElements
@@ -87,6 +89,74 @@ class TestNonlinearDM_LooseMechanism(unittest.TestCase):
         expected_coord1z = -158.74e-3
         np.testing.assert_allclose(result_coord1z, expected_coord1z, rtol=2e-2)
 
+    def test_loads_on_loose_mechanism_newton(self):
+        """Test that the equilibrium iterations give the analytical results with 5 load steps instead of 100."""
+        loads = np.zeros(9)  # 3 nodes * 3 DOFs
+        loads[5] = -100000.0  # Node 1, Z direction
+
+        config = PyConfigDM(newton="full")
+        result = main_nonlinear_displacement_method(self.structure, loads, n_steps=5, config=config)
+        self.assertTrue(config.converged)
+        self.assertTrue(result.is_in_equilibrium())
+        self.assertLess(config.step_residual_norms[-1][-1], 1e-6 + 1e-4 * 100000.0)
+
+        np.testing.assert_allclose(result.elements.tension, np.array([313020.0, 313020.0]), rtol=2e-2)
+        np.testing.assert_allclose(result.nodes.coordinates[1, 2], -158.74e-3, rtol=2e-2)
+
+
+    def test_loads_on_loose_mechanism_regularized(self):
+        """Test that the regularized solve of the mechanism gives the analytical results deterministically, without random perturbation."""
+        loads = np.zeros(9)  # 3 nodes * 3 DOFs
+        loads[5] = -100000.0  # Node 1, Z direction
+
+        results = []
+        for newton, n_steps in [(None, 100), ("full", 5), ("full", 5)]:
+            config = PyConfigDM(newton=newton, singular="regularize")
+            result = main_nonlinear_displacement_method(self.structure, loads, n_steps=n_steps, config=config)
+            self.assertTrue(config.converged)
+            np.testing.assert_allclose(result.elements.tension, np.array([313020.0, 313020.0]), rtol=2e-2)
+            np.testing.assert_allclose(result.nodes.coordinates[1, 2], -158.74e-3, rtol=2e-2)
+            self.assertAlmostEqual(result.nodes.coordinates[1, 0], 1.0)  # symmetric: no random horizontal perturbation
+            results.append(result)
+        np.testing.assert_array_equal(results[1].nodes.displacements, results[2].nodes.displacements)
+
+        # a seeded random perturbation is reproducible
+        displacements = [main_nonlinear_displacement_method(self.structure, loads, n_steps=5, config=PyConfigDM(newton="full", seed=1)).nodes.displacements
+                         for _ in range(2)]
+        np.testing.assert_array_equal(displacements[0], displacements[1])
+
+        with self.assertRaises(ValueError):
+            PyConfigDM(singular="pseudo_inverse")  # the mechanism would never be activated
+
+    def test_linear_mechanism(self):
+        """Test the deterministic linear solves of the loaded mechanism."""
+        loads = np.zeros(9)  # 3 nodes * 3 DOFs
+        loads[5] = -100000.0  # Node 1, Z direction
+        no_prestress = np.zeros(2)
+
+        for sparse in (False, True):
+            # least-squares solution: no displacement along the mechanism, which is not equilibrated
+            result = main_linear_displacement_method(self.structure, loads, no_prestress, sparse=sparse, singular="pseudo_inverse")
+            np.testing.assert_allclose(result.nodes.displacements, 0.0, atol=1e-12)
+            self.assertFalse(result.is_in_equilibrium())
+
+            # regularized solution: a large but finite displacement along the mechanism only
+            result = main_linear_displacement_method(self.structure, loads, no_prestress, sparse=sparse, singular="regularize")
+            self.assertTrue(np.all(np.isfinite(result.nodes.displacements)))
+            self.assertLess(result.nodes.displacements[1, 2], -1.0)
+            self.assertAlmostEqual(result.nodes.displacements[1, 0], 0.0)
+
+        # a load along the bars is not affected by the mechanism: dx = F / (2 EA/L)
+        loads = np.zeros(9)
+        loads[3] = 100000.0  # Node 1, X direction
+        for singular in ("regularize", "pseudo_inverse"):
+            result = main_linear_displacement_method(self.structure, loads, no_prestress, singular=singular)
+            np.testing.assert_allclose(result.nodes.displacements[1], [2e-3, 0.0, 0.0], atol=1e-12)
+            np.testing.assert_allclose(result.nodes.reactions[[0, 2], 0], [-50000.0, -50000.0], rtol=1e-9)
+            self.assertTrue(result.is_in_equilibrium())
+
+        with self.assertRaises(ValueError):
+            main_linear_displacement_method(self.structure, loads, no_prestress, singular="ignore")
 
 
 if __name__ == '__main__':
@@ -20,6 +20,7 @@
 import unittest
 import numpy as np
 from musclepy.solvers.dm.nonlinear_dm import main_nonlinear_displacement_method
+from musclepy.solvers.dm.py_config_dm import PyConfigDM
 from musclepy.solvers.dm.linear_dm import main_linear_displacement_method
 from musclepy.femodel.pytruss import PyTruss
 from musclepy.femodel.pynodes import PyNodes
@@ -120,6 +121,31 @@ class TestNonlinearDM_PrestressedTightRope(unittest.TestCase):
         np.testing.assert_allclose(d2.reshape(-1,3)[1,2], expected_displacement2, rtol=2e-2)
         np.testing.assert_allclose(stage2.elements.tension, np.array([expected_tension2, expected_tension2]), rtol=2e-2)
 
+    def test_slack_cable(self):
+        """Test that a prestressed cable becoming slack under a horizontal load loses its tension in the equilibrium iterations."""
+        elements = PyElements(
+            nodes=self.nodes,
+            type=np.array([1, 1]),
+            end_nodes=np.array([[0, 1], [1, 2]]),
+            area=np.array([50.0, 50.0]),
+            youngs=np.array([[0.0, 100000.0], [0.0, 100000.0]]),  # no stiffness in compression
+        )
+        prestressed_structure = main_linear_displacement_method(PyTruss(self.nodes, elements), np.zeros(9), np.array([-3.984e-3, -3.984e-3]))
+        np.testing.assert_allclose(prestressed_structure.elements.tension, np.array([20000.0, 20000.0]), rtol=2e-2)
+
+        # a horizontal load of 3 times the prestress: cable 2 is slack, cable 1 carries the whole load
+        loads = np.zeros(9)
+        loads[3] = 60000.0  # Node 1, X direction
+        config = PyConfigDM(newton="full")
+        result = main_nonlinear_displacement_method(prestressed_structure, loads, n_steps=5, config=config)
+        self.assertTrue(config.converged)
+        self.assertTrue(result.is_in_equilibrium())
+        np.testing.assert_allclose(result.elements.tension, np.array([60000.0, 0.0]), atol=1e-4 * 60000.0)  # equilibrium tolerance
+
+        free_length = prestressed_structure.elements.free_length[0]
+        expected_displacement = free_length * (1 + 60000.0 / (100000.0 * 50.0)) - 1.0  # elongation of cable 1 from its free length
+        np.testing.assert_allclose(result.nodes.displacements[1, 0], expected_displacement, rtol=1e-4)
+
 
 if __name__ == '__main__':
     unittest.main()
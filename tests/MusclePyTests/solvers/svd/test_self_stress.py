@@ -108,7 +108,77 @@ class TestSelfStressModes(unittest.TestCase):
 
         self.assertTrue(np.allclose(np.abs(localized_modes), np.abs(expected_localized_modes), atol=0.01),
                         f"Expected localized modes:\n{expected_localized_modes}\nGot:\n{localized_modes}")
-        
+
+    def test_localize_cable_net(self):
+        """Test the localization of the self-stress modes of a cable net: each mode is a straight cable line."""
+        from musclepy.benchmarks import cable_net
+        net = cable_net(4, 4)  # 3 cable lines in each direction, each line made of 4 cables
+        localized_modes = localize_self_stress_modes(net, main_singular_value_decomposition(net).Vs_T)
+
+        self.assertEqual(localized_modes.shape, (6, 24))
+        self.assertTrue(np.array_equal(np.count_nonzero(np.abs(localized_modes) > 1e-6, axis=1), np.full(6, 4)))
+        self.assertTrue(np.allclose(localized_modes.sum(axis=0), np.ones(24)))  # each cable belongs to one line, in tension
+
+    def test_localize_sparse(self):
+        """Test the sparse format of the localized modes: only the active elements are stored."""
+        from musclepy.solvers.selfstress.modes import self_stress_modes_to_dense
+        from musclepy.benchmarks import cable_net
+        net = cable_net(4, 4)
+        Vs_T = main_singular_value_decomposition(net).Vs_T
+        sparse_modes = localize_self_stress_modes(net, Vs_T, sparse=True)
+
+        self.assertEqual(sparse_modes.shape, (6, 24))
+        self.assertEqual(sparse_modes.nnz, 24)
+        self.assertTrue(np.allclose(self_stress_modes_to_dense(sparse_modes), localize_self_stress_modes(net, Vs_T), atol=1e-6))
+
+    def test_localize_many_modes(self):
+        """Test the localization of 25 self-stress modes of a tensegrity grid (iterative, without recursion)."""
+        from musclepy.benchmarks import tensegrity_grid
+        grid = tensegrity_grid(2, 2)
+        svd = main_singular_value_decomposition(grid)
+        localized_modes = localize_self_stress_modes(grid, svd.Vs_T)
+
+        # the localized modes still span the self-stress modes (up to the values rounded to zero during the reductions)
+        self.assertEqual(np.linalg.matrix_rank(localized_modes), svd.s)
+        projection = localized_modes @ svd.Vs @ svd.Vs.T
+        self.assertTrue(np.allclose(projection, localized_modes, atol=0.05))
+        # the first modes are localized in a few elements
+        elements_per_mode = np.count_nonzero(np.abs(localized_modes) > 1e-6, axis=1)
+        self.assertTrue(np.all(elements_per_mode[:3] == 1))
+
+    def test_localize_per_module(self):
+        """Test the localization of the self-stress modes of a tensegrity grid, module by module."""
+        from musclepy.benchmarks import tensegrity_grid
+        grid = tensegrity_grid(2, 2)  # 4 simplex modules of 12 elements, followed by 12 interface cables
+        svd = main_singular_value_decomposition(grid)
+        modules = np.full(grid.elements.count, -1)
+        modules[:48] = np.repeat(np.arange(4), 12)
+
+        localized_modes = localize_self_stress_modes(grid, svd.Vs_T, modules=modules)
+        self.assertEqual(localized_modes.shape, (svd.s, grid.elements.count))
+        self.assertEqual(np.linalg.matrix_rank(localized_modes), svd.s)
+        self.assertTrue(np.allclose(localized_modes @ svd.Vs @ svd.Vs.T, localized_modes))
+
+        # each module has 4 self-stress modes inside it: the 3 bottom cables between supports, and the simplex mode
+        active = np.abs(localized_modes) > 1e-6
+        inside_modules = [m for m in range(svd.s) if np.all(modules[active[m]] >= 0) and np.unique(modules[active[m]]).size == 1]
+        self.assertEqual(len(inside_modules), 16)
+        # the modes are more localized than the ones of the whole structure
+        global_modes = localize_self_stress_modes(grid, svd.Vs_T)
+        self.assertLess(active.sum(), np.sum(np.abs(global_modes) > 1e-6))
+
+        # the modules can be localized in parallel
+        parallel_modes = localize_self_stress_modes(grid, svd.Vs_T, modules=modules, processes=2)
+        self.assertTrue(np.allclose(parallel_modes, localized_modes))
+
+        # the connected components (the bottom cables are isolated by the supports)
+        components_modes = localize_self_stress_modes(grid, svd.Vs_T, modules="components")
+        self.assertEqual(np.linalg.matrix_rank(components_modes), svd.s)
+        self.assertEqual(np.sum(np.count_nonzero(np.abs(components_modes) > 1e-6, axis=1) == 1), 12)
+
+        with self.assertRaises(ValueError):
+            localize_self_stress_modes(grid, svd.Vs_T, modules=modules[:10])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -186,5 +186,28 @@ class TestSVDSimplex(unittest.TestCase):
         self.assertTrue(np.allclose(global_material_stiffness1, global_material_stiffness2),
                         f"Expected global material stiffness:\n{global_material_stiffness2}\nGot:\n{global_material_stiffness1}")
 
+    def test_sparse_method(self):
+        """Test that the sparse method finds the same null spaces as the full SVD"""
+        sparse_results = main_singular_value_decomposition(self.structure, zero_rtol=1e-3, method="sparse", extensional_modes=False)
+
+        self.assertEqual((sparse_results.r, sparse_results.s, sparse_results.m), (11, 1, 1))
+        self.assertIsNone(sparse_results.Ur_T)
+        self.assertIsNone(sparse_results.Vr_T)
+        self.assertIsNone(sparse_results.Sr)
+
+        # the modes are defined up to their sign: compare the projectors on the null spaces
+        Vs, Vs_sparse = self.svd_results.Vs, sparse_results.Vs
+        Um, Um_sparse = self.svd_results.Um, sparse_results.Um
+        self.assertTrue(np.allclose(Vs @ Vs.T, Vs_sparse @ Vs_sparse.T, atol=1e-8))
+        self.assertTrue(np.allclose(Um @ Um.T, Um_sparse @ Um_sparse.T, atol=1e-8))
+
+        # the extensional modes are not computed by default, but are still available on request
+        self.assertIsNone(main_singular_value_decomposition(self.structure, method="sparse").Sr)
+        with_extensional = main_singular_value_decomposition(self.structure, method="sparse", extensional_modes=True)
+        self.assertTrue(np.allclose(with_extensional.Sr, self.svd_results.Sr))
+
+        with self.assertRaises(ValueError):
+            main_singular_value_decomposition(self.structure, method="randomized")
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,86 @@
+# Muscle
+
+# Copyright <2015-2025> <Université catholique de Louvain (UCLouvain)>
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# List of the contributors to the development of Muscle: see NOTICE file.
+# Description and complete License: see NOTICE file.
+
+import unittest
+import numpy as np
+from musclepy.femodel.pynodes import PyNodes
+from musclepy.femodel.pyelements import PyElements
+from musclepy.femodel.pytruss import PyTruss
+from musclepy.benchmarks import warren_truss, tensegrity_grid
+from musclepy.solvers.svd.main import main_singular_value_decomposition, update_singular_value_decomposition
+
+
+class TestSVDUpdate(unittest.TestCase):
+    """Test cases for the incremental update of the SVD when elements are removed, added or moved."""
+
+    def _structure(self, coordinates, dof, end_nodes):
+        nodes = PyNodes(coordinates, dof)
+        b = len(end_nodes)
+        elements = PyElements(nodes, type=np.full(b, -1), end_nodes=end_nodes, area=np.full(b, 500.0), youngs=np.full((b, 2), 210000.0))
+        return PyTruss(nodes, elements)
+
+    def assertSameDecomposition(self, updated, expected):
+        self.assertEqual((updated.r, updated.s, updated.m), (expected.r, expected.s, expected.m))
+        self.assertTrue(np.allclose(updated.Sr, expected.Sr))
+        # the modes are defined up to a rotation within the null spaces: compare the projectors
+        self.assertTrue(np.allclose(updated.Vs @ updated.Vs.T, expected.Vs @ expected.Vs.T, atol=1e-8))
+        self.assertTrue(np.allclose(updated.Um @ updated.Um.T, expected.Um @ expected.Um.T, atol=1e-8))
+        self.assertTrue(np.allclose(updated.Vr @ updated.Vr.T, expected.Vr @ expected.Vr.T, atol=1e-8))
+
+    def test_remove_and_add_elements(self):
+        """Removing diagonals of a Warren truss creates mechanisms, adding them back removes the mechanisms."""
+        truss = warren_truss(6)
+        coordinates, dof, end_nodes = truss.nodes.coordinates, truss.nodes.dof, truss.elements.end_nodes
+        previous = main_singular_value_decomposition(truss)
+        self.assertEqual((previous.s, previous.m), (0, 0))
+
+        removed = [5, 12]
+        structure = self._structure(coordinates, dof, np.delete(end_nodes, removed, axis=0))
+        updated = previous.update(structure, removed_elements=removed)
+        self.assertSameDecomposition(updated, main_singular_value_decomposition(structure))
+        self.assertEqual((updated.s, updated.m), (0, 2))
+
+        # the removed elements are added back at the end, with an additional redundant element
+        added_end_nodes = np.vstack([end_nodes[removed], [[0, len(coordinates) - 1]]])
+        structure = self._structure(coordinates, dof, np.vstack([np.delete(end_nodes, removed, axis=0), added_end_nodes]))
+        updated = update_singular_value_decomposition(updated, structure, added_elements=structure.elements.count - np.arange(1, 4))
+        self.assertSameDecomposition(updated, main_singular_value_decomposition(structure))
+        self.assertEqual((updated.s, updated.m), (1, 0))
+
+    def test_move_nodes(self):
+        """Moving a node of a tensegrity grid updates the columns of the connected elements."""
+        grid = tensegrity_grid(2, 2)
+        previous = main_singular_value_decomposition(grid)
+        coordinates = grid.nodes.coordinates.copy()
+        coordinates[[4, 7]] += [[0.1, -0.05, 0.2], [0.0, 0.1, 0.0]]
+        structure = self._structure(coordinates, grid.nodes.dof, grid.elements.end_nodes)
+        updated = previous.update(structure, moved_nodes=[4, 7])
+        self.assertSameDecomposition(updated, main_singular_value_decomposition(structure))
+
+    def test_fallback(self):
+        """The SVD is fully recomputed when the extensional modes of the previous decomposition are missing."""
+        truss = warren_truss(4)
+        previous = main_singular_value_decomposition(truss, extensional_modes=False)
+        structure = self._structure(truss.nodes.coordinates, truss.nodes.dof, truss.elements.end_nodes[1:])
+        updated = previous.update(structure, removed_elements=[0])
+        self.assertSameDecomposition(updated, main_singular_value_decomposition(structure))
+
+
+if __name__ == '__main__':
+    unittest.main()
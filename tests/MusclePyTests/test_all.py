@@ -32,20 +32,28 @@ sys.path.append(tests_dir)
 # Import all test modules
 from MusclePyTests.femodel.test_pyelements import TestPyElements
 from MusclePyTests.femodel.test_pynodes import TestPyNodes
+from MusclePyTests.femodel.test_compact_state import TestCompactTrussState
 from MusclePyTests.solvers.linear_dm.test_linear_dm_2bars_truss import TestLinearDM_2BarsTruss
 from MusclePyTests.solvers.linear_dm.test_linear_dm_3prestressedcables import TestLinearDM_3PrestressedCables
+from MusclePyTests.solvers.linear_dm.test_linear_dm_session import TestLinearDM_Session
+from MusclePyTests.solvers.linear_dm.test_linear_dm_batch import TestLinearDM_Batch
 from MusclePyTests.solvers.nonlinear_dm.test_nonlinear_dm_2bars_truss import TestNonlinearDM_2BarsTruss
 from MusclePyTests.solvers.nonlinear_dm.test_nonlinear_dm_loose_mechanism import TestNonlinearDM_LooseMechanism
 from MusclePyTests.solvers.nonlinear_dm.test_nonlinear_dm_prestressed_tight_rope import TestNonlinearDM_PrestressedTightRope
 from MusclePyTests.solvers.svd.test_svd_2cables import TestSVD2Cables
 from MusclePyTests.solvers.svd.test_svd_3cables import TestSVD3Cables
 from MusclePyTests.solvers.svd.test_svd_simplex import TestSVDSimplex
+from MusclePyTests.solvers.svd.test_svd_update import TestSVDUpdate
 from MusclePyTests.solvers.svd.test_self_stress import TestSelfStressModes
 # Import Dynamic Relaxation test modules
 from MusclePyTests.solvers.dr.test_dr_2cables import TestDR_2Cables
 from MusclePyTests.solvers.dr.test_dr_3simplecables import TestDR_3SimpleCables
 from MusclePyTests.solvers.dr.test_dr_3complexcables import TestDR_3ComplexCables
 from MusclePyTests.solvers.dr.test_dr_simplex import TestDR_Simplex
+from MusclePyTests.solvers.dr.test_dr_engine import TestDR_Engine
+# Import utils test modules
+from MusclePyTests.utils.test_matrix_calculations import TestMatrixCalculations
+from MusclePyTests.benchmarks.test_benchmarks import TestBenchmarks
 
 
 def create_test_suite():
@@ -56,20 +64,28 @@ def create_test_suite():
     # Add test classes
     suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestPyElements))
     suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestPyNodes))
+    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestCompactTrussState))
     suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestLinearDM_2BarsTruss))
     suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestLinearDM_3PrestressedCables))
+    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestLinearDM_Session))
+    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestLinearDM_Batch))
     suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestNonlinearDM_2BarsTruss))
     suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestNonlinearDM_LooseMechanism))
     suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestNonlinearDM_PrestressedTightRope))
     suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSVD2Cables))
     suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSVD3Cables))
     suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSVDSimplex))
+    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSVDUpdate))
     suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSelfStressModes))
     # Add Dynamic Relaxation test classes
     suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestDR_2Cables))
     suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestDR_3SimpleCables))
     suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestDR_3ComplexCables))
     suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestDR_Simplex))
+    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestDR_Engine))
+    # Add utils test classes
+    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestMatrixCalculations))
+    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestBenchmarks))
 
     
     return suite
@@ -0,0 +1,186 @@
+# Muscle
+
+# Copyright <2015-2025> <Université catholique de Louvain (UCLouvain)>
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# List of the contributors to the development of Muscle: see NOTICE file.
+# Description and complete License: see NOTICE file.
+
+import unittest
+import numpy as np
+import scipy.sparse as sp
+from musclepy.femodel.pytruss import PyTruss
+from musclepy.femodel.pynodes import PyNodes
+from musclepy.femodel.pyelements import PyElements
+from musclepy.utils.matrix_calculations import (
+    compute_equilibrium_matrix,
+    compute_sparse_equilibrium_matrix,
+    compute_global_material_stiffness_matrix,
+    compute_local_material_stiffness_matrices,
+    compute_local_geometric_stiffness_matrices,
+    compute_elements_dof_indices,
+    compute_global_stiffness_diagonal,
+    compute_nodal_resisting_forces,
+    local_to_global_matrix,
+    local_to_global_sparse_matrix
+)
+
+
+class TestMatrixCalculations(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures with a 3-cable structure, prestressed in an arbitrary state.
+
+                  Node 0
+                 (2,0,1)
+                    | 
+                    | cable 0
+                    |   
+        Node 1 --- Node3 --- Node 2
+        (0,0,0)    (2,0,0)   (4,0,0)
+        """
+        self.nodes = PyNodes(
+            initial_coordinates=np.array([
+                [2.0, 0.0, 1.0],  # Node 0: top
+                [0.0, 0.0, 0.0],  # Node 1: left
+                [4.0, 0.0, 0.0],  # Node 2: right
+                [2.0, 0.0, 0.0]   # Node 3: bottom (free)
+            ]),
+            dof=np.array([
+                [False, False, False],
+                [False, False, False],
+                [False, False, False],
+                [True, True, True]
+            ]),
+            displacements=np.array([
+                [0.0, 0.0, 0.0],
+                [0.0, 0.0, 0.0],
+                [0.0, 0.0, 0.0],
+                [0.01, -0.02, 0.1]
+            ])
+        )
+        self.elements = PyElements(
+            nodes=self.nodes,
+            type=np.array([1, 1, 1]),
+            end_nodes=np.array([[0, 3], [1, 3], [2, 3]]),
+            area=np.array([50.0, 50.0, 50.0]),
+            youngs=np.array([[70000.0, 70000.0], [70000.0, 70000.0], [70000.0, 70000.0]]),
+            tension=np.array([1000.0, 7000.0, 7000.0])
+        )
+        self.structure = PyTruss(self.nodes, self.elements)
+
+    def _reference_global_matrix(self, local_matrices):
+        """Assemble the global matrix element by element."""
+        n = self.nodes.count
+        K = np.zeros((3*n, 3*n))
+        for i, (n0, n1) in enumerate(self.elements.end_nodes):
+            idx = np.array([3*n0, 3*n0+1, 3*n0+2, 3*n1, 3*n1+1, 3*n1+2])
+            K[np.ix_(idx, idx)] += local_matrices[i]
+        return K
+
+    def test_elements_dof_indices(self):
+        """Test the global DOF indices of each element."""
+        expected = np.array([
+            [0, 1, 2, 9, 10, 11],
+            [3, 4, 5, 9, 10, 11],
+            [6, 7, 8, 9, 10, 11]
+        ])
+        np.testing.assert_array_equal(compute_elements_dof_indices(self.elements.end_nodes), expected)
+
+    def test_local_stiffness_matrices(self):
+        """Test the batched local stiffness matrices against their analytical expression, element by element."""
+        cosines = self.elements.direction_cosines
+        flexibility = self.elements.flexibility
+        tension = self.elements.tension
+        length = self.elements.current_length
+
+        km = compute_local_material_stiffness_matrices(cosines, flexibility)
+        kg = compute_local_geometric_stiffness_matrices(tension, length)
+        self.assertEqual(km.shape, (3, 6, 6))
+        self.assertEqual(kg.shape, (3, 6, 6))
+        self.assertTrue(km.flags.c_contiguous)
+
+        for i in range(self.elements.count):
+            cx, cy, cz = cosines[i]
+            cos = np.array([[-cx, -cy, -cz, cx, cy, cz]])
+            np.testing.assert_allclose(km[i], cos.T @ cos / flexibility[i])
+            
+            unit = np.eye(6) - np.eye(6, k=3) - np.eye(6, k=-3)
+            np.testing.assert_allclose(kg[i], tension[i] / length[i] * unit)
+
+        # no element
+        self.assertEqual(compute_local_material_stiffness_matrices(np.zeros((0, 3)), np.zeros(0)).shape, (0, 6, 6))
+        self.assertEqual(compute_local_geometric_stiffness_matrices(np.zeros(0), np.zeros(0)).shape, (0, 6, 6))
+
+    def test_dense_assembly(self):
+        """Test the vectorized dense assembly against an element by element assembly."""
+        km = compute_local_material_stiffness_matrices(self.elements.direction_cosines, self.elements.flexibility)
+        K = local_to_global_matrix(km, self.elements.end_nodes, self.nodes.count)
+        np.testing.assert_allclose(K, self._reference_global_matrix(km))
+
+        # the material stiffness matrix can also be computed from the equilibrium matrix
+        A = compute_equilibrium_matrix(self.elements.connectivity, self.nodes.coordinates)
+        np.testing.assert_allclose(K, compute_global_material_stiffness_matrix(A, self.elements.flexibility), atol=1e-6)
+
+    def test_sparse_equilibrium_matrix(self):
+        """Test that the sparse equilibrium matrices are equal to the dense one."""
+        A = compute_equilibrium_matrix(self.elements.connectivity, self.nodes.coordinates)
+        self.assertEqual(A.shape, (12, 3))
+
+        A_sparse = compute_equilibrium_matrix(self.elements.incidence_matrix, self.nodes.coordinates, sparse=True)
+        self.assertTrue(sp.isspmatrix_csr(A_sparse))
+        np.testing.assert_allclose(A_sparse.toarray(), A)
+
+        A_sparse = compute_sparse_equilibrium_matrix(self.elements.end_nodes, self.elements.direction_cosines, self.nodes.count)
+        self.assertTrue(sp.isspmatrix_csr(A_sparse))
+        np.testing.assert_allclose(A_sparse.toarray(), A)
+
+        # the material stiffness matrix computed from the sparse equilibrium matrix
+        Km = compute_global_material_stiffness_matrix(A, self.elements.flexibility)
+        np.testing.assert_allclose(compute_global_material_stiffness_matrix(A_sparse, self.elements.flexibility).toarray(), Km, atol=1e-6)
+
+    def test_matrix_free_quantities(self):
+        """Test the stiffness diagonal and the resisting forces computed without assembling any matrix."""
+        elements = self.elements
+        km = compute_local_material_stiffness_matrices(elements.direction_cosines, elements.flexibility)
+        kg = compute_local_geometric_stiffness_matrices(elements.tension, elements.current_length)
+        K = local_to_global_matrix(km + kg, elements.end_nodes, self.nodes.count)
+
+        diagonal = compute_global_stiffness_diagonal(elements.end_nodes, elements.direction_cosines, elements.flexibility,
+                                                     elements.tension, elements.current_length, self.nodes.count)
+        self.assertEqual(diagonal.shape, (4, 3))
+        np.testing.assert_allclose(diagonal.reshape(-1), K.diagonal())
+
+        A = compute_equilibrium_matrix(elements.connectivity, self.nodes.coordinates)
+        resisting_forces = compute_nodal_resisting_forces(elements.end_nodes, elements.direction_cosines, elements.tension, self.nodes.count)
+        self.assertEqual(resisting_forces.shape, (4, 3))
+        np.testing.assert_allclose(resisting_forces.reshape(-1), A @ elements.tension, atol=1e-9)
+
+    def test_sparse_assembly(self):
+        """Test that the sparse assembly returns the same matrices as the dense assembly."""
+        km = compute_local_material_stiffness_matrices(self.elements.direction_cosines, self.elements.flexibility)
+        kg = compute_local_geometric_stiffness_matrices(self.elements.tension, self.elements.current_length)
+        
+        for local_matrices in (km, kg):
+            K_dense = local_to_global_matrix(local_matrices, self.elements.end_nodes, self.nodes.count)
+            K_sparse = local_to_global_sparse_matrix(local_matrices, self.elements.end_nodes, self.nodes.count)
+            self.assertTrue(sp.isspmatrix_csr(K_sparse))
+            self.assertEqual(K_sparse.shape, (12, 12))
+            np.testing.assert_allclose(K_sparse.toarray(), K_dense)
+
+            K_sparse = local_to_global_matrix(local_matrices, self.elements.end_nodes, self.nodes.count, sparse=True)
+            np.testing.assert_allclose(K_sparse.toarray(), K_dense)
+
+
+if __name__ == '__main__':
+    unittest.main()